@@ -0,0 +1,212 @@
+import argparse
+import csv
+import json
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from app.utils.logger import logger
+from app.utils.config import config
+from app.utils.formatting import format_text_result, format_audio_result
+from app.processing.text_processor import TextProcessor
+
+_worker_processor = None
+
+def _init_worker():
+    global _worker_processor
+    from app.processing.audio_processor import AudioProcessor
+    _worker_processor = AudioProcessor()
+
+def _extract_features(path: str):
+    try:
+        audio, _, vad_stats = _worker_processor.load_audio(path, return_stats=True)
+        return _worker_processor.create_spectrogram(audio), None, vad_stats
+    except Exception as e:
+        return None, str(e), None
+
+def read_manifest(path: str):
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.endswith('.jsonl'):
+            rows = (json.loads(line) for line in f if line.strip())
+        else:
+            rows = csv.DictReader(f)
+        for index, row in enumerate(rows):
+            yield {
+                'id': row.get('id') or str(index),
+                'text': row.get('text') or None,
+                'audio': row.get('audio') or row.get('audio_path') or None
+            }
+
+def chunked(records, size: int):
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, size))
+        if not chunk:
+            return
+        yield chunk
+
+class Checkpoint:
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return 0, 0
+        with open(self.path) as f:
+            state = json.load(f)
+        return state['records'], state['offset']
+
+    def save(self, records: int, offset: int):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'records': records, 'offset': offset}, f)
+        os.replace(tmp_path, self.path)
+
+class BatchScorer:
+    def __init__(self, chunk_size: int = 64, workers: int = None, feature_store=None):
+        self.chunk_size = chunk_size
+        self.workers = workers or os.cpu_count()
+        self.feature_store = feature_store
+        self.text_processor = TextProcessor()
+        self._model_manager = None
+
+    @property
+    def model_manager(self):
+        if self._model_manager is None:
+            from app.models.model_manager import ModelManager
+            self._model_manager = ModelManager()
+        return self._model_manager
+
+    def _submit_audio(self, executor, chunk):
+        return [self._submit_one(executor, record['audio']) if record['audio'] else None for record in chunk]
+
+    def _submit_one(self, executor, path: str):
+        if self.feature_store is None:
+            return executor.submit(_extract_features, path)
+        from app.processing.feature_store import file_key
+        try:
+            key = file_key(path)
+        except OSError as e:
+            future = Future()
+            future.set_result((None, str(e), None))
+            return future
+        stored = self.feature_store.get(key)
+        if stored is not None:
+            future = Future()
+            future.set_result((stored, None, None))
+        else:
+            future = executor.submit(_extract_features, path)
+            future.add_done_callback(lambda done: self._store_features(key, done))
+        return future
+
+    def _store_features(self, key: str, future):
+        spectrogram, error, _ = future.result()
+        if not error:
+            self.feature_store.put(key, spectrogram)
+
+    def _score_text(self, chunk, outputs):
+        indices, cleaned = [], []
+        for i, record in enumerate(chunk):
+            if not record['text']:
+                continue
+            try:
+                self.text_processor.validate_text(record['text'])
+                cleaned.append(self.text_processor.clean_text(record['text']))
+                indices.append(i)
+            except ValueError as e:
+                outputs[i]['text_error'] = str(e)
+
+        if cleaned:
+            batch_results = self.model_manager.text_model.predict_batch(cleaned)
+            for i, results in zip(indices, batch_results):
+                outputs[i]['text_result'] = format_text_result(results)
+
+    def _score_audio(self, futures, outputs):
+        indices, spectrograms = [], []
+        for i, future in enumerate(futures):
+            if future is None:
+                continue
+            spectrogram, error, vad_stats = future.result()
+            if error:
+                outputs[i]['audio_error'] = error
+                continue
+            if vad_stats:
+                outputs[i]['audio_vad'] = vad_stats
+            indices.append(i)
+            spectrograms.append(spectrogram)
+
+        if spectrograms:
+            audio_model = self.model_manager.audio_model
+            if audio_model is None:
+                for i in indices:
+                    outputs[i]['audio_error'] = "Audio model is not loaded"
+                return
+            batch_predictions = audio_model.predict_batch(spectrograms)
+            for i, predictions in zip(indices, batch_predictions):
+                outputs[i]['audio_result'] = format_audio_result(predictions)
+
+    def score(self, records):
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker) as executor:
+            chunks = chunked(records, self.chunk_size)
+            current = next(chunks, None)
+            pending = self._submit_audio(executor, current) if current else None
+            while current:
+                upcoming = next(chunks, None)
+                upcoming_futures = self._submit_audio(executor, upcoming) if upcoming else None
+
+                outputs = [{'id': record['id']} for record in current]
+                self._score_text(current, outputs)
+                self._score_audio(pending, outputs)
+                yield outputs
+
+                current, pending = upcoming, upcoming_futures
+
+    def run(self, manifest_path: str, output_path: str, checkpoint_path: str = None):
+        checkpoint = Checkpoint(checkpoint_path or f"{output_path}.ckpt")
+        done, offset = checkpoint.load()
+        if done:
+            logger.info(f"Resuming after {done} records")
+
+        records = islice(read_manifest(manifest_path), done, None)
+        start = time.perf_counter()
+        processed = 0
+
+        with open(output_path, 'a+b') as out:
+            out.truncate(offset)
+            out.seek(offset)
+            for outputs in self.score(records):
+                for output in outputs:
+                    out.write(json.dumps(output, ensure_ascii=False).encode('utf-8') + b'\n')
+                out.flush()
+                os.fsync(out.fileno())
+
+                processed += len(outputs)
+                checkpoint.save(done + processed, out.tell())
+                elapsed = time.perf_counter() - start
+                logger.info(f"Scored {done + processed} records ({processed / elapsed:.1f} records/sec)")
+
+        elapsed = time.perf_counter() - start
+        rate = processed / elapsed if elapsed else 0.0
+        logger.info(f"Finished: {processed} records in {elapsed:.1f}s ({rate:.1f} records/sec)")
+        return {'records': processed, 'seconds': elapsed, 'records_per_sec': rate}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline bulk sentiment scoring")
+    parser.add_argument("manifest", help="CSV or JSONL manifest with id, text and/or audio columns")
+    parser.add_argument("-o", "--output", required=True, help="JSONL file results are appended to")
+    parser.add_argument("--checkpoint", default=None, help="Checkpoint file (default: <output>.ckpt)")
+    parser.add_argument("--chunk-size", type=int, default=config.model.TEXT_BATCH_SIZE * 2)
+    parser.add_argument("--workers", type=int, default=None, help="Audio decoding processes")
+    parser.add_argument("--feature-store", default=config.cache.FEATURE_STORE_DIR or None,
+                        help="Reuse and record log-mel spectrograms in this memory-mapped store")
+    args = parser.parse_args(argv)
+
+    feature_store = None
+    if args.feature_store:
+        from app.processing.feature_store import FeatureStore
+        feature_store = FeatureStore(args.feature_store)
+    scorer = BatchScorer(chunk_size=args.chunk_size, workers=args.workers, feature_store=feature_store)
+    scorer.run(args.manifest, args.output, args.checkpoint)
+
+if __name__ == "__main__":
+    main()
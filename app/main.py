@@ -1,7 +1,7 @@
 import streamlit as st
-import os
-import tempfile
-import numpy as np
+import io
+import time
+import uuid
 from streamlit_option_menu import option_menu
 
 st.set_page_config(
@@ -81,9 +81,17 @@ st.markdown("""
 try:
     from app.utils.logger import logger
     from app.utils.config import config
+    from app.utils.cache import text_cache, audio_cache, audio_cache_key
+    from app.utils.formatting import format_text_result, format_audio_result
+    from app.utils.metrics import metrics, CONFIDENCE_BUCKETS
+    from app.utils.analysis_log import analysis_log
+    from app.utils.startup import startup
     from app.models.model_manager import ModelManager
+    from app.models.jobs import get_job_executor, JobLimitError
     from app.processing.audio_processor import AudioProcessor
     from app.processing.text_processor import TextProcessor
+    from app.processing.streaming import StreamingAnalyzer
+    from app.processing.pipeline import MultimodalPipeline
     imports_ok = True
 except ImportError as e:
     st.error(f"Import error: {e}")
@@ -95,6 +103,11 @@ class MultimodalApp:
             self.model_manager = ModelManager()
             self.audio_processor = AudioProcessor()
             self.text_processor = TextProcessor()
+            self.streaming_analyzer = StreamingAnalyzer(self.audio_processor)
+            self.jobs = get_job_executor()
+            self.session_id = st.session_state.setdefault("session_id", uuid.uuid4().hex)
+            st.session_state.setdefault("jobs", {})
+        self.polling = False
         self.setup_page()
 
     def setup_page(self):
@@ -104,55 +117,128 @@ class MultimodalApp:
             st.markdown('### Analyze customer sentiment through text and voice')
             st.markdown('---')
 
-    def analyze_text(self, text_model, text: str):
-        try:
-            self.text_processor.validate_text(text)
-            cleaned_text = self.text_processor.clean_text(text)
-            results = text_model.predict(cleaned_text)
-            
-            label_map = {"LABEL_0": "NEGATIVE", "LABEL_1": "POSITIVE"}
-            sentiment_scores = {}
-            for result in results:
-                label_name = label_map.get(result['label'], result['label'])
-                sentiment_scores[label_name] = result['score']
-            
-            predicted_label = max(sentiment_scores.items(), key=lambda x: x[1])
-            
-            return {
-                'predicted_label': predicted_label[0],
-                'confidence': predicted_label[1],
-                'all_scores': sentiment_scores
-            }
-            
-        except Exception as e:
-            logger.error(f"Text analysis error: {e}")
-            st.error(f"Text analysis failed: {str(e)}")
-            return None
+    @staticmethod
+    def record_analysis(kind: str, result, source=None):
+        if not result:
+            return
+        items = result if isinstance(result, list) else [result]
+        sources = source if isinstance(source, (list, tuple)) else [source] * len(items)
+        for item, item_source in zip(items, sources):
+            analysis_log.record(kind, item, item_source)
+            if metrics.enabled:
+                metrics.inc("analyses_total", labels={"kind": kind})
+                metrics.observe("analysis_confidence", item['confidence'], {"kind": kind}, buckets=CONFIDENCE_BUCKETS)
+
+    def _predict_uploaded_audio(self, audio_model, uploaded_file, job=None):
+        if audio_model is None:
+            raise RuntimeError("Audio model is not loaded")
+
+        key = audio_cache_key(uploaded_file.getvalue(), self.audio_processor, audio_model)
+        predictions = audio_cache.get(key)
+        if predictions is None:
+            spectrogram = self.audio_processor.process_uploaded_file(uploaded_file)
+            if job:
+                job.report(0.6, "Running emotion model")
+            predictions = audio_model.predict(spectrogram)
+            if not audio_model.demo_mode:
+                audio_cache.set(key, predictions)
+        return format_audio_result(predictions)
+
+    def _run_combined(self, text_model, audio_model, text, uploaded_file):
+        with metrics.span("analyze_combined"):
+            pipeline = MultimodalPipeline(text_model, audio_model, self.text_processor, self.audio_processor)
+            result = pipeline.analyze(text, uploaded_file)
+        self.record_analysis("text", result['text_result'], text)
+        self.record_analysis("audio", result['audio_result'], uploaded_file.name)
+        self.record_analysis("combined", {
+            'predicted_label': result['alignment'],
+            'confidence': result['confidence']
+        }, f"{uploaded_file.name}: {text}")
+        return result
+
+    def _run_full_recording(self, audio_model, uploaded_file, progress=None):
+        if audio_model is None:
+            raise RuntimeError("Audio model is not loaded")
+        with metrics.span("analyze_full_recording"):
+            result = self.streaming_analyzer.analyze(uploaded_file, audio_model, progress=progress)
+        self.record_analysis("audio", result['aggregate'], uploaded_file.name)
+        return result
+
+    @staticmethod
+    def _upload(data: bytes, name: str):
+        upload = io.BytesIO(data)
+        upload.name = name
+        return upload
 
-    def analyze_audio(self, audio_model, spectrogram):
+    def analyze_text(self, text_model, text):
+        with metrics.span("analyze_text"):
+            if isinstance(text, (list, tuple)):
+                for item in text:
+                    self.text_processor.validate_text(item)
+                cleaned_texts = [self.text_processor.clean_text(item) for item in text]
+                result = [format_text_result(results) for results in text_model.predict_batch(cleaned_texts)]
+            else:
+                self.text_processor.validate_text(text)
+                result = format_text_result(text_model.predict(self.text_processor.clean_text(text)))
+        self.record_analysis("text", result, text)
+        return result
+
+    def _text_job(self, job, text_model, text):
+        job.report(0.3, "Running sentiment model")
+        return self.analyze_text(text_model, text)
+
+    def _audio_job(self, job, audio_model, data, name, full_recording):
+        upload = self._upload(data, name)
+        if not full_recording:
+            job.report(0.1, "Decoding audio")
+            with metrics.span("analyze_audio"):
+                result = self._predict_uploaded_audio(audio_model, upload, job)
+            self.record_analysis("audio", result, name)
+            return {'result': result, 'timeline': None}
+
+        duration = self.streaming_analyzer.duration(upload)
+
+        def progress(seconds):
+            if duration:
+                job.report(0.05 + 0.9 * min(1.0, seconds / duration), f"Analyzed {seconds:.0f}s of {duration:.0f}s")
+            else:
+                job.report(0.5, f"Analyzed {seconds:.0f}s")
+
+        job.report(0.05, "Decoding recording")
+        stream_result = self._run_full_recording(audio_model, upload, progress)
+        return {'result': stream_result['aggregate'], 'timeline': stream_result['timeline']}
+
+    def _combined_job(self, job, text_model, audio_model, text, data, name):
+        job.report(0.1, "Analyzing text and audio")
+        return self._run_combined(text_model, audio_model, text, self._upload(data, name))
+
+    def _submit_job(self, slot: str, kind: str, fn, *args):
         try:
-            predictions = np.random.dirichlet(np.ones(4), size=1)[0]
-            emotion_labels = ['angry', 'happy', 'sad', 'neutral']
-            emotion_icons = ['😠', '😄', '😢', '😐']
-            
-            results = {}
-            for i, score in enumerate(predictions):
-                results[f"{emotion_icons[i]} {emotion_labels[i].upper()}"] = float(score)
-            
-            predicted_idx = np.argmax(predictions)
-            predicted_label = f"{emotion_icons[predicted_idx]} {emotion_labels[predicted_idx].upper()}"
-            confidence = float(predictions[predicted_idx])
-            
-            return {
-                'predicted_label': predicted_label,
-                'confidence': confidence,
-                'all_scores': results
-            }
-            
-        except Exception as e:
-            logger.error(f"Audio analysis error: {e}")
-            st.error(f"Audio analysis failed: {str(e)}")
+            job = self.jobs.submit(self.session_id, kind, fn, *args)
+            st.session_state.jobs[slot] = job.id
+        except JobLimitError as e:
+            st.warning(f"⏳ {e}")
+
+    def _job_result(self, slot: str):
+        job = self.jobs.get(st.session_state.jobs.get(slot, ""))
+        if job is None:
             return None
+        if not job.done:
+            col1, col2 = st.columns([4, 1])
+            with col1:
+                st.progress(job.progress, text=f"{job.message} ({job.status})")
+            with col2:
+                if st.button("✖️ Cancel", key=f"{slot}_cancel", use_container_width=True):
+                    self.jobs.cancel(job.id)
+            self.polling = True
+            return None
+        if job.status == "failed":
+            st.error(f"❌ Analysis failed: {job.error}")
+        elif job.status == "cancelled":
+            st.info("Analysis cancelled")
+        else:
+            return job.result
+        return None
 
     def run(self):
         if not imports_ok:
@@ -160,15 +246,17 @@ class MultimodalApp:
             return
             
         try:
-            @st.cache_resource
-            def load_models():
-                return self.model_manager.get_models()
-
-            text_model, audio_model = load_models()
+            self.model_manager.start_loading()
+            if not self.model_manager.readiness()["ready"]:
+                with st.spinner("⏳ Warming up models..."):
+                    self.model_manager.wait_until_ready()
+            text_model, audio_model = self.model_manager.get_models()
 
             with st.sidebar:
                 st.markdown("### 🔧 System Status")
                 if audio_model is None:
+                    st.markdown('<div class="demo-badge">🔊 AUDIO: UNAVAILABLE</div>', unsafe_allow_html=True)
+                elif audio_model.demo_mode:
                     st.markdown('<div class="demo-badge">🔊 AUDIO: DEMO MODE</div>', unsafe_allow_html=True)
                 else:
                     st.markdown('<div class="success-badge">✅ AUDIO: ACTIVE</div>', unsafe_allow_html=True)
@@ -206,29 +294,31 @@ class MultimodalApp:
                 
                 if st.button("🚀 Analyze Sentiment", key="text_btn", use_container_width=True):
                     if text_input.strip():
-                        with st.spinner("🔍 Analyzing text sentiment..."):
-                            result = self.analyze_text(text_model, text_input)
-                            if result:
-                                col1, col2 = st.columns(2)
-                                with col1:
-                                    st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-                                    st.metric("Predicted Sentiment", result['predicted_label'])
-                                    st.metric("Confidence", f"{result['confidence']:.2%}")
-                                    st.markdown('</div>', unsafe_allow_html=True)
-                                
-                                with col2:
-                                    st.progress(result['confidence'], text="Confidence Level")
-                                    with st.expander("📊 Detailed Scores"):
-                                        st.json(result['all_scores'])
+                        self._submit_job("text", "text", self._text_job, text_model, text_input)
                     else:
                         st.warning("⚠️ Please enter some text to analyze")
+
+                result = self._job_result("text")
+                if result:
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        st.markdown('<div class="metric-card">', unsafe_allow_html=True)
+                        st.metric("Predicted Sentiment", result['predicted_label'])
+                        st.metric("Confidence", f"{result['confidence']:.2%}")
+                        st.markdown('</div>', unsafe_allow_html=True)
+                    
+                    with col2:
+                        st.progress(result['confidence'], text="Confidence Level")
+                        with st.expander("📊 Detailed Scores"):
+                            st.json(result['all_scores'])
                 st.markdown('</div>', unsafe_allow_html=True)
 
             elif selected_tab == "🎵 Audio Analysis":
                 st.markdown('<div class="tab-content">', unsafe_allow_html=True)
                 st.markdown('<h2 class="sub-header">🎵 Audio Emotion Analysis</h2>', unsafe_allow_html=True)
                 
-                st.warning("🎧 **Note:** Audio analysis is currently in demo mode showing sample results")
+                if audio_model is not None and audio_model.demo_mode:
+                    st.warning("🎧 **Note:** Audio analysis is currently in demo mode showing sample results")
                 
                 uploaded_file = st.file_uploader(
                     "**Upload an audio file**", 
@@ -242,27 +332,37 @@ class MultimodalApp:
                     st.markdown(f"**File:** {uploaded_file.name}")
                     st.markdown('</div>', unsafe_allow_html=True)
                 
+                full_recording = st.checkbox(
+                    "🎞️ Analyze the full recording (sliding windows)",
+                    help=f"By default only the first {config.model.DURATION} seconds are analyzed"
+                )
+                
                 if uploaded_file and st.button("🎯 Analyze Emotions", key="audio_btn", use_container_width=True):
-                    with st.spinner("🎵 Processing audio emotions..."):
-                        try:
-                            spectrogram, tmp_path = self.audio_processor.process_uploaded_file(uploaded_file)
-                            result = self.analyze_audio(audio_model, spectrogram)
-                            if result:
-                                col1, col2 = st.columns(2)
-                                with col1:
-                                    st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-                                    st.metric("Predicted Emotion", result['predicted_label'])
-                                    st.metric("Confidence", f"{result['confidence']:.2%}")
-                                    st.markdown('</div>', unsafe_allow_html=True)
-                                
-                                with col2:
-                                    st.progress(result['confidence'], text="Confidence Level")
-                                    with st.expander("📊 Emotion Breakdown"):
-                                        for emotion, score in result['all_scores'].items():
-                                            st.write(f"{emotion}: {score:.2%}")
-                            os.unlink(tmp_path)
-                        except Exception as e:
-                            st.error(f"❌ Error processing audio: {str(e)}")
+                    self._submit_job("audio", "audio", self._audio_job, audio_model,
+                                     uploaded_file.getvalue(), uploaded_file.name, full_recording)
+
+                job_result = self._job_result("audio")
+                if job_result:
+                    result, timeline = job_result['result'], job_result['timeline']
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        st.markdown('<div class="metric-card">', unsafe_allow_html=True)
+                        st.metric("Predicted Emotion", result['predicted_label'])
+                        st.metric("Confidence", f"{result['confidence']:.2%}")
+                        st.markdown('</div>', unsafe_allow_html=True)
+                    
+                    with col2:
+                        st.progress(result['confidence'], text="Confidence Level")
+                        with st.expander("📊 Emotion Breakdown"):
+                            for emotion, score in result['all_scores'].items():
+                                st.write(f"{emotion}: {score:.2%}")
+                    
+                    if timeline:
+                        st.markdown(f"### 🕒 Emotion Timeline ({result['windows']} windows, {result['duration']:.0f}s)")
+                        st.line_chart({
+                            emotion: {window['start']: window['all_scores'][emotion] for window in timeline}
+                            for emotion in result['all_scores']
+                        })
                 st.markdown('</div>', unsafe_allow_html=True)
 
             elif selected_tab == "🌐 Combined":
@@ -282,88 +382,147 @@ class MultimodalApp:
                 
                 if st.button("🌈 Run Comprehensive Analysis", key="combined_btn", use_container_width=True):
                     if combined_text.strip() and combined_audio:
-                        with st.spinner("🌐 Analyzing combined modalities..."):
-                            text_result = self.analyze_text(text_model, combined_text)
-                            spectrogram, tmp_path = self.audio_processor.process_uploaded_file(combined_audio)
-                            audio_result = self.analyze_audio(audio_model, spectrogram)
-                            
-                            if text_result and audio_result:
-                                st.balloons()
-                                st.success("✅ Analysis Complete!")
-                                
-                                col1, col2, col3 = st.columns([1, 2, 1])
-                                with col2:
-                                    st.markdown("### 📊 Combined Results")
-                                
-                                col1, col2 = st.columns(2)
-                                with col1:
-                                    st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-                                    st.markdown("#### 📝 Text Analysis")
-                                    st.metric("Sentiment", text_result['predicted_label'])
-                                    st.metric("Confidence", f"{text_result['confidence']:.2%}")
-                                    st.markdown('</div>', unsafe_allow_html=True)
-                                
-                                with col2:
-                                    st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-                                    st.markdown("#### 🎵 Audio Analysis")
-                                    st.metric("Emotion", audio_result['predicted_label'])
-                                    st.metric("Confidence", f"{audio_result['confidence']:.2%}")
-                                    st.markdown('</div>', unsafe_allow_html=True)
-                                
-                                st.markdown("### 💡 Insights")
-                                if text_result['predicted_label'] == "POSITIVE" and "HAPPY" in audio_result['predicted_label']:
-                                    st.success("🌟 **Strong Positive Alignment:** Text and audio both indicate positive sentiment!")
-                                elif text_result['predicted_label'] == "NEGATIVE" and "ANGRY" in audio_result['predicted_label']:
-                                    st.error("⚠️ **Negative Correlation:** Both modalities show negative emotions")
-                                else:
-                                    st.info("🔍 **Mixed Signals:** Text and audio show different emotional patterns")
-                                
-                            os.unlink(tmp_path)
+                        self._submit_job("combined", "combined", self._combined_job, text_model, audio_model,
+                                         combined_text, combined_audio.getvalue(), combined_audio.name)
                     else:
                         st.warning("⚠️ Please provide both text and audio for combined analysis")
+
+                combined_result = self._job_result("combined")
+                if combined_result:
+                    text_result = combined_result['text_result']
+                    audio_result = combined_result['audio_result']
+                    if st.session_state.get("celebrated_job") != st.session_state.jobs["combined"]:
+                        st.session_state.celebrated_job = st.session_state.jobs["combined"]
+                        st.balloons()
+                    st.success("✅ Analysis Complete!")
+                    
+                    col1, col2, col3 = st.columns([1, 2, 1])
+                    with col2:
+                        st.markdown("### 📊 Combined Results")
+                    
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        st.markdown('<div class="metric-card">', unsafe_allow_html=True)
+                        st.markdown("#### 📝 Text Analysis")
+                        st.metric("Sentiment", text_result['predicted_label'])
+                        st.metric("Confidence", f"{text_result['confidence']:.2%}")
+                        st.markdown('</div>', unsafe_allow_html=True)
+                    
+                    with col2:
+                        st.markdown('<div class="metric-card">', unsafe_allow_html=True)
+                        st.markdown("#### 🎵 Audio Analysis")
+                        st.metric("Emotion", audio_result['predicted_label'])
+                        st.metric("Confidence", f"{audio_result['confidence']:.2%}")
+                        st.markdown('</div>', unsafe_allow_html=True)
+                    
+                    st.markdown("### 💡 Insights")
+                    if combined_result['alignment'] == "positive_alignment":
+                        st.success("🌟 **Strong Positive Alignment:** Text and audio both indicate positive sentiment!")
+                    elif combined_result['alignment'] == "negative_alignment":
+                        st.error("⚠️ **Negative Correlation:** Both modalities show negative emotions")
+                    else:
+                        st.info("🔍 **Mixed Signals:** Text and audio show different emotional patterns")
                 st.markdown('</div>', unsafe_allow_html=True)
 
             elif selected_tab == "📊 Dashboard":
                 st.markdown('<div class="tab-content">', unsafe_allow_html=True)
                 st.markdown('<h2 class="sub-header">📊 Performance Dashboard</h2>', unsafe_allow_html=True)
                 
+                if not metrics.enabled:
+                    st.info("Live metrics are disabled (MULTISENSE_METRICS=0)")
+
+                history = analysis_log.summary()
                 col1, col2, col3, col4 = st.columns(4)
                 
                 with col1:
                     st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-                    st.metric("Total Analyses", "128")
-                    st.caption("This session")
+                    st.metric("Total Analyses", f"{metrics.counter_total('analyses_total'):.0f}")
+                    st.caption("Since server start")
                     st.markdown('</div>', unsafe_allow_html=True)
                 
-                with col2:
-                    st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-                    st.metric("Text Accuracy", "92%")
-                    st.caption("Based on validation")
-                    st.markdown('</div>', unsafe_allow_html=True)
-                
-                with col3:
-                    st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-                    st.metric("Audio Accuracy", "78%")
-                    st.caption("Demo mode")
-                    st.markdown('</div>', unsafe_allow_html=True)
+                for column, kind in ((col2, "text"), (col3, "audio")):
+                    with column:
+                        st.markdown('<div class="metric-card">', unsafe_allow_html=True)
+                        kind_confidence = history["mean_confidence_by_kind"].get(kind)
+                        st.metric(f"{kind.capitalize()} Confidence",
+                                  f"{kind_confidence:.0%}" if kind_confidence is not None else "—")
+                        demo = kind == "audio" and audio_model is not None and audio_model.demo_mode
+                        st.caption(f"{history['by_kind'].get(kind, 0):,} logged {kind} analyses"
+                                   + (" (demo mode)" if demo else ""))
+                        st.markdown('</div>', unsafe_allow_html=True)
                 
                 with col4:
                     st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-                    st.metric("Avg Confidence", "85%")
+                    avg_confidence = metrics.histogram_mean("analysis_confidence")
+                    st.metric("Avg Confidence", f"{avg_confidence:.0%}" if avg_confidence is not None else "—")
                     st.caption("Overall performance")
                     st.markdown('</div>', unsafe_allow_html=True)
                 
-                st.markdown("### 📈 Activity Overview")
-                chart_data = np.random.randn(20, 3)
-                st.line_chart(chart_data)
+                st.markdown("### ⏱️ Latency by Stage")
+                stage_summary = metrics.stage_summary()
+                if stage_summary:
+                    stages = sorted(stage_summary)
+                    st.bar_chart({
+                        "p50 (ms)": {stage: stage_summary[stage]["p50_ms"] for stage in stages},
+                        "p95 (ms)": {stage: stage_summary[stage]["p95_ms"] for stage in stages}
+                    })
+                    st.dataframe({
+                        "Stage": stages,
+                        "Calls": [stage_summary[stage]["count"] for stage in stages],
+                        "Mean (ms)": [round(stage_summary[stage]["mean_ms"], 2) for stage in stages],
+                        "p50 (ms)": [round(stage_summary[stage]["p50_ms"], 2) for stage in stages],
+                        "p95 (ms)": [round(stage_summary[stage]["p95_ms"], 2) for stage in stages]
+                    }, use_container_width=True)
+                else:
+                    st.caption("No analyses recorded yet")
+
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.markdown("### 🗄️ Cache")
+                    for cache in (text_cache, audio_cache):
+                        stats = cache.stats()
+                        st.write(f"**{cache.name}**: {stats['hit_rate']:.0%} hit rate "
+                                 f"({stats['hits']} hits / {stats['misses']} misses, {stats['entries']} entries)")
+                with col2:
+                    st.markdown("### 🚀 Model Load Times")
+                    for labels, seconds in sorted(metrics.gauge_values("model_load_seconds").items()):
+                        st.write(f"{labels or 'model'}: {seconds:.2f}s")
+                    job_stats = self.jobs.stats()
+                    st.write(f"**Jobs**: {job_stats['running']}/{job_stats['max_running']} running, "
+                             f"{job_stats['queued']} queued")
+                    with st.expander("Startup timing"):
+                        st.json(dict(startup.report(), readiness=self.model_manager.readiness()))
                 
+                st.markdown("### 📈 Activity")
+                timeline = analysis_log.timeline()
+                if history["total"]:
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        st.metric("All-time Analyses", f"{history['total']:,}")
+                        for kind, labels in sorted(history["labels"].items()):
+                            st.write(f"**{kind}**: " + ", ".join(f"{label} {count:,}" for label, count in
+                                                                 sorted(labels.items(), key=lambda x: -x[1])))
+                    with col2:
+                        activity = {}
+                        for row in timeline:
+                            hour = time.strftime("%m-%d %H:%M", time.localtime(row["bucket"]))
+                            activity.setdefault(row["kind"], {})[hour] = row["count"]
+                        st.bar_chart(activity)
+                else:
+                    st.caption("No analyses logged yet")
+
                 st.markdown("### 🎯 Recent Analyses")
-                sample_data = {
-                    "Text": ["Great service!", "Terrible experience", "It was okay"],
-                    "Sentiment": ["POSITIVE", "NEGATIVE", "NEUTRAL"], 
-                    "Confidence": [0.94, 0.87, 0.62]
-                }
-                st.dataframe(sample_data, use_container_width=True)
+                recent = analysis_log.recent()
+                if recent:
+                    st.dataframe({
+                        "Time": [time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(row["created_at"])) for row in recent],
+                        "Type": [row["kind"] for row in recent],
+                        "Input": [row["source"] or "" for row in recent],
+                        "Result": [row["label"] for row in recent],
+                        "Confidence": [round(row["confidence"], 3) for row in recent]
+                    }, use_container_width=True)
+                else:
+                    st.caption("No analyses logged yet")
                 
                 st.markdown('</div>', unsafe_allow_html=True)
 
@@ -371,6 +530,10 @@ class MultimodalApp:
             logger.error(f"Application error: {e}")
             st.error("❌ An unexpected error occurred. Please try again.")
 
+        if self.polling:
+            time.sleep(config.jobs.POLL_INTERVAL_SECONDS)
+            st.rerun()
+
 def main():
     app = MultimodalApp()
     app.run()
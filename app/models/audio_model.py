@@ -3,6 +3,11 @@ import torch.nn as nn
 import torch.nn.functional as F
 import numpy as np
 from app.utils.logger import logger
+from app.utils.config import config
+from app.utils.metrics import metrics
+from app.processing.spectrogram import fit_frames
+from .quantization import quantize_audio_model
+from .checkpoints import load_module, resolve_checkpoint
 
 class AudioCNN(nn.Module):
     def __init__(self, num_classes: int = 4):
@@ -20,30 +25,70 @@ class AudioCNN(nn.Module):
         x = self.pool(F.relu(self.conv1(x)))
         x = self.pool(F.relu(self.conv2(x)))
         x = self.pool(F.relu(self.conv3(x)))
-        x = x.view(x.size(0), -1)
+        x = torch.flatten(x, 1)
         x = self.dropout(F.relu(self.fc1(x)))
         x = self.fc2(x)
         return x
 
 class AudioModel:
-    def __init__(self, model_path: str, num_classes: int = 4):
-        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-        self.model = AudioCNN(num_classes=num_classes)
+    def __init__(self, model_path: str, num_classes: int = 4, demo_mode: bool = None,
+                 quantization: str = None, calibration: np.ndarray = None):
+        self.quantization = quantization or config.model.AUDIO_QUANTIZATION
+        use_cuda = torch.cuda.is_available() and self.quantization == "none"
+        self.device = torch.device("cuda" if use_cuda else "cpu")
+        self.num_classes = num_classes
+        self.allow_demo_mode = config.model.AUDIO_DEMO_MODE if demo_mode is None else demo_mode
+        self.demo_mode = False
+        self.backend = "torch"
+        self.model = None
         self.load_model(model_path)
         self.model.to(self.device)
         self.model.eval()
+        if self.quantization != "none":
+            self.model = quantize_audio_model(self.model, self.quantization, calibration)
+            logger.info(f"Audio model quantized ({self.quantization} int8)")
         logger.info(f"Audio model loaded on device: {self.device}")
         
     def load_model(self, model_path: str):
         try:
-            state_dict = torch.load(model_path, map_location=self.device)
-            self.model.load_state_dict(state_dict)
-            logger.info(f"Audio model loaded from {model_path}")
+            self.model = load_module(lambda: AudioCNN(num_classes=self.num_classes), model_path, self.device)
+            logger.info(f"Audio model loaded from {resolve_checkpoint(model_path)}")
         except Exception as e:
             logger.error(f"Error loading audio model: {e}")
+            if not self.allow_demo_mode:
+                raise
+            self.demo_mode = True
+            self.model = AudioCNN(num_classes=self.num_classes)
             logger.warning("Continuing in demo mode with random predictions")
 
+    @staticmethod
+    def fit_frames(spectrogram: np.ndarray, n_frames: int = None):
+        return fit_frames(spectrogram, n_frames or config.model.N_FRAMES)
+
     def predict(self, spectrogram):
-        logger.warning("Using DEMO MODE - returning random predictions")
-        random_predictions = np.random.dirichlet(np.ones(4), size=1)[0]
-        return random_predictions
+        return self.predict_batch([spectrogram])[0]
+
+    def predict_batch(self, spectrograms, batch_size: int = None):
+        if self.demo_mode:
+            logger.warning("Using DEMO MODE - returning random predictions")
+            return np.random.dirichlet(np.ones(self.num_classes), size=len(spectrograms))
+
+        batch_size = batch_size or config.model.AUDIO_BATCH_SIZE
+        try:
+            if isinstance(spectrograms, np.ndarray) and spectrograms.ndim == 3 \
+                    and spectrograms.shape[-1] == config.model.N_FRAMES:
+                stack = spectrograms.astype(np.float32, copy=False)
+            else:
+                stack = np.stack([self.fit_frames(spec) for spec in spectrograms]).astype(np.float32)
+            outputs = []
+            with torch.inference_mode():
+                for start in range(0, len(stack), batch_size):
+                    batch = torch.as_tensor(stack[start:start + batch_size]).to(self.device)
+                    metrics.observe_size("batch_size", len(batch), {"model": "audio"})
+                    with metrics.span("audio_predict_batch"):
+                        probs = torch.softmax(self.model(batch), dim=-1)
+                        outputs.append(probs.cpu().numpy())
+            return np.concatenate(outputs, axis=0)
+        except Exception as e:
+            logger.error(f"Error in audio prediction: {e}")
+            raise
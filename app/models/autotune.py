@@ -0,0 +1,247 @@
+import argparse
+import json
+import os
+import platform
+import threading
+import time
+import numpy as np
+from app.utils.logger import logger
+from app.utils.config import config
+from app.utils.cache import text_cache, audio_cache
+from app.utils.profiling import latency_summary
+
+WORDS = ["the", "service", "was", "great", "but", "delivery", "slow", "and", "support", "never", "answered"]
+
+_applied = None
+_apply_lock = threading.Lock()
+
+def available_cores():
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+def host_key():
+    return f"{platform.node() or 'localhost'}-{available_cores()}cpu"
+
+def profile_path(host: str = None):
+    return os.path.join(config.model.AUTOTUNE_DIR, f"{host or host_key()}.json")
+
+def load_profile(host: str = None):
+    path = profile_path(host)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+def save_profile(profile: dict):
+    path = profile_path(profile["host"])
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(profile, f, indent=2)
+    os.replace(tmp_path, path)
+    return path
+
+def thread_candidates(workers: int = 1):
+    budget = max(1, available_cores() // max(1, workers))
+    candidates, threads = [], 1
+    while threads < budget:
+        candidates.append(threads)
+        threads *= 2
+    return candidates + [budget]
+
+def tuned_threads(workers: int):
+    profile = load_profile()
+    if profile and profile.get("workers") == workers:
+        return profile["threads"]
+    return None
+
+def apply_profile(profile: dict = None):
+    global _applied
+    with _apply_lock:
+        if profile is None and _applied is not None:
+            return _applied
+        profile = profile or load_profile()
+        if profile is None:
+            return None
+        if profile.get("backend", "torch") != config.model.BACKEND:
+            logger.warning(f"Ignoring execution profile tuned for the {profile.get('backend', 'torch')} backend; "
+                           f"run `python -m app.models.autotune` for {config.model.BACKEND}")
+            return None
+
+        threads = profile["threads"]
+        budget = max(1, available_cores() // max(1, config.server.WORKERS))
+        if profile.get("workers", 1) != config.server.WORKERS and threads > budget:
+            logger.warning(f"Profile was tuned for {profile.get('workers', 1)} worker(s); "
+                           f"capping threads at {budget} for {config.server.WORKERS}")
+            threads = budget
+
+        if config.model.BACKEND == "torch":
+            import torch
+            torch.set_num_threads(threads)
+        config.model.ORT_INTRA_OP_THREADS = threads
+        config.model.ORT_INTER_OP_THREADS = 1
+        config.model.TEXT_BATCH_SIZE = profile["text_batch_size"]
+        config.model.AUDIO_BATCH_SIZE = profile["audio_batch_size"]
+        _applied = dict(profile, threads=threads)
+        logger.info(f"Applied execution profile for {profile['host']}: {threads} thread(s), "
+                    f"text batch {profile['text_batch_size']}, audio batch {profile['audio_batch_size']}")
+        return _applied
+
+def synthetic_inputs(batch_size: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    words = max(8, config.model.MAX_LENGTH // 4)
+    texts = [" ".join(rng.choice(WORDS, size=words)) for _ in range(batch_size)]
+    spectrograms = rng.standard_normal((batch_size, config.model.N_MELS, config.model.N_FRAMES)).astype(np.float32)
+    return texts, spectrograms
+
+def measure(fn, repeats: int, warmup: int):
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return latency_summary(samples)
+
+def pareto_frontier(points):
+    frontier = []
+    for point in sorted(points, key=lambda p: (p["p95_ms"], -p["items_per_sec"])):
+        if not frontier or point["items_per_sec"] > frontier[-1]["items_per_sec"]:
+            frontier.append(point)
+    return frontier
+
+def thread_setter(models):
+    if all(getattr(model, "backend", "torch") == "onnx" for model in models.values()):
+        original = {name: model.intra_op_threads for name, model in models.items()}
+
+        def set_threads(threads):
+            for name, model in models.items():
+                model.set_threads(original[name] if threads is None else threads)
+        return set_threads
+
+    import torch
+    original = torch.get_num_threads()
+
+    def set_threads(threads):
+        torch.set_num_threads(original if threads is None else threads)
+    return set_threads
+
+def sweep(text_model, audio_model, threads=None, batch_sizes=None, repeats: int = 5, warmup: int = 1,
+          workers: int = 1):
+    batch_sizes = batch_sizes or config.model.AUTOTUNE_BATCH_SIZES
+    threads = threads or thread_candidates(workers)
+
+    models = {}
+    if text_model is not None:
+        models["text"] = getattr(text_model, "text_model", text_model)
+    if audio_model is not None and not getattr(audio_model, "demo_mode", False):
+        models["audio"] = audio_model
+
+    set_threads = thread_setter(models)
+    caches = (text_cache.enabled, audio_cache.enabled)
+    text_cache.enabled = audio_cache.enabled = False
+    points = []
+    try:
+        for thread_count in threads:
+            set_threads(thread_count)
+            for batch_size in batch_sizes:
+                texts, spectrograms = synthetic_inputs(batch_size)
+                inputs = {"text": texts, "audio": spectrograms}
+                for name, model in models.items():
+                    summary = measure(lambda: model.predict_batch(inputs[name], batch_size=batch_size),
+                                      repeats, warmup)
+                    point = {
+                        "model": name,
+                        "threads": thread_count,
+                        "batch_size": batch_size,
+                        "p50_ms": summary["p50_ms"],
+                        "p95_ms": summary["p95_ms"],
+                        "items_per_sec": batch_size * 1000.0 / summary["p50_ms"]
+                    }
+                    points.append(point)
+                    logger.info(f"autotune {name} threads={thread_count} batch={batch_size}: "
+                                f"p95 {point['p95_ms']:.1f} ms, {point['items_per_sec']:.1f} items/s")
+    finally:
+        set_threads(None)
+        text_cache.enabled, audio_cache.enabled = caches
+    return points
+
+def choose_profile(points, latency_budget_ms: float = None, workers: int = 1):
+    latency_budget_ms = latency_budget_ms or config.model.AUTOTUNE_LATENCY_BUDGET_MS
+    models = sorted({p["model"] for p in points})
+    peak = {name: max(p["items_per_sec"] for p in points if p["model"] == name) for name in models}
+
+    def best(name, threads):
+        candidates = [p for p in points if p["model"] == name and p["threads"] == threads]
+        within = [p for p in candidates if p["p95_ms"] <= latency_budget_ms] or \
+            [min(candidates, key=lambda p: p["p95_ms"])]
+        return max(within, key=lambda p: p["items_per_sec"])
+
+    scores = {}
+    for threads in sorted({p["threads"] for p in points}):
+        chosen = {name: best(name, threads) for name in models}
+        scores[threads] = (min(chosen[name]["items_per_sec"] / peak[name] for name in models), -threads, chosen)
+    threads = max(scores, key=lambda t: scores[t][:2])
+    chosen = scores[threads][2]
+
+    return {
+        "host": host_key(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "cores": available_cores(),
+        "workers": workers,
+        "backend": config.model.BACKEND,
+        "latency_budget_ms": latency_budget_ms,
+        "threads": threads,
+        "text_batch_size": chosen["text"]["batch_size"] if "text" in chosen else config.model.TEXT_BATCH_SIZE,
+        "audio_batch_size": chosen["audio"]["batch_size"] if "audio" in chosen else config.model.AUDIO_BATCH_SIZE,
+        "frontier": {name: pareto_frontier([p for p in points if p["model"] == name]) for name in models},
+        "points": points
+    }
+
+def autotune(text_model, audio_model, workers: int = None, repeats: int = 5, save: bool = True):
+    workers = workers or config.server.WORKERS
+    start = time.perf_counter()
+    profile = choose_profile(sweep(text_model, audio_model, repeats=repeats, workers=workers), workers=workers)
+    logger.info(f"Autotune finished in {time.perf_counter() - start:.1f}s")
+    if save:
+        logger.info(f"Execution profile saved to {save_profile(profile)}")
+    return profile
+
+def print_frontier(profile: dict):
+    print(f"Host {profile['host']} ({profile['cores']} cores, {profile['workers']} worker(s)) -> "
+          f"{profile['threads']} thread(s), text batch {profile['text_batch_size']}, "
+          f"audio batch {profile['audio_batch_size']}")
+    for name, frontier in profile["frontier"].items():
+        print(f"\n{name} throughput/latency frontier")
+        print(f"{'threads':>8} {'batch':>6} {'p50 ms':>9} {'p95 ms':>9} {'items/s':>10}")
+        for point in frontier:
+            print(f"{point['threads']:>8} {point['batch_size']:>6} {point['p50_ms']:>9.2f} "
+                  f"{point['p95_ms']:>9.2f} {point['items_per_sec']:>10.1f}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep thread counts and batch sizes and save a per-host profile")
+    parser.add_argument("--workers", type=int, default=config.server.WORKERS,
+                        help="Worker processes that will share this host")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--show", action="store_true", help="Print the saved profile instead of tuning")
+    parser.add_argument("--dry-run", action="store_true", help="Do not save the profile")
+    args = parser.parse_args(argv)
+
+    if args.show:
+        profile = load_profile()
+        if profile is None:
+            raise SystemExit(f"No profile at {profile_path()}")
+        print_frontier(profile)
+        return
+
+    config.model.AUTOTUNE = "off"
+    from .model_manager import ModelManager
+    manager = ModelManager()
+    manager.wait_until_ready()
+    profile = autotune(manager.text_model, manager.audio_model, args.workers, args.repeats, save=not args.dry_run)
+    print_frontier(profile)
+
+if __name__ == "__main__":
+    main()
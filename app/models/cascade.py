@@ -0,0 +1,206 @@
+import argparse
+import json
+import os
+import threading
+import time
+import zlib
+import numpy as np
+from app.utils.logger import logger
+from app.utils.config import config
+from app.utils.metrics import metrics
+from app.processing.text_processor import TextProcessor
+
+class HashedLinearModel:
+    def __init__(self, labels, n_features: int = 2 ** 18, weights: np.ndarray = None,
+                 bias: np.ndarray = None, threshold: float = None):
+        self.labels = list(labels)
+        self.n_features = n_features
+        self.weights = weights if weights is not None else np.zeros((n_features, len(self.labels)), np.float32)
+        self.bias = bias if bias is not None else np.zeros(len(self.labels), np.float32)
+        self.threshold = threshold
+
+    def features(self, texts):
+        rows, cols, values = [], [], []
+        for row, text in enumerate(texts):
+            tokens = text.split()
+            grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+            if not grams:
+                continue
+            rows.extend([row] * len(grams))
+            cols.extend(zlib.crc32(gram.encode("utf-8")) % self.n_features for gram in grams)
+            values.extend([1.0 / np.sqrt(len(grams))] * len(grams))
+        return np.asarray(rows, np.int64), np.asarray(cols, np.int64), np.asarray(values, np.float32)
+
+    def predict_proba(self, texts):
+        rows, cols, values = self.features(texts)
+        logits = np.tile(self.bias, (len(texts), 1))
+        np.add.at(logits, rows, self.weights[cols] * values[:, None])
+        logits -= logits.max(axis=1, keepdims=True)
+        probs = np.exp(logits)
+        return probs / probs.sum(axis=1, keepdims=True)
+
+    def fit(self, texts, targets, epochs: int = 300, learning_rate: float = 2.0, l2: float = 1e-4):
+        from scipy.sparse import csr_matrix
+
+        rows, cols, values = self.features(texts)
+        X = csr_matrix((values, (rows, cols)), shape=(len(texts), self.n_features))
+        targets = np.asarray(targets, np.float32)
+        for _ in range(epochs):
+            logits = X @ self.weights + self.bias
+            logits -= logits.max(axis=1, keepdims=True)
+            probs = np.exp(logits)
+            probs /= probs.sum(axis=1, keepdims=True)
+            error = (probs - targets) / len(texts)
+            self.weights -= learning_rate * (X.T @ error + l2 * self.weights)
+            self.bias -= learning_rate * error.sum(axis=0)
+        return self
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez_compressed(path, weights=self.weights, bias=self.bias, labels=np.asarray(self.labels),
+                            threshold=np.float32(self.threshold if self.threshold is not None else np.nan))
+
+    @classmethod
+    def load(cls, path: str):
+        with np.load(path) as data:
+            threshold = float(data["threshold"])
+            return cls(data["labels"].tolist(), data["weights"].shape[0], data["weights"], data["bias"],
+                       None if np.isnan(threshold) else threshold)
+
+class CascadeTextModel:
+    def __init__(self, text_model, first_stage: HashedLinearModel, threshold: float = None):
+        self.text_model = text_model
+        self.first_stage = first_stage
+        self.threshold = threshold or first_stage.threshold or 0.9
+        labels = [text_model.id2label[i] for i in range(len(text_model.id2label))]
+        if labels != first_stage.labels:
+            raise ValueError(f"Cascade labels {first_stage.labels} do not match text model labels {labels}")
+        self.tier_counts = {"lexicon": 0, "transformer": 0}
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        return getattr(self.text_model, name)
+
+    def predict(self, text: str):
+        try:
+            with metrics.span("text_predict"):
+                return self.predict_batch([text])[0]
+        except Exception as e:
+            logger.error(f"Error in text prediction: {e}")
+            raise
+
+    def predict_batch(self, texts, batch_size: int = None):
+        if not texts:
+            return []
+        with metrics.span("text_cascade", {"tier": "lexicon"}):
+            probs = self.first_stage.predict_proba(texts)
+        confident = probs.max(axis=1) >= self.threshold
+        results = [
+            [{"label": label, "score": float(score)} for label, score in zip(self.first_stage.labels, row)]
+            if accept else None
+            for row, accept in zip(probs, confident)
+        ]
+
+        escalated = [i for i, accept in enumerate(confident) if not accept]
+        if escalated:
+            with metrics.span("text_cascade", {"tier": "transformer"}):
+                outputs = self.text_model.predict_batch([texts[i] for i in escalated], batch_size)
+            for i, output in zip(escalated, outputs):
+                results[i] = output
+
+        handled = len(texts) - len(escalated)
+        metrics.inc("text_cascade_total", handled, {"tier": "lexicon"})
+        metrics.inc("text_cascade_total", len(escalated), {"tier": "transformer"})
+        with self._lock:
+            self.tier_counts["lexicon"] += handled
+            self.tier_counts["transformer"] += len(escalated)
+        return results
+
+    def stats(self):
+        with self._lock:
+            total = sum(self.tier_counts.values())
+            return dict(self.tier_counts, threshold=self.threshold,
+                        lexicon_rate=self.tier_counts["lexicon"] / total if total else 0.0)
+
+def read_corpus(path: str):
+    if path.endswith((".csv", ".jsonl")):
+        from app.batch import read_manifest
+        texts = [record["text"] for record in read_manifest(path) if record["text"]]
+    else:
+        with open(path, encoding="utf-8") as f:
+            texts = [line.strip() for line in f if line.strip()]
+    cleaned = [TextProcessor.clean_text(text) for text in texts]
+    return [text for text in cleaned if text]
+
+def pick_threshold(confidence, agree, target_agreement: float):
+    order = np.argsort(-confidence)
+    disagreements = np.cumsum(~agree[order])
+    allowed = (1.0 - target_agreement) * len(order)
+    accepted = int(np.searchsorted(disagreements, allowed, side="right"))
+    if accepted == 0:
+        return 1.0 + 1e-6, 0.0
+    return float(confidence[order[accepted - 1]]), accepted / len(order)
+
+def calibrate(text_model, texts, target_agreement: float, holdout: float = 0.2, seed: int = 0):
+    labels = [text_model.id2label[i] for i in range(len(text_model.id2label))]
+    start = time.perf_counter()
+    teacher = np.asarray([[item["score"] for item in result] for result in text_model.predict_batch(texts)])
+    transformer_ms = (time.perf_counter() - start) * 1000.0 / len(texts)
+
+    order = np.random.default_rng(seed).permutation(len(texts))
+    split = max(1, int(len(texts) * holdout))
+    test_idx, train_idx = order[:split], order[split:]
+    first_stage = HashedLinearModel(labels).fit([texts[i] for i in train_idx], teacher[train_idx])
+
+    test_texts = [texts[i] for i in test_idx]
+    start = time.perf_counter()
+    probs = first_stage.predict_proba(test_texts)
+    lexicon_ms = (time.perf_counter() - start) * 1000.0 / len(test_texts)
+    agree = probs.argmax(axis=1) == teacher[test_idx].argmax(axis=1)
+    threshold, coverage = pick_threshold(probs.max(axis=1), agree, target_agreement)
+    first_stage.threshold = threshold
+
+    report = {
+        "train_texts": len(train_idx),
+        "holdout_texts": len(test_idx),
+        "target_agreement": target_agreement,
+        "threshold": threshold,
+        "lexicon_coverage": coverage,
+        "lexicon_only_agreement": float(agree.mean()),
+        "transformer_ms_per_text": transformer_ms,
+        "lexicon_ms_per_text": lexicon_ms,
+        "expected_ms_per_text": lexicon_ms + (1.0 - coverage) * transformer_ms
+    }
+    return first_stage, report
+
+def load_cascade(text_model):
+    path = config.model.TEXT_CASCADE_PATH
+    if not os.path.exists(path):
+        logger.warning(f"Text cascade enabled but {path} does not exist; run `python -m app.models.cascade`")
+        return text_model
+    cascade = CascadeTextModel(text_model, HashedLinearModel.load(path), config.model.TEXT_CASCADE_THRESHOLD)
+    logger.info(f"Text cascade enabled (threshold {cascade.threshold:.3f})")
+    return cascade
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the cascade's first stage and pick its confidence threshold")
+    parser.add_argument("corpus", help="Text file with one input per line, or a CSV/JSONL manifest with a text column")
+    parser.add_argument("--target-agreement", type=float, default=0.98,
+                        help="Minimum fraction of cascade outputs that must match the transformer")
+    parser.add_argument("--holdout", type=float, default=0.2)
+    parser.add_argument("--output", default=config.model.TEXT_CASCADE_PATH)
+    args = parser.parse_args(argv)
+
+    from .model_manager import ModelManager
+    texts = read_corpus(args.corpus)
+    if len(texts) < 10:
+        raise SystemExit("Need at least 10 texts to calibrate")
+    text_model = ModelManager().text_model
+    text_model = getattr(text_model, "text_model", text_model)
+    first_stage, report = calibrate(text_model, texts, args.target_agreement, args.holdout)
+    first_stage.save(args.output)
+    print(json.dumps(report, indent=2))
+    logger.info(f"Saved first stage to {args.output}; enable it with ModelConfig.TEXT_CASCADE = True")
+
+if __name__ == "__main__":
+    main()
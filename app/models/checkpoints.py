@@ -0,0 +1,122 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import torch
+from safetensors.torch import load_file, save_file
+from app.utils.logger import logger
+from app.utils.config import config
+from app.utils.profiling import current_rss_mb, peak_rss_mb
+
+def safetensors_path(path: str):
+    return os.path.splitext(path)[0] + ".safetensors"
+
+def resolve_checkpoint(path: str):
+    if not path.endswith(".safetensors") and os.path.exists(safetensors_path(path)):
+        return safetensors_path(path)
+    return path
+
+def load_state_dict(path: str, device="cpu", prefer_safetensors: bool = True):
+    if prefer_safetensors:
+        path = resolve_checkpoint(path)
+    if path.endswith(".safetensors"):
+        return load_file(path, device=str(device))
+    try:
+        return torch.load(path, map_location=device, mmap=True, weights_only=True)
+    except RuntimeError as e:
+        if "mmap" not in str(e):
+            raise
+        logger.warning(f"{path} uses the legacy torch.save format and cannot be memory-mapped; "
+                       f"convert it with `python -m app.models.checkpoints convert-audio`")
+        return torch.load(path, map_location=device, weights_only=True)
+
+def convert_audio_checkpoint(src: str, dst: str = None):
+    dst = dst or safetensors_path(src)
+    state_dict = torch.load(src, map_location="cpu", weights_only=True)
+    save_file({name: tensor.contiguous() for name, tensor in state_dict.items()}, dst)
+    logger.info(f"Converted {src} -> {dst} ({os.path.getsize(dst) / 1e6:.1f} MB)")
+    return dst
+
+def convert_text_model(model_name: str, output_dir: str):
+    from transformers import AutoTokenizer, AutoModelForSequenceClassification
+    model = AutoModelForSequenceClassification.from_pretrained(model_name)
+    model.save_pretrained(output_dir, safe_serialization=True)
+    AutoTokenizer.from_pretrained(model_name).save_pretrained(output_dir)
+    logger.info(f"Saved {model_name} as safetensors to {output_dir}; set MULTISENSE_TEXT_MODEL={output_dir} to use it")
+    return output_dir
+
+def load_module(module_fn, path: str, device="cpu", prefer_safetensors: bool = True):
+    state_dict = load_state_dict(path, device, prefer_safetensors)
+    with torch.device("meta"):
+        module = module_fn()
+    module.load_state_dict(state_dict, assign=True)
+    return module
+
+def measure_load(kind: str, path: str):
+    if kind == "audio":
+        from .audio_model import AudioCNN
+    else:
+        from transformers import AutoModelForSequenceClassification
+    baseline, baseline_peak = current_rss_mb(), peak_rss_mb()
+    start = time.perf_counter()
+    if kind == "audio":
+        model = load_module(lambda: AudioCNN(config.model.NUM_AUDIO_CLASSES), path, prefer_safetensors=False)
+    else:
+        model = AutoModelForSequenceClassification.from_pretrained(path)
+    seconds = time.perf_counter() - start
+    return {
+        "kind": kind,
+        "path": path,
+        "load_seconds": seconds,
+        "rss_mb": current_rss_mb() - baseline,
+        "peak_rss_mb": peak_rss_mb() - baseline_peak
+    }
+
+def report(kind: str, paths):
+    rows = []
+    for path in paths:
+        output = subprocess.run(
+            [sys.executable, "-m", "app.models.checkpoints", "_measure", kind, path],
+            capture_output=True, text=True, check=True
+        ).stdout
+        rows.append(json.loads(output.strip().splitlines()[-1]))
+    for row in rows:
+        print(f"{row['path']}: load {row['load_seconds'] * 1000:.1f} ms, "
+              f"+{row['rss_mb']:.1f} MB RSS, +{row['peak_rss_mb']:.1f} MB peak RSS")
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert checkpoints to safetensors and compare load cost")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    audio = subparsers.add_parser("convert-audio", help="Convert a pickled .pth state dict to .safetensors")
+    audio.add_argument("src", nargs="?", default=config.model.AUDIO_MODEL_PATH)
+    audio.add_argument("dst", nargs="?", default=None)
+    text = subparsers.add_parser("convert-text", help="Re-save a text model with safetensors weights")
+    text.add_argument("output_dir")
+    text.add_argument("--model", default=None, help="Hub name or local path (default: the app's text model)")
+    compare = subparsers.add_parser("report", help="Load each checkpoint in a fresh process and report cost")
+    compare.add_argument("kind", choices=["audio", "text"])
+    compare.add_argument("paths", nargs="+")
+    measure = subparsers.add_parser("_measure")
+    measure.add_argument("kind")
+    measure.add_argument("path")
+    args = parser.parse_args(argv)
+
+    if args.command == "convert-audio":
+        dst = convert_audio_checkpoint(args.src, args.dst)
+        report("audio", [args.src, dst])
+    elif args.command == "convert-text":
+        if args.model is None:
+            from .text_model import TextModel
+            args.model = TextModel.DEFAULT_MODEL
+        convert_text_model(args.model, args.output_dir)
+        report("text", [args.model, args.output_dir])
+    elif args.command == "report":
+        report(args.kind, args.paths)
+    else:
+        print(json.dumps(measure_load(args.kind, args.path)))
+
+if __name__ == "__main__":
+    main()
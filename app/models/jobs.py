@@ -0,0 +1,178 @@
+import itertools
+import threading
+import time
+from collections import OrderedDict, deque
+from app.utils.logger import logger
+from app.utils.config import config
+from app.utils.metrics import metrics
+
+class JobCancelled(Exception):
+    pass
+
+class JobLimitError(Exception):
+    pass
+
+class Job:
+    def __init__(self, job_id: str, session_id: str, kind: str, fn, args):
+        self.id = job_id
+        self.session_id = session_id
+        self.kind = kind
+        self.fn = fn
+        self.args = args
+        self.status = "queued"
+        self.progress = 0.0
+        self.message = "Waiting for a free worker"
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._cancelled = threading.Event()
+
+    @property
+    def done(self):
+        return self.status in ("done", "failed", "cancelled")
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def check_cancelled(self):
+        if self._cancelled.is_set():
+            raise JobCancelled(f"Job {self.id} was cancelled")
+
+    def report(self, progress: float, message: str = None):
+        self.check_cancelled()
+        self.progress = min(1.0, max(self.progress, progress))
+        if message:
+            self.message = message
+
+class JobExecutor:
+    def __init__(self, max_running: int = None, per_session_limit: int = None, max_queued: int = None,
+                 retention_seconds: float = None):
+        self.max_running = max_running or config.jobs.MAX_RUNNING
+        self.per_session_limit = per_session_limit or config.jobs.PER_SESSION_LIMIT
+        self.max_queued = max_queued or config.jobs.MAX_QUEUED
+        self.retention_seconds = retention_seconds or config.jobs.RETENTION_SECONDS
+        self.jobs = {}
+        self._queues = OrderedDict()
+        self._queued = 0
+        self._running = 0
+        self._ids = itertools.count(1)
+        self._condition = threading.Condition()
+        self._workers = [
+            threading.Thread(target=self._work, name=f"analysis-job-{i}", daemon=True)
+            for i in range(self.max_running)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def _active(self, session_id: str):
+        return sum(1 for job in self.jobs.values() if job.session_id == session_id and not job.done)
+
+    def submit(self, session_id: str, kind: str, fn, *args):
+        with self._condition:
+            self._prune()
+            if self._active(session_id) >= self.per_session_limit:
+                metrics.inc("job_rejections_total", labels={"reason": "session_limit"})
+                raise JobLimitError(f"You already have {self.per_session_limit} analyses running; "
+                                    f"wait for one to finish or cancel it")
+            if self._queued >= self.max_queued:
+                metrics.inc("job_rejections_total", labels={"reason": "queue_full"})
+                raise JobLimitError("The server is busy, please try again shortly")
+
+            job = Job(f"{kind}-{next(self._ids)}", session_id, kind, fn, args)
+            self.jobs[job.id] = job
+            self._queues.setdefault(session_id, deque()).append(job)
+            self._queued += 1
+            metrics.set_gauge("jobs_queued", self._queued)
+            self._condition.notify()
+            return job
+
+    def get(self, job_id: str):
+        return self.jobs.get(job_id)
+
+    def cancel(self, job_id: str):
+        job = self.jobs.get(job_id)
+        if job is None or job.done:
+            return False
+        job.cancel()
+        with self._condition:
+            if job.status == "queued":
+                self._finish(job, "cancelled")
+        return True
+
+    def _next_job(self):
+        while True:
+            for session_id in list(self._queues):
+                queue = self._queues.pop(session_id)
+                while queue and queue[0].status != "queued":
+                    queue.popleft()
+                if not queue:
+                    continue
+                job = queue.popleft()
+                if queue:
+                    self._queues[session_id] = queue
+                return job
+            self._condition.wait()
+
+    def _work(self):
+        while True:
+            with self._condition:
+                job = self._next_job()
+                self._queued -= 1
+                self._running += 1
+                job.status, job.started_at, job.message = "running", time.time(), "Starting"
+                metrics.set_gauge("jobs_queued", self._queued)
+                metrics.set_gauge("jobs_running", self._running)
+            metrics.observe("job_wait_seconds", job.started_at - job.created_at)
+
+            status = "done"
+            try:
+                with metrics.span("job", {"kind": job.kind}):
+                    job.check_cancelled()
+                    job.result = job.fn(job, *job.args)
+                job.progress = 1.0
+            except JobCancelled:
+                status = "cancelled"
+            except Exception as e:
+                logger.error(f"Job {job.id} failed: {e}")
+                job.error = str(e)
+                status = "failed"
+
+            with self._condition:
+                self._running -= 1
+                metrics.set_gauge("jobs_running", self._running)
+                self._finish(job, status)
+
+    def _finish(self, job: Job, status: str):
+        if job.status == "queued":
+            self._queued -= 1
+            metrics.set_gauge("jobs_queued", self._queued)
+        job.status = status
+        job.finished_at = time.time()
+        job.message = {"done": "Finished", "failed": job.error, "cancelled": "Cancelled"}[status]
+        metrics.inc("jobs_total", labels={"kind": job.kind, "status": status})
+
+    def _prune(self):
+        cutoff = time.time() - self.retention_seconds
+        for job_id in [job_id for job_id, job in self.jobs.items() if job.done and job.finished_at < cutoff]:
+            del self.jobs[job_id]
+
+    def stats(self):
+        with self._condition:
+            return {"queued": self._queued, "running": self._running, "max_running": self.max_running,
+                    "sessions": len(self._queues)}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def get_job_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = JobExecutor()
+        return _executor
@@ -1,34 +1,134 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from app.utils.logger import logger
 from app.utils.config import config
-from .audio_model import AudioModel
-from .text_model import TextModel
+from app.utils.metrics import metrics
+from app.utils.startup import startup
 
 class ModelManager:
     _instance = None
-    _text_model = None
-    _audio_model = None
+    _futures = None
+    _executor = None
+    _lock = threading.Lock()
 
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super(ModelManager, cls).__new__(cls)
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super(ModelManager, cls).__new__(cls)
+                    cls._instance._futures = {}
         return cls._instance
 
+    @staticmethod
+    def _apply_profile():
+        if config.model.AUTOTUNE == "off":
+            return
+        from .autotune import apply_profile
+        try:
+            apply_profile()
+        except Exception as e:
+            logger.warning(f"Could not apply execution profile: {e}")
+
+    def _load_text_model(self):
+        self._apply_profile()
+        logger.info(f"Loading text model ({config.model.BACKEND} backend)...")
+        start = time.perf_counter()
+        if config.model.BACKEND == "onnx":
+            from .onnx_backend import OnnxTextModel
+            model = OnnxTextModel()
+        else:
+            from .text_model import TextModel
+            model = TextModel()
+        if config.model.TEXT_CASCADE:
+            from .cascade import load_cascade
+            model = load_cascade(model)
+        metrics.set_gauge("model_load_seconds", time.perf_counter() - start, {"model": "text"})
+        startup.mark("text_model_ready")
+        return model
+
+    def _load_audio_model(self):
+        self._apply_profile()
+        logger.info(f"Loading audio model ({config.model.BACKEND} backend)...")
+        start = time.perf_counter()
+        try:
+            if config.model.BACKEND == "onnx":
+                from .onnx_backend import OnnxAudioModel
+                model = OnnxAudioModel()
+            else:
+                from .audio_model import AudioModel
+                model = AudioModel(
+                    config.model.AUDIO_MODEL_PATH,
+                    config.model.NUM_AUDIO_CLASSES
+                )
+        except Exception as e:
+            logger.error(f"Audio model unavailable: {e}")
+            startup.mark("audio_model_failed")
+            return None
+        metrics.set_gauge("model_load_seconds", time.perf_counter() - start, {"model": "audio"})
+        startup.mark("audio_model_ready")
+        return model
+
+    def _future(self, name: str):
+        with self._lock:
+            future = self._futures.get(name)
+            if future is None:
+                if ModelManager._executor is None:
+                    ModelManager._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="model-loader")
+                loader = self._load_text_model if name == "text" else self._load_audio_model
+                future = self._futures[name] = ModelManager._executor.submit(loader)
+            return future
+
+    def start_loading(self):
+        startup.mark("model_loading_started")
+        return self._future("text"), self._future("audio")
+
+    def readiness(self):
+        state = {}
+        for name in ("text", "audio"):
+            future = self._futures.get(name)
+            if future is None:
+                state[name] = "not_loaded"
+            elif not future.done():
+                state[name] = "loading"
+            elif future.exception() is not None:
+                state[name] = "failed"
+            else:
+                state[name] = "ready" if future.result() is not None else "unavailable"
+        state["ready"] = state["text"] == "ready" and state["audio"] in ("ready", "unavailable")
+        return state
+
+    def wait_until_ready(self, timeout: float = None):
+        for future in self.start_loading():
+            try:
+                future.result(timeout=timeout)
+            except Exception as e:
+                logger.error(f"Model failed to load: {e}")
+        startup.mark("models_ready")
+        if config.model.AUTOTUNE == "startup":
+            from .autotune import load_profile
+            if load_profile() is None and self.readiness()["text"] == "ready":
+                self.autotune()
+        return self.readiness()
+
+    def autotune(self, workers: int = None):
+        from .autotune import autotune, apply_profile
+        profile = autotune(self.text_model, self.audio_model, workers)
+        applied = apply_profile(profile)
+        if applied and config.model.BACKEND == "onnx":
+            for model in (self.text_model, self.audio_model):
+                if model is not None:
+                    model.set_threads(applied["threads"])
+        return profile
+
     @property
     def text_model(self):
-        if self._text_model is None:
-            logger.info("Loading text model...")
-            self._text_model = TextModel()
-        return self._text_model
+        return self._future("text").result()
 
     @property
     def audio_model(self):
-        if self._audio_model is None:
-            logger.info("Loading audio model...")
-            self._audio_model = AudioModel(
-                config.model.AUDIO_MODEL_PATH,
-                config.model.NUM_AUDIO_CLASSES
-            )
-        return self._audio_model
+        return self._future("audio").result()
 
     def get_models(self):
-        return self.text_model, self.audio_model
\ No newline at end of file
+        self.start_loading()
+        return self.text_model, self.audio_model
@@ -0,0 +1,230 @@
+import argparse
+import json
+import os
+import numpy as np
+from app.utils.logger import logger
+from app.utils.config import config
+from app.utils.cache import text_cache, content_hash
+from app.utils.metrics import metrics
+from app.processing.spectrogram import fit_frames
+from app.processing.text_processor import TextChunker
+
+AUDIO_ONNX_FILE = "audio_cnn.onnx"
+TEXT_ONNX_FILE = "text_model.onnx"
+
+def _softmax(logits: np.ndarray):
+    shifted = logits - logits.max(axis=-1, keepdims=True)
+    exp = np.exp(shifted)
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+def create_session(path: str, intra_op_threads: int = None, inter_op_threads: int = None):
+    import onnxruntime as ort
+
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    intra_op_threads = config.model.ORT_INTRA_OP_THREADS if intra_op_threads is None else intra_op_threads
+    inter_op_threads = config.model.ORT_INTER_OP_THREADS if inter_op_threads is None else inter_op_threads
+    if intra_op_threads:
+        options.intra_op_num_threads = intra_op_threads
+    if inter_op_threads:
+        options.inter_op_num_threads = inter_op_threads
+    return ort.InferenceSession(path, sess_options=options, providers=["CPUExecutionProvider"])
+
+def export_audio_model(model_path: str = None, output_dir: str = None):
+    import torch
+    from .audio_model import AudioCNN
+    from .checkpoints import load_state_dict
+
+    output_dir = output_dir or config.model.ONNX_DIR
+    os.makedirs(output_dir, exist_ok=True)
+    model = AudioCNN(config.model.NUM_AUDIO_CLASSES)
+    model.load_state_dict(load_state_dict(model_path or config.model.AUDIO_MODEL_PATH))
+    model.eval()
+
+    output_path = os.path.join(output_dir, AUDIO_ONNX_FILE)
+    dummy = torch.zeros(1, config.model.N_MELS, config.model.N_FRAMES)
+    torch.onnx.export(
+        model, (dummy,), output_path,
+        input_names=["spectrogram"],
+        output_names=["logits"],
+        dynamic_axes={"spectrogram": {0: "batch"}, "logits": {0: "batch"}},
+        opset_version=17
+    )
+    logger.info(f"Exported AudioCNN to {output_path}")
+    return output_path
+
+def export_text_model(model_name: str = None, output_dir: str = None):
+    import torch
+    from transformers import AutoTokenizer, AutoModelForSequenceClassification
+    from .text_model import TextModel
+
+    model_name = model_name or TextModel.DEFAULT_MODEL
+    output_dir = output_dir or config.model.ONNX_DIR
+    os.makedirs(output_dir, exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModelForSequenceClassification.from_pretrained(model_name).eval()
+    model.config.return_dict = False
+
+    output_path = os.path.join(output_dir, TEXT_ONNX_FILE)
+    dummy = tokenizer(["a short example", "a slightly longer example sentence"], padding=True, return_tensors="pt")
+    torch.onnx.export(
+        model, (dummy["input_ids"], dummy["attention_mask"]), output_path,
+        input_names=["input_ids", "attention_mask"],
+        output_names=["logits"],
+        dynamic_axes={
+            "input_ids": {0: "batch", 1: "sequence"},
+            "attention_mask": {0: "batch", 1: "sequence"},
+            "logits": {0: "batch"}
+        },
+        opset_version=17
+    )
+    tokenizer.save_pretrained(output_dir)
+    with open(os.path.join(output_dir, "text_labels.json"), "w") as f:
+        json.dump({"model_name": model_name, "id2label": model.config.id2label}, f)
+    logger.info(f"Exported {model_name} to {output_path}")
+    return output_path
+
+class OnnxAudioModel:
+    def __init__(self, onnx_dir: str = None):
+        self.backend = "onnx"
+        self.quantization = "none"
+        self.demo_mode = False
+        self.num_classes = config.model.NUM_AUDIO_CLASSES
+        self.path = os.path.join(onnx_dir or config.model.ONNX_DIR, AUDIO_ONNX_FILE)
+        self.intra_op_threads = config.model.ORT_INTRA_OP_THREADS
+        self.session = create_session(self.path)
+        logger.info(f"Audio model loaded with ONNX Runtime from {self.path}")
+
+    def set_threads(self, intra_op_threads: int):
+        self.intra_op_threads = intra_op_threads
+        self.session = create_session(self.path, intra_op_threads)
+
+    @staticmethod
+    def fit_frames(spectrogram: np.ndarray, n_frames: int = None):
+        return fit_frames(spectrogram, n_frames or config.model.N_FRAMES)
+
+    def predict(self, spectrogram):
+        return self.predict_batch([spectrogram])[0]
+
+    def predict_batch(self, spectrograms, batch_size: int = None):
+        batch_size = batch_size or config.model.AUDIO_BATCH_SIZE
+        try:
+            if isinstance(spectrograms, np.ndarray) and spectrograms.ndim == 3 \
+                    and spectrograms.shape[-1] == config.model.N_FRAMES:
+                stack = spectrograms.astype(np.float32, copy=False)
+            else:
+                stack = np.stack([self.fit_frames(spec) for spec in spectrograms]).astype(np.float32)
+            outputs = []
+            for start in range(0, len(stack), batch_size):
+                batch = stack[start:start + batch_size]
+                metrics.observe_size("batch_size", len(batch), {"model": "audio"})
+                with metrics.span("audio_predict_batch"):
+                    logits = self.session.run(["logits"], {"spectrogram": batch})[0]
+                outputs.append(_softmax(logits))
+            return np.concatenate(outputs, axis=0)
+        except Exception as e:
+            logger.error(f"Error in ONNX audio prediction: {e}")
+            raise
+
+class OnnxTextModel:
+    def __init__(self, onnx_dir: str = None):
+        from tokenizers import Tokenizer
+
+        onnx_dir = onnx_dir or config.model.ONNX_DIR
+        self.backend = "onnx"
+        self.quantization = "none"
+        with open(os.path.join(onnx_dir, "text_labels.json")) as f:
+            labels = json.load(f)
+        self.model_name = labels["model_name"]
+        self.id2label = {int(k): v for k, v in labels["id2label"].items()}
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(onnx_dir, "tokenizer.json"))
+        self.tokenizer.no_padding()
+        self.tokenizer.enable_truncation(max_length=config.model.MAX_LENGTH, stride=config.model.TEXT_CHUNK_STRIDE)
+        pad_id = self.tokenizer.token_to_id("<pad>")
+        if pad_id is None:
+            pad_id = self.tokenizer.token_to_id("[PAD]") or 0
+        self.pad_id = pad_id
+
+        self.path = os.path.join(onnx_dir, TEXT_ONNX_FILE)
+        self.intra_op_threads = config.model.ORT_INTRA_OP_THREADS
+        self.session = create_session(self.path)
+        logger.info(f"✅ Text model {self.model_name} loaded with ONNX Runtime")
+
+    def set_threads(self, intra_op_threads: int):
+        self.intra_op_threads = intra_op_threads
+        self.session = create_session(self.path, intra_op_threads)
+
+    def cache_key(self, text: str):
+        return content_hash(text, self.model_name, self.backend, self.quantization,
+                            config.model.MAX_LENGTH, config.model.TEXT_CHUNK_STRIDE)
+
+    def chunk(self, texts):
+        windows, docs = [], []
+        for doc, encoding in enumerate(self.tokenizer.encode_batch(list(texts))):
+            for window in [encoding] + list(encoding.overflowing):
+                windows.append(window.ids)
+                docs.append(doc)
+        return windows, docs
+
+    def predict(self, text: str):
+        return self.predict_batch([text])[0]
+
+    def predict_batch(self, texts, batch_size: int = None):
+        batch_size = batch_size or config.model.TEXT_BATCH_SIZE
+        try:
+            if not texts:
+                return []
+
+            keys = [self.cache_key(text) for text in texts]
+            results = [text_cache.get(key) for key in keys]
+            pending = [i for i, result in enumerate(results) if result is None]
+            if not pending:
+                return results
+
+            windows, docs = self.chunk([texts[i] for i in pending])
+            lengths = [len(ids) for ids in windows]
+            order = sorted(range(len(windows)), key=lambda w: lengths[w])
+
+            window_probs = [None] * len(windows)
+            for start in range(0, len(order), batch_size):
+                bucket = order[start:start + batch_size]
+                metrics.observe_size("batch_size", len(bucket), {"model": "text"})
+                with metrics.span("text_predict_batch"):
+                    probs = self._forward([windows[w] for w in bucket])
+                for w, row in zip(bucket, probs):
+                    window_probs[w] = row
+
+            doc_probs = TextChunker.aggregate(window_probs, docs, lengths, len(pending))
+            for i, row in zip(pending, doc_probs):
+                results[i] = [{"label": self.id2label[j], "score": float(score)} for j, score in enumerate(row)]
+                text_cache.set(keys[i], results[i])
+            return results
+        except Exception as e:
+            logger.error(f"Error in ONNX text prediction: {e}")
+            raise
+
+    def _forward(self, input_ids):
+        longest = max(len(ids) for ids in input_ids)
+        ids = np.full((len(input_ids), longest), self.pad_id, dtype=np.int64)
+        mask = np.zeros((len(input_ids), longest), dtype=np.int64)
+        for row, window in enumerate(input_ids):
+            ids[row, :len(window)] = window
+            mask[row, :len(window)] = 1
+        return _softmax(self.session.run(["logits"], {"input_ids": ids, "attention_mask": mask})[0])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export models to ONNX")
+    parser.add_argument("--models", nargs="+", choices=["text", "audio"], default=["text", "audio"])
+    parser.add_argument("--text-model", default=None)
+    parser.add_argument("--audio-checkpoint", default=None)
+    parser.add_argument("--output-dir", default=config.model.ONNX_DIR)
+    args = parser.parse_args(argv)
+
+    if "audio" in args.models:
+        export_audio_model(args.audio_checkpoint, args.output_dir)
+    if "text" in args.models:
+        export_text_model(args.text_model, args.output_dir)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+import argparse
+import copy
+import io
+import json
+import torch
+import torch.nn as nn
+import numpy as np
+from app.utils.logger import logger
+from app.utils.config import config
+from app.utils.profiling import current_rss_mb, latency_summary, time_calls
+
+QUANTIZATION_MODES = ("none", "dynamic", "static")
+
+def model_size_mb(model: nn.Module):
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.tell() / (1024.0 * 1024.0)
+
+def _select_engine():
+    engines = torch.backends.quantized.supported_engines
+    for engine in ("fbgemm", "x86", "qnnpack"):
+        if engine in engines:
+            torch.backends.quantized.engine = engine
+            return engine
+    return torch.backends.quantized.engine
+
+def quantize_dynamic_linear(model: nn.Module):
+    _select_engine()
+    return torch.ao.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+
+def quantize_audio_static(model: nn.Module, calibration: np.ndarray):
+    from torch.ao.quantization import get_default_qconfig_mapping
+    from torch.ao.quantization.quantize_fx import prepare_fx, convert_fx
+
+    engine = _select_engine()
+    example = torch.from_numpy(calibration[:1].astype(np.float32))
+    prepared = prepare_fx(copy.deepcopy(model).eval(), get_default_qconfig_mapping(engine), (example,))
+    with torch.inference_mode():
+        for start in range(0, len(calibration), config.model.AUDIO_BATCH_SIZE):
+            prepared(torch.from_numpy(calibration[start:start + config.model.AUDIO_BATCH_SIZE].astype(np.float32)))
+    return convert_fx(prepared)
+
+def synthetic_spectrograms(count: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    return rng.standard_normal((count, config.model.N_MELS, config.model.N_FRAMES)).astype(np.float32)
+
+def quantize_audio_model(model: nn.Module, mode: str, calibration: np.ndarray = None):
+    if mode == "none":
+        return model
+    if mode == "dynamic":
+        return quantize_dynamic_linear(model)
+    if mode == "static":
+        if calibration is None:
+            logger.warning("No calibration spectrograms given, calibrating static quantization on synthetic input")
+            calibration = synthetic_spectrograms(config.model.AUDIO_QUANTIZATION_CALIBRATION_SIZE)
+        return quantize_audio_static(model, calibration)
+    raise ValueError(f"Unknown quantization mode '{mode}', expected one of {QUANTIZATION_MODES}")
+
+def quantize_text_model(model: nn.Module, mode: str):
+    if mode == "none":
+        return model
+    if mode in ("dynamic", "static"):
+        if mode == "static":
+            logger.warning("Static quantization is not supported for the text model, using dynamic int8")
+        return quantize_dynamic_linear(model)
+    raise ValueError(f"Unknown quantization mode '{mode}', expected one of {QUANTIZATION_MODES}")
+
+def _compare(name, fp32_fn, quant_fn, inputs, fp32_size, quant_size, rss_before, rss_after):
+    fp32_times, fp32_out = time_calls(fp32_fn, inputs)
+    quant_times, quant_out = time_calls(quant_fn, inputs)
+    agreement = float(np.mean([np.argmax(a) == np.argmax(b) for a, b in zip(fp32_out, quant_out)]))
+    return {
+        "model": name,
+        "fp32_size_mb": fp32_size,
+        "quantized_size_mb": quant_size,
+        "rss_delta_mb": rss_after - rss_before,
+        "fp32_latency": latency_summary(fp32_times),
+        "quantized_latency": latency_summary(quant_times),
+        "agreement": agreement
+    }
+
+def compare_audio(mode: str, samples: int = 64):
+    from .audio_model import AudioCNN
+    from .checkpoints import load_state_dict
+
+    torch.manual_seed(0)
+    fp32 = AudioCNN(config.model.NUM_AUDIO_CLASSES)
+    try:
+        fp32.load_state_dict(load_state_dict(config.model.AUDIO_MODEL_PATH))
+    except Exception as e:
+        logger.warning(f"Comparing against randomly initialised AudioCNN: {e}")
+    fp32.eval()
+
+    inputs = list(synthetic_spectrograms(samples, seed=1)[:, None])
+    rss_before = current_rss_mb()
+    quantized = quantize_audio_model(copy.deepcopy(fp32), mode, synthetic_spectrograms(32, seed=2))
+    rss_after = current_rss_mb()
+
+    def run(model):
+        def fn(spec):
+            with torch.inference_mode():
+                return model(torch.from_numpy(spec)).numpy()[0]
+        return fn
+
+    return _compare("audio_cnn", run(fp32), run(quantized), inputs,
+                    model_size_mb(fp32), model_size_mb(quantized), rss_before, rss_after)
+
+def compare_text(mode: str, model_name: str = None, samples: int = 64):
+    from transformers import AutoTokenizer, AutoModelForSequenceClassification
+    from .text_model import TextModel
+
+    model_name = model_name or TextModel.DEFAULT_MODEL
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    fp32 = AutoModelForSequenceClassification.from_pretrained(model_name).eval()
+
+    rss_before = current_rss_mb()
+    quantized = quantize_text_model(copy.deepcopy(fp32), mode)
+    rss_after = current_rss_mb()
+
+    phrases = ["the service was great", "i am very disappointed with the delay",
+               "it was okay nothing special", "terrible support would not recommend"]
+    inputs = [" ".join(phrases[i % len(phrases)] for i in range(n % 8 + 1)) for n in range(samples)]
+
+    def run(model):
+        def fn(text):
+            encoded = tokenizer(text, truncation=True, max_length=config.model.MAX_LENGTH, return_tensors="pt")
+            with torch.inference_mode():
+                return model(**encoded).logits.numpy()[0]
+        return fn
+
+    return _compare(model_name, run(fp32), run(quantized), inputs,
+                    model_size_mb(fp32), model_size_mb(quantized), rss_before, rss_after)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare quantized models against fp32")
+    parser.add_argument("--mode", choices=QUANTIZATION_MODES[1:], default="dynamic")
+    parser.add_argument("--models", nargs="+", choices=["text", "audio"], default=["text", "audio"])
+    parser.add_argument("--text-model", default=None)
+    parser.add_argument("--samples", type=int, default=64)
+    parser.add_argument("--output", default=None, help="Write the report as JSON to this path")
+    args = parser.parse_args(argv)
+
+    report = []
+    if "audio" in args.models:
+        report.append(compare_audio(args.mode, args.samples))
+    if "text" in args.models:
+        report.append(compare_text(args.mode, args.text_model, args.samples))
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    print(text)
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,23 @@
+import torch
 from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification
 from app.utils.logger import logger
 from app.utils.config import config
+from app.utils.cache import text_cache, content_hash
+from app.utils.metrics import metrics
+from app.processing.text_processor import TextChunker
+from .quantization import quantize_text_model
 
 class TextModel:
-    def __init__(self, model_name: str = None):
-        self.model_name = model_name or "cardiffnlp/twitter-roberta-base-sentiment-latest"
+    DEFAULT_MODEL = "cardiffnlp/twitter-roberta-base-sentiment-latest"
+
+    def __init__(self, model_name: str = None, quantization: str = None):
+        self.model_name = model_name or config.model.TEXT_MODEL_PATH or self.DEFAULT_MODEL
+        self.quantization = quantization or config.model.TEXT_QUANTIZATION
+        self.backend = "torch"
         self.pipeline = None
         self.load_model()
+        self.apply_quantization()
+        self.chunker = TextChunker(self.tokenizer)
         
     def load_model(self):
         try:
@@ -14,7 +25,7 @@ class TextModel:
                 "sentiment-analysis",
                 model=self.model_name,
                 tokenizer=self.model_name,
-                return_all_scores=True,
+                top_k=None,
                 framework="pt"
             )
             logger.info(f"✅ Text model {self.model_name} loaded successfully")
@@ -25,17 +36,86 @@ class TextModel:
                 self.pipeline = pipeline(
                     "sentiment-analysis",
                     model=self.model_name,
-                    return_all_scores=True
+                    top_k=None
                 )
                 logger.info(f"✅ Fallback to default model: {self.model_name}")
             except Exception as fallback_error:
                 logger.error(f"❌ Fallback also failed: {fallback_error}")
                 raise
 
+    def apply_quantization(self):
+        if self.quantization == "none":
+            return
+        self.pipeline.model = quantize_text_model(self.pipeline.model.to("cpu"), self.quantization)
+        self.pipeline.device = torch.device("cpu")
+        logger.info(f"Text model quantized ({self.quantization} int8)")
+
+    @property
+    def tokenizer(self):
+        return self.pipeline.tokenizer
+
+    @property
+    def model(self):
+        return self.pipeline.model
+
+    @property
+    def id2label(self):
+        return self.model.config.id2label
+
+    def cache_key(self, text: str):
+        return content_hash(text, self.model_name, self.backend, self.quantization,
+                            config.model.MAX_LENGTH, config.model.TEXT_CHUNK_STRIDE)
+
     def predict(self, text: str):
         try:
-            results = self.pipeline(text)
-            return results[0]
+            with metrics.span("text_predict"):
+                return self.predict_batch([text])[0]
         except Exception as e:
             logger.error(f"Error in text prediction: {e}")
             raise
+
+    def predict_batch(self, texts, batch_size: int = None):
+        batch_size = batch_size or config.model.TEXT_BATCH_SIZE
+        try:
+            if not texts:
+                return []
+
+            keys = [self.cache_key(text) for text in texts]
+            results = [text_cache.get(key) for key in keys]
+            pending = [i for i, result in enumerate(results) if result is None]
+            if not pending:
+                return results
+
+            windows, docs = self.chunker.chunk([texts[i] for i in pending])
+            lengths = [len(ids) for ids in windows]
+            order = sorted(range(len(windows)), key=lambda w: lengths[w])
+
+            window_probs = [None] * len(windows)
+            for start in range(0, len(order), batch_size):
+                bucket = order[start:start + batch_size]
+                metrics.observe_size("batch_size", len(bucket), {"model": "text"})
+                with metrics.span("text_predict_batch"):
+                    probs = self._forward([windows[w] for w in bucket])
+                for w, row in zip(bucket, probs):
+                    window_probs[w] = row
+
+            id2label = self.id2label
+            doc_probs = self.chunker.aggregate(window_probs, docs, lengths, len(pending))
+            for i, row in zip(pending, doc_probs):
+                results[i] = [{"label": id2label[j], "score": float(score)} for j, score in enumerate(row)]
+                text_cache.set(keys[i], results[i])
+            return results
+        except Exception as e:
+            logger.error(f"Error in batched text prediction: {e}")
+            raise
+
+    def _forward(self, input_ids):
+        encoded = self.tokenizer.pad(
+            {"input_ids": input_ids},
+            padding="longest",
+            return_tensors="pt"
+        ).to(self.model.device)
+
+        with torch.inference_mode():
+            logits = self.model(**encoded).logits
+            return torch.softmax(logits, dim=-1).cpu().numpy()
@@ -1,57 +1,144 @@
-import librosa
+import io
+import os
 import numpy as np
 import tempfile
-import soundfile as sf
 from app.utils.logger import logger
 from app.utils.config import config
+from app.utils.metrics import metrics, CONFIDENCE_BUCKETS
+from app.utils.startup import lazy_import
+from .spectrogram import get_mel_frontend
+from .vad import VoiceActivityDetector
+
+librosa = lazy_import("librosa")
+sf = lazy_import("soundfile")
+
+RESAMPLERS = {"hq": "soxr_hq", "fast": "soxr_qq", "polyphase": "polyphase"}
 
 class AudioProcessor:
-    def __init__(self):
+    def __init__(self, resampler: str = None, vad: bool = None):
         self.sample_rate = config.model.SAMPLE_RATE
         self.duration = config.model.DURATION
         self.n_mels = config.model.N_MELS
+        self.n_fft = config.model.N_FFT
+        self.hop_length = config.model.HOP_LENGTH
+        self.resampler = resampler or config.model.RESAMPLER
+        if self.resampler not in RESAMPLERS:
+            raise ValueError(f"Unknown resampler {self.resampler!r}, expected one of {sorted(RESAMPLERS)}")
+        use_vad = config.model.VAD_ENABLED if vad is None else vad
+        self.vad = VoiceActivityDetector(self.sample_rate) if use_vad else None
+        self.read_seconds = max(config.model.VAD_SCAN_SECONDS, self.duration or 0) if use_vad else self.duration
+
+    def feature_config(self):
+        return (self.sample_rate, self.duration, self.n_mels, self.n_fft, self.hop_length, self.resampler,
+                self.read_seconds if self.vad else None)
 
-    def load_audio(self, file_path: str):
+    @metrics.timed("audio_load")
+    def load_audio(self, file_path: str, offset: float = 0.0, return_stats: bool = False):
         try:
-            audio, sr = librosa.load(
-                file_path, 
-                sr=self.sample_rate, 
-                duration=self.duration
-            )
-            return audio, sr
+            try:
+                audio, sr = self.read_frames(file_path, offset)
+            except RuntimeError as e:
+                logger.info(f"soundfile cannot decode {file_path} ({e}), falling back to librosa")
+                audio, sr = librosa.load(
+                    file_path, 
+                    sr=self.sample_rate, 
+                    offset=offset,
+                    duration=self.read_seconds,
+                    res_type=RESAMPLERS[self.resampler]
+                )
+            return self.select_speech(audio, sr, return_stats)
         except Exception as e:
             logger.error(f"Error loading audio: {e}")
             raise
 
+    def select_speech(self, audio: np.ndarray, sr: int, return_stats: bool = False):
+        stats = None
+        if self.vad is not None:
+            audio, stats = self.vad.trim(audio)
+            if self.duration:
+                audio = audio[:int(self.duration * sr)]
+            metrics.observe("vad_discarded_ratio", stats["discarded_ratio"], buckets=CONFIDENCE_BUCKETS)
+        return (audio, sr, stats) if return_stats else (audio, sr)
+
+    def read_frames(self, source, offset: float = 0.0):
+        with sf.SoundFile(source) as f:
+            native_sr = f.samplerate
+            if offset:
+                f.seek(min(int(offset * native_sr), f.frames))
+            frames = int(self.read_seconds * native_sr) if self.read_seconds else -1
+            audio = f.read(frames=frames, dtype='float32', always_2d=True)
+        return self.resample(audio.mean(axis=1), native_sr), self.sample_rate
+
+    @metrics.timed("audio_resample")
+    def resample(self, audio: np.ndarray, native_sr: int):
+        if native_sr == self.sample_rate:
+            return audio
+        return librosa.resample(audio, orig_sr=native_sr, target_sr=self.sample_rate,
+                                res_type=RESAMPLERS[self.resampler])
+
+    @metrics.timed("audio_spectrogram")
     def create_spectrogram(self, audio: np.ndarray):
         try:
-            mel_spec = librosa.feature.melspectrogram(
-                y=audio,
-                sr=self.sample_rate,
-                n_mels=self.n_mels,
-                n_fft=2048,
-                hop_length=512
-            )
-            
-            log_mel_spec = librosa.power_to_db(mel_spec, ref=np.max)
-            log_mel_spec = (log_mel_spec - log_mel_spec.mean()) / log_mel_spec.std()
-            
-            return log_mel_spec
-            
+            return self.mel_frontend(np.asarray(audio, dtype=np.float32)[None])[0]
         except Exception as e:
             logger.error(f"Error creating spectrogram: {e}")
             raise
 
-    def process_uploaded_file(self, uploaded_file):
+    @property
+    def mel_frontend(self):
+        return get_mel_frontend(self.sample_rate, self.n_fft, self.hop_length, self.n_mels)
+
+    @metrics.timed("audio_spectrogram_batch")
+    def create_spectrogram_batch(self, audio_batch):
         try:
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as tmp_file:
-                tmp_file.write(uploaded_file.getvalue())
-                tmp_path = tmp_file.name
+            if isinstance(audio_batch, (list, tuple)):
+                lengths = {len(audio) for audio in audio_batch}
+                if len(lengths) > 1:
+                    spectrograms = [None] * len(audio_batch)
+                    for length in lengths:
+                        group = [i for i, audio in enumerate(audio_batch) if len(audio) == length]
+                        for i, spectrogram in zip(group, self.mel_frontend(np.stack([audio_batch[i] for i in group]))):
+                            spectrograms[i] = spectrogram
+                    return spectrograms
+                audio_batch = np.stack(audio_batch)
+            return self.mel_frontend(audio_batch)
+        except Exception as e:
+            logger.error(f"Error creating spectrogram batch: {e}")
+            raise
+
+    @metrics.timed("audio_decode")
+    def decode_bytes(self, data, return_stats: bool = False):
+        audio, sr = self.read_frames(io.BytesIO(data))
+        return self.select_speech(audio, sr, return_stats)
 
-            audio, _ = self.load_audio(tmp_path)
+    @metrics.timed("audio_decode_tempfile")
+    def decode_with_tempfile(self, data, suffix: str = '.wav'):
+        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
+            tmp_file.write(data)
+            tmp_path = tmp_file.name
+        try:
+            return self.load_audio(tmp_path)
+        finally:
+            os.unlink(tmp_path)
+
+    def decode(self, data, suffix: str = None):
+        try:
+            return self.decode_bytes(data)
+        except Exception as e:
+            suffix = suffix or '.wav'
+            logger.info(f"In-memory decode unavailable ({e}), falling back to temp file for {suffix}")
+            return self.decode_with_tempfile(data, suffix=suffix)
+
+    def decode_upload(self, uploaded_file):
+        data = uploaded_file.getbuffer() if hasattr(uploaded_file, 'getbuffer') else uploaded_file.getvalue()
+        return self.decode(data, os.path.splitext(getattr(uploaded_file, 'name', '') or '')[1])
+
+    def process_uploaded_file(self, uploaded_file):
+        try:
+            audio, _ = self.decode_upload(uploaded_file)
             spectrogram = self.create_spectrogram(audio)
             
-            return spectrogram, tmp_path
+            return spectrogram
             
         except Exception as e:
             logger.error(f"Error processing uploaded file: {e}")
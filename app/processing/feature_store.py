@@ -0,0 +1,190 @@
+import argparse
+import json
+import os
+import re
+import threading
+import numpy as np
+from numpy.lib.format import open_memmap
+from app.utils.logger import logger
+from app.utils.config import config
+from app.utils.cache import content_hash
+from .spectrogram import fit_frames
+
+def feature_fingerprint():
+    return content_hash(
+        "log-mel",
+        config.model.SAMPLE_RATE,
+        config.model.DURATION,
+        config.model.N_MELS,
+        config.model.N_FFT,
+        config.model.HOP_LENGTH,
+        config.model.N_FRAMES,
+        config.model.RESAMPLER,
+        config.model.VAD_SCAN_SECONDS if config.model.VAD_ENABLED else None
+    )[:16]
+
+class FeatureStore:
+    DTYPE = np.float32
+    OWNED_FILES = re.compile(r"shard-\d{5,}\.npy|index\.jsonl|meta\.json")
+
+    def __init__(self, root: str = None, shard_rows: int = None):
+        self.root = root or config.cache.FEATURE_STORE_DIR
+        if not self.root:
+            raise ValueError("No feature store directory configured")
+        self.shard_rows = shard_rows or config.cache.FEATURE_STORE_SHARD_ROWS
+        self.shape = (config.model.N_MELS, config.model.N_FRAMES)
+        self.fingerprint = feature_fingerprint()
+        self.index = {}
+        self.shard_fill = {}
+        self._shards = {}
+        self._lock = threading.Lock()
+        self._open()
+
+    @property
+    def _index_path(self):
+        return os.path.join(self.root, "index.jsonl")
+
+    def _shard_path(self, shard: int):
+        return os.path.join(self.root, f"shard-{shard:05d}.npy")
+
+    def _owned_files(self):
+        if not os.path.isdir(self.root):
+            return []
+        names = os.listdir(self.root)
+        foreign = [name for name in names if not self.OWNED_FILES.fullmatch(name)]
+        if foreign:
+            logger.error(f"Refusing to use {self.root} as a feature store, it contains {sorted(foreign)[:5]}")
+            raise ValueError(f"Feature store directory {self.root} contains files it does not own")
+        return names
+
+    def _open(self):
+        owned = self._owned_files()
+        meta_path = os.path.join(self.root, "meta.json")
+        meta = None
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                meta = json.load(f)
+        if meta and meta.get("fingerprint") != self.fingerprint:
+            logger.warning(f"Feature config changed ({meta.get('fingerprint')} -> {self.fingerprint}), "
+                           f"invalidating feature store at {self.root}")
+            for name in owned:
+                os.remove(os.path.join(self.root, name))
+            meta = None
+
+        os.makedirs(self.root, exist_ok=True)
+        if meta is None:
+            with open(meta_path, "w") as f:
+                json.dump({"fingerprint": self.fingerprint, "shape": list(self.shape),
+                           "dtype": np.dtype(self.DTYPE).name, "shard_rows": self.shard_rows}, f)
+        else:
+            self.shard_rows = meta["shard_rows"]
+
+        if os.path.exists(self._index_path):
+            with open(self._index_path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    self.index[entry["key"]] = (entry["shard"], entry["offset"])
+                    self.shard_fill[entry["shard"]] = max(self.shard_fill.get(entry["shard"], 0), entry["offset"] + 1)
+        logger.info(f"Feature store {self.root}: {len(self.index)} spectrograms in {len(self.shard_fill)} shard(s)")
+
+    def _shard(self, shard: int, writable: bool = False):
+        array = self._shards.get(shard)
+        if array is None or (writable and not array.flags.writeable):
+            path = self._shard_path(shard)
+            if os.path.exists(path):
+                array = open_memmap(path, mode="r+" if writable else "c")
+            else:
+                array = open_memmap(path, mode="w+", dtype=self.DTYPE, shape=(self.shard_rows,) + self.shape)
+            self._shards[shard] = array
+        return array
+
+    def __contains__(self, key: str):
+        return key in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def get(self, key: str):
+        location = self.index.get(key)
+        if location is None:
+            return None
+        shard, offset = location
+        with self._lock:
+            return self._shard(shard)[offset]
+
+    def put(self, key: str, spectrogram: np.ndarray):
+        with self._lock:
+            if key in self.index:
+                return self.index[key]
+            shard = max(self.shard_fill) if self.shard_fill else 0
+            offset = self.shard_fill.get(shard, 0)
+            if offset >= self.shard_rows:
+                shard, offset = shard + 1, 0
+
+            array = self._shard(shard, writable=True)
+            array[offset] = fit_frames(spectrogram, self.shape[1])
+            array.flush()
+            with open(self._index_path, "a") as f:
+                f.write(json.dumps({"key": key, "shard": shard, "offset": offset, "shape": list(self.shape)}) + "\n")
+            self.index[key] = (shard, offset)
+            self.shard_fill[shard] = offset + 1
+            return shard, offset
+
+    def get_batch(self, keys):
+        return np.stack([self.get(key) for key in keys])
+
+    def iter_batches(self, batch_size: int = None):
+        batch_size = batch_size or config.model.AUDIO_BATCH_SIZE
+        by_location = {location: key for key, location in self.index.items()}
+        for shard in sorted(self.shard_fill):
+            array = self._shard(shard)
+            fill = self.shard_fill[shard]
+            for start in range(0, fill, batch_size):
+                stop = min(start + batch_size, fill)
+                keys = [by_location.get((shard, offset)) for offset in range(start, stop)]
+                yield keys, array[start:stop]
+
+def file_key(path: str):
+    with open(path, "rb") as f:
+        return content_hash(f.read())
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or re-score a memory-mapped spectrogram feature store")
+    parser.add_argument("--root", default=config.cache.FEATURE_STORE_DIR or "models/feature_store")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser("build", help="Extract log-mel spectrograms for audio files")
+    build.add_argument("paths", nargs="+")
+    score = subparsers.add_parser("score", help="Score every stored spectrogram with the current audio model")
+    score.add_argument("-o", "--output", required=True)
+    args = parser.parse_args(argv)
+
+    store = FeatureStore(args.root)
+    if args.command == "build":
+        from .audio_processor import AudioProcessor
+        processor = AudioProcessor()
+        added = 0
+        for path in args.paths:
+            key = file_key(path)
+            if key in store:
+                continue
+            audio, _ = processor.load_audio(path)
+            store.put(key, processor.create_spectrogram(audio))
+            added += 1
+        logger.info(f"Added {added} spectrograms ({len(store)} total)")
+        return
+
+    from app.models.model_manager import ModelManager
+    from app.utils.formatting import format_audio_result
+    audio_model = ModelManager().audio_model
+    if audio_model is None:
+        raise SystemExit("Audio model is not loaded")
+    with open(args.output, "w") as out:
+        for keys, batch in store.iter_batches():
+            for key, predictions in zip(keys, audio_model.predict_batch(batch)):
+                out.write(json.dumps({"key": key, "audio_result": format_audio_result(predictions)}) + "\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION
+from app.utils.logger import logger
+from app.utils.config import config
+from app.utils.cache import audio_cache, audio_cache_key
+from app.utils.formatting import format_text_result, format_audio_result
+from app.utils.metrics import metrics
+from .audio_processor import AudioProcessor
+from .text_processor import TextProcessor
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def get_pipeline_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=config.model.PIPELINE_WORKERS,
+                thread_name_prefix="multimodal-pipeline"
+            )
+        return _executor
+
+class BranchCancelled(Exception):
+    pass
+
+class MultimodalPipeline:
+    def __init__(self, text_model, audio_model, text_processor: TextProcessor = None,
+                 audio_processor: AudioProcessor = None, executor: ThreadPoolExecutor = None):
+        self.text_model = text_model
+        self.audio_model = audio_model
+        self.text_processor = text_processor or TextProcessor()
+        self.audio_processor = audio_processor or AudioProcessor()
+        self.executor = executor or get_pipeline_executor()
+
+    @staticmethod
+    def _checkpoint(cancelled: threading.Event):
+        if cancelled.is_set():
+            raise BranchCancelled()
+
+    def _text_branch(self, texts, cancelled: threading.Event):
+        with metrics.span("pipeline_text_branch"):
+            for text in texts:
+                self.text_processor.validate_text(text)
+            cleaned = [self.text_processor.clean_text(text) for text in texts]
+            self._checkpoint(cancelled)
+            return [format_text_result(results) for results in self.text_model.predict_batch(cleaned)]
+
+    def _decode(self, source):
+        if isinstance(source, str):
+            return self.audio_processor.load_audio(source)[0]
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return self.audio_processor.decode(source)[0]
+        return self.audio_processor.decode_upload(source)[0]
+
+    @staticmethod
+    def _audio_bytes(source):
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return source
+        if hasattr(source, "getvalue"):
+            return source.getvalue()
+        return None
+
+    def _audio_branch(self, sources, cancelled: threading.Event):
+        with metrics.span("pipeline_audio_branch"):
+            if self.audio_model is None:
+                raise RuntimeError("Audio model is not loaded")
+
+            keys, predictions = [], []
+            for source in sources:
+                data = self._audio_bytes(source)
+                key = audio_cache_key(data, self.audio_processor, self.audio_model) if data is not None else None
+                keys.append(key)
+                predictions.append(audio_cache.get(key) if key else None)
+
+            pending = [i for i, p in enumerate(predictions) if p is None]
+            audio = []
+            for i in pending:
+                self._checkpoint(cancelled)
+                audio.append(self._decode(sources[i]))
+            self._checkpoint(cancelled)
+            if pending:
+                spectrograms = self.audio_processor.create_spectrogram_batch(audio)
+                self._checkpoint(cancelled)
+                for i, probs in zip(pending, self.audio_model.predict_batch(spectrograms)):
+                    predictions[i] = probs
+                    if keys[i] and not self.audio_model.demo_mode:
+                        audio_cache.set(keys[i], probs)
+            return [format_audio_result(p) for p in predictions]
+
+    @staticmethod
+    def fuse(text_result, audio_result):
+        sentiment = text_result['predicted_label'].upper()
+        emotion = audio_result['predicted_label'].upper()
+        if sentiment == "POSITIVE" and "HAPPY" in emotion:
+            alignment = "positive_alignment"
+        elif sentiment == "NEGATIVE" and "ANGRY" in emotion:
+            alignment = "negative_alignment"
+        else:
+            alignment = "mixed"
+        return {
+            'text_result': text_result,
+            'audio_result': audio_result,
+            'alignment': alignment,
+            'confidence': (text_result['confidence'] + audio_result['confidence']) / 2
+        }
+
+    def analyze_batch(self, texts, audio_sources):
+        if len(texts) != len(audio_sources):
+            raise ValueError("Each text needs a matching audio input")
+
+        cancelled = threading.Event()
+        with metrics.span("pipeline_combined"):
+            text_future = self.executor.submit(self._text_branch, list(texts), cancelled)
+            audio_future = self.executor.submit(self._audio_branch, list(audio_sources), cancelled)
+            done, not_done = wait([text_future, audio_future], return_when=FIRST_EXCEPTION)
+
+            failed = next((f for f in done if f.exception() is not None), None)
+            if failed is not None:
+                cancelled.set()
+                for future in not_done:
+                    future.cancel()
+                error = failed.exception()
+                logger.error(f"Multimodal pipeline branch failed: {error}")
+                raise error
+
+            text_results, audio_results = text_future.result(), audio_future.result()
+        return [self.fuse(t, a) for t, a in zip(text_results, audio_results)]
+
+    def analyze(self, text: str, audio_source):
+        return self.analyze_batch([text], [audio_source])[0]
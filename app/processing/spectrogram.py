@@ -0,0 +1,57 @@
+from functools import lru_cache
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from app.utils.startup import lazy_import
+
+librosa = lazy_import("librosa")
+
+STD_EPS = 1e-6
+
+class MelFrontend:
+    def __init__(self, sample_rate: int, n_fft: int, hop_length: int, n_mels: int,
+                 top_db: float = 80.0, amin: float = 1e-10):
+        self.sample_rate = sample_rate
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        self.n_mels = n_mels
+        self.top_db = top_db
+        self.amin = amin
+        self.window = librosa.filters.get_window("hann", n_fft, fftbins=True).astype(np.float32)
+        self.mel_basis = librosa.filters.mel(sr=sample_rate, n_fft=n_fft, n_mels=n_mels).astype(np.float32)
+
+    def stft_power(self, audio: np.ndarray):
+        pad = self.n_fft // 2
+        padded = np.pad(audio, [(0, 0), (pad, pad)], mode="constant")
+        frames = sliding_window_view(padded, self.n_fft, axis=-1)[:, ::self.hop_length]
+        spectrum = np.fft.rfft(frames * self.window, axis=-1)
+        return (spectrum.real ** 2 + spectrum.imag ** 2).astype(np.float32)
+
+    def melspectrogram(self, audio: np.ndarray):
+        power = self.stft_power(audio)
+        return np.matmul(power, self.mel_basis.T).transpose(0, 2, 1)
+
+    def power_to_db(self, mel_spec: np.ndarray):
+        log_spec = 10.0 * np.log10(np.maximum(self.amin, mel_spec))
+        ref = np.maximum(self.amin, mel_spec.max(axis=(1, 2), keepdims=True))
+        log_spec -= 10.0 * np.log10(ref)
+        if self.top_db is not None:
+            log_spec = np.maximum(log_spec, log_spec.max(axis=(1, 2), keepdims=True) - self.top_db)
+        return log_spec
+
+    def __call__(self, audio):
+        audio = np.atleast_2d(np.asarray(audio, dtype=np.float32))
+        log_mel_spec = self.power_to_db(self.melspectrogram(audio))
+        mean = log_mel_spec.mean(axis=(1, 2), keepdims=True)
+        std = log_mel_spec.std(axis=(1, 2), keepdims=True)
+        return (log_mel_spec - mean) / np.maximum(std, STD_EPS)
+
+def fit_frames(spectrogram: np.ndarray, n_frames: int):
+    frames = spectrogram.shape[-1]
+    if frames >= n_frames:
+        return spectrogram[..., :n_frames]
+    pad = [(0, 0)] * (spectrogram.ndim - 1) + [(0, n_frames - frames)]
+    return np.pad(spectrogram, pad, mode="constant")
+
+@lru_cache(maxsize=8)
+def get_mel_frontend(sample_rate: int, n_fft: int, hop_length: int, n_mels: int):
+    return MelFrontend(sample_rate, n_fft, hop_length, n_mels)
@@ -0,0 +1,186 @@
+import io
+import numpy as np
+from app.utils.logger import logger
+from app.utils.config import config
+from app.utils.metrics import metrics
+from app.utils.formatting import format_audio_result
+from app.utils.startup import lazy_import
+from .audio_processor import AudioProcessor
+
+sf = lazy_import("soundfile")
+
+class _StreamResampler:
+    def __init__(self, in_rate: int, out_rate: int):
+        self.passthrough = in_rate == out_rate
+        if not self.passthrough:
+            import soxr
+            self.stream = soxr.ResampleStream(in_rate, out_rate, 1, dtype="float32", quality="HQ")
+
+    def __call__(self, block: np.ndarray, last: bool = False):
+        if self.passthrough:
+            return block
+        return self.stream.resample_chunk(block, last=last)
+
+class StreamingAnalyzer:
+    def __init__(self, audio_processor: AudioProcessor = None, window_seconds: float = None,
+                 hop_seconds: float = None, block_seconds: float = None):
+        self.audio_processor = audio_processor or AudioProcessor()
+        self.sample_rate = self.audio_processor.sample_rate
+        model_window = self.model_window_seconds()
+        self.window_seconds = window_seconds or config.model.STREAM_WINDOW_SECONDS or model_window
+        if self.window_seconds > model_window:
+            logger.warning(f"Stream window of {self.window_seconds:.2f}s is longer than the "
+                           f"{model_window:.2f}s the audio model scores; using {model_window:.2f}s")
+            self.window_seconds = model_window
+        self.hop_seconds = hop_seconds or config.model.STREAM_HOP_SECONDS
+        self.block_seconds = block_seconds or config.model.STREAM_BLOCK_SECONDS
+        self.window = int(self.window_seconds * self.sample_rate)
+        self.hop = int(self.hop_seconds * self.sample_rate)
+        if not 0 < self.hop <= self.window:
+            raise ValueError("Hop must be positive and no longer than the window")
+        self.vad = self.audio_processor.vad
+        self.silence_rms = 10.0 ** (config.model.STREAM_SILENCE_DB / 20.0)
+
+    def model_window_seconds(self):
+        return (config.model.N_FRAMES - 1) * self.audio_processor.hop_length / self.sample_rate
+
+    def _speech_blocks(self, source, packing):
+        position = 0
+        for block in self._blocks(source):
+            if self.vad is None:
+                yield block
+                continue
+            segments = self.vad.segments(block)
+            for start, end in segments:
+                packing["packed"].append(packing["speech"])
+                packing["source"].append(position + start)
+                packing["lengths"].append(end - start)
+                packing["speech"] += end - start
+            packing["input"] += len(block)
+            position += len(block)
+            if len(segments):
+                yield np.concatenate([block[start:end] for start, end in segments])
+
+    @staticmethod
+    def _source_position(packing, packed: int):
+        if not packing["packed"]:
+            return packed
+        i = max(0, int(np.searchsorted(packing["packed"], packed, side="right")) - 1)
+        return packing["source"][i] + min(packed - packing["packed"][i], packing["lengths"][i])
+
+    @staticmethod
+    def _open(source):
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return sf.SoundFile(io.BytesIO(source))
+        if hasattr(source, "getbuffer"):
+            return sf.SoundFile(io.BytesIO(source.getbuffer()))
+        return sf.SoundFile(source)
+
+    def duration(self, source):
+        try:
+            with self._open(source) as f:
+                return f.frames / f.samplerate
+        except Exception:
+            return None
+
+    def _blocks(self, source):
+        with self._open(source) as f:
+            resample = _StreamResampler(f.samplerate, self.sample_rate)
+            block_frames = max(1, int(self.block_seconds * f.samplerate))
+            while True:
+                block = f.read(frames=block_frames, dtype="float32", always_2d=True)
+                last = len(block) < block_frames
+                block = resample(block.mean(axis=1), last=last)
+                if len(block):
+                    yield block
+                if last:
+                    return
+
+    def iter_windows(self, source, packing: dict = None):
+        packing = packing if packing is not None else {}
+        packing.update(packed=[], source=[], lengths=[], speech=0, input=0)
+        buffer = np.zeros(0, dtype=np.float32)
+        offset = 0
+        emitted = False
+        for block in self._speech_blocks(source, packing):
+            buffer = np.concatenate([buffer, block])
+            while len(buffer) >= self.window:
+                yield self._span(packing, offset, self.window), buffer[:self.window].copy()
+                emitted = True
+                buffer = buffer[self.hop:]
+                offset += self.hop
+
+        if len(buffer) and (not emitted or len(buffer) > self.window - self.hop):
+            tail = np.zeros(self.window, dtype=np.float32)
+            tail[:len(buffer)] = buffer
+            yield self._span(packing, offset, len(buffer)), tail
+
+    def _span(self, packing, offset: int, length: int):
+        start = self._source_position(packing, offset)
+        end = self._source_position(packing, offset + length)
+        return float(start) / self.sample_rate, float(end) / self.sample_rate
+
+    def _score(self, audio_model, spans, windows, timeline, batch_size):
+        windows = np.stack(windows)
+        audible = np.sqrt(np.mean(windows ** 2, axis=1)) >= self.silence_rms
+        if not audible.any():
+            return len(spans)
+        spans = [span for span, keep in zip(spans, audible) if keep]
+        with metrics.span("stream_window_batch"):
+            spectrograms = self.audio_processor.create_spectrogram_batch(windows[audible])
+            probabilities = audio_model.predict_batch(list(spectrograms), batch_size=batch_size)
+        skipped = int((~audible).sum())
+        for (start, end), predictions in zip(spans, probabilities):
+            if not np.isfinite(predictions).all():
+                skipped += 1
+                continue
+            result = format_audio_result(predictions)
+            result['start'] = start
+            result['end'] = end
+            result['predictions'] = [float(p) for p in predictions]
+            timeline.append(result)
+        return skipped
+
+    def analyze(self, source, audio_model, batch_size: int = None, progress=None):
+        batch_size = batch_size or config.model.AUDIO_BATCH_SIZE
+        try:
+            timeline = []
+            spans, windows = [], []
+            packing = {}
+            skipped = 0
+            duration = None
+            for span, window in self.iter_windows(source, packing):
+                spans.append(span)
+                windows.append(window)
+                duration = span[1]
+                if len(windows) == batch_size:
+                    skipped += self._score(audio_model, spans, windows, timeline, batch_size)
+                    spans, windows = [], []
+                    if progress:
+                        progress(duration)
+            if windows:
+                skipped += self._score(audio_model, spans, windows, timeline, batch_size)
+
+            if duration is None:
+                raise ValueError("Recording contains no audio")
+            if not timeline:
+                raise ValueError("Recording contains only silence")
+            if skipped:
+                metrics.inc("stream_windows_skipped_total", skipped)
+
+            aggregate = format_audio_result(np.mean([w['predictions'] for w in timeline], axis=0))
+            aggregate['windows'] = len(timeline)
+            aggregate['skipped_windows'] = skipped
+            aggregate['duration'] = duration
+            if self.vad is not None:
+                speech = packing['speech']
+                aggregate['vad'] = {
+                    'input_seconds': packing['input'] / self.sample_rate,
+                    'speech_seconds': float(speech) / self.sample_rate,
+                    'discarded_ratio': 1.0 - float(speech) / packing['input'] if packing['input'] else 0.0,
+                    'segments': len(packing['lengths'])
+                }
+            return {'timeline': timeline, 'aggregate': aggregate}
+        except Exception as e:
+            logger.error(f"Error in streaming audio analysis: {e}")
+            raise
@@ -1,5 +1,7 @@
 import re
+import numpy as np
 from app.utils.logger import logger
+from app.utils.config import config
 
 class TextProcessor:
     @staticmethod
@@ -16,4 +18,39 @@ class TextProcessor:
     def validate_text(text: str, min_length: int = 5):
         if not text or len(text.strip()) < min_length:
             raise ValueError(f"Text must be at least {min_length} characters long")
-        return True
\ No newline at end of file
+        return True
+
+class TextChunker:
+    def __init__(self, tokenizer, max_length: int = None, stride: int = None):
+        self.tokenizer = tokenizer
+        self.max_length = max_length or config.model.MAX_LENGTH
+        self.stride = config.model.TEXT_CHUNK_STRIDE if stride is None else stride
+        if not getattr(self.tokenizer, "is_fast", False):
+            logger.warning("Slow tokenizer cannot window long inputs, truncating to MAX_LENGTH")
+
+    def chunk(self, texts):
+        if not getattr(self.tokenizer, "is_fast", False):
+            encoded = self.tokenizer(list(texts), truncation=True, max_length=self.max_length)
+            return encoded["input_ids"], list(range(len(texts)))
+
+        encoded = self.tokenizer(
+            list(texts),
+            truncation=True,
+            max_length=self.max_length,
+            stride=self.stride,
+            return_overflowing_tokens=True
+        )
+        windows, docs = encoded["input_ids"], list(encoded["overflow_to_sample_mapping"])
+        if len(windows) > len(texts):
+            logger.debug(f"Split {len(texts)} text(s) into {len(windows)} windows of up to {self.max_length} tokens")
+        return windows, docs
+
+    @staticmethod
+    def aggregate(window_probs, docs, lengths, num_docs: int):
+        window_probs = np.asarray(window_probs, dtype=np.float64)
+        weights = np.asarray(lengths, dtype=np.float64)
+        totals = np.zeros((num_docs, window_probs.shape[1]))
+        np.add.at(totals, np.asarray(docs), window_probs * weights[:, None])
+        norm = np.zeros(num_docs)
+        np.add.at(norm, np.asarray(docs), weights)
+        return totals / norm[:, None]
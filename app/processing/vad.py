@@ -0,0 +1,73 @@
+import numpy as np
+from app.utils.config import config
+from app.utils.metrics import metrics
+
+class VoiceActivityDetector:
+    def __init__(self, sample_rate: int, frame_ms: float = None, energy_margin_db: float = None,
+                 min_energy_db: float = None, max_zcr: float = None, hangover_ms: float = None,
+                 min_speech_ms: float = None):
+        self.sample_rate = sample_rate
+        self.frame_length = max(1, int(sample_rate * (frame_ms or config.model.VAD_FRAME_MS) / 1000))
+        self.energy_margin_db = energy_margin_db or config.model.VAD_ENERGY_MARGIN_DB
+        self.min_energy_db = min_energy_db if min_energy_db is not None else config.model.VAD_MIN_ENERGY_DB
+        self.max_zcr = max_zcr or config.model.VAD_MAX_ZCR
+        self.hangover = int((hangover_ms if hangover_ms is not None else config.model.VAD_HANGOVER_MS)
+                            * sample_rate / 1000 / self.frame_length)
+        self.min_speech = int((min_speech_ms if min_speech_ms is not None else config.model.VAD_MIN_SPEECH_MS)
+                              * sample_rate / 1000 / self.frame_length)
+
+    def frames(self, audio: np.ndarray):
+        count = -(-len(audio) // self.frame_length)
+        padded = np.zeros(count * self.frame_length, dtype=np.float32)
+        padded[:len(audio)] = audio
+        return padded.reshape(count, self.frame_length)
+
+    def frame_mask(self, audio: np.ndarray):
+        frames = self.frames(audio)
+        energy_db = 10.0 * np.log10(np.mean(frames ** 2, axis=1) + 1e-10)
+        zcr = np.mean(np.signbit(frames[:, 1:]) != np.signbit(frames[:, :-1]), axis=1)
+
+        noise_floor = np.percentile(energy_db, 10)
+        threshold = max(self.min_energy_db, min(noise_floor + self.energy_margin_db,
+                                                energy_db.max() - self.energy_margin_db))
+        mask = (energy_db > threshold) & (zcr < self.max_zcr)
+
+        if self.hangover:
+            mask = np.convolve(mask, np.ones(2 * self.hangover + 1), mode="same") > 0
+        if self.min_speech > 1:
+            edges = np.diff(np.concatenate([[0], mask.astype(np.int8), [0]]))
+            starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+            for start, end in zip(starts, ends):
+                if end - start < self.min_speech:
+                    mask[start:end] = False
+        return mask
+
+    def segments(self, audio: np.ndarray):
+        if not len(audio):
+            return np.zeros((0, 2), dtype=np.int64)
+        edges = np.diff(np.concatenate([[0], self.frame_mask(audio).astype(np.int8), [0]]))
+        starts = np.flatnonzero(edges == 1) * self.frame_length
+        ends = np.minimum(np.flatnonzero(edges == -1) * self.frame_length, len(audio))
+        return np.stack([starts, ends], axis=1)
+
+    @metrics.timed("audio_vad")
+    def trim(self, audio: np.ndarray):
+        segments = self.segments(audio)
+        no_speech = len(segments) == 0
+        speech_samples = int((segments[:, 1] - segments[:, 0]).sum())
+        if no_speech:
+            segments = np.array([[0, len(audio)]], dtype=np.int64)
+        kept_samples = len(audio) if no_speech else speech_samples
+        stats = {
+            "input_seconds": len(audio) / self.sample_rate,
+            "speech_seconds": speech_samples / self.sample_rate,
+            "discarded_seconds": (len(audio) - kept_samples) / self.sample_rate,
+            "discarded_ratio": 1.0 - kept_samples / len(audio) if len(audio) else 0.0,
+            "segments": 0 if no_speech else len(segments),
+            "no_speech": no_speech
+        }
+        metrics.inc("vad_audio_seconds_total", stats["speech_seconds"], {"kind": "speech"})
+        metrics.inc("vad_audio_seconds_total", stats["discarded_seconds"], {"kind": "discarded"})
+        if len(segments) == 1:
+            return audio[segments[0, 0]:segments[0, 1]], stats
+        return np.concatenate([audio[start:end] for start, end in segments]), stats
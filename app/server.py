@@ -0,0 +1,384 @@
+import argparse
+import asyncio
+import base64
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from app.utils.logger import logger
+from app.utils.config import config
+from app.utils.cache import audio_cache, audio_cache_key
+from app.utils.formatting import format_text_result, format_audio_result
+from app.utils.metrics import metrics
+from app.processing.text_processor import TextProcessor
+
+class QueueFullError(Exception):
+    pass
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+class MicroBatcher:
+    def __init__(self, name: str, batch_fn, max_batch_size: int, max_wait_ms: float, queue_size: int,
+                 concurrency: int = 1):
+        self.name = name
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.concurrency = concurrency
+        self.executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix=f"{name}-batcher")
+        self._task = None
+        self._slots = None
+
+    def start(self):
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+        self.executor.shutdown(wait=False)
+
+    async def submit(self, item):
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((item, future))
+        except asyncio.QueueFull:
+            metrics.inc("queue_rejections_total", labels={"queue": self.name})
+            raise QueueFullError(f"{self.name} queue is full")
+        metrics.set_gauge("queue_depth", self.queue.qsize(), {"queue": self.name})
+        return await future
+
+    async def _collect(self):
+        batch = [await self.queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._slots.acquire()
+            batch = await self._collect()
+            batch = [(item, future) for item, future in batch if not future.cancelled()]
+            if not batch:
+                self._slots.release()
+                continue
+            metrics.set_gauge("queue_depth", self.queue.qsize(), {"queue": self.name})
+            metrics.observe_size("server_batch_size", len(batch), {"queue": self.name})
+            loop.create_task(self._dispatch(loop, batch))
+
+    async def _dispatch(self, loop, batch):
+        items = [item for item, _ in batch]
+        try:
+            outputs = await loop.run_in_executor(self.executor, self.batch_fn, items)
+        except Exception as e:
+            logger.error(f"{self.name} batch of {len(items)} failed: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self._slots.release()
+        for (_, future), output in zip(batch, outputs):
+            if not future.done():
+                future.set_result(output)
+
+class InferenceService:
+    def __init__(self, max_batch_size: int = None, max_wait_ms: float = None, queue_size: int = None,
+                 workers: int = None):
+        from app.models.model_manager import ModelManager
+        from app.processing.audio_processor import AudioProcessor
+        self.model_manager = ModelManager()
+        self.audio_processor = AudioProcessor()
+        self.text_processor = TextProcessor()
+        self.decode_executor = ThreadPoolExecutor(
+            max_workers=config.server.DECODE_WORKERS,
+            thread_name_prefix="audio-decode"
+        )
+        self.workers = workers or config.server.WORKERS
+        self.pool = None
+        batch_args = dict(
+            max_batch_size=max_batch_size or config.server.MAX_BATCH_SIZE,
+            max_wait_ms=max_wait_ms if max_wait_ms is not None else config.server.MAX_WAIT_MS,
+            queue_size=queue_size or config.server.QUEUE_SIZE,
+            concurrency=self.workers
+        )
+        self.text_batcher = MicroBatcher("text", self._run_text_batch, **batch_args)
+        self.audio_batcher = MicroBatcher("audio", self._run_audio_batch, **batch_args)
+
+    def start(self):
+        if self.workers > 1:
+            from app.worker_pool import SharedModelPool
+            self.pool = SharedModelPool(self.workers).start()
+        else:
+            self.model_manager.start_loading()
+        self.text_batcher.start()
+        self.audio_batcher.start()
+
+    async def stop(self):
+        await self.text_batcher.stop()
+        await self.audio_batcher.stop()
+        self.decode_executor.shutdown(wait=False)
+        if self.pool:
+            self.pool.stop()
+
+    def _run_text_batch(self, texts):
+        if self.pool:
+            return self.pool.predict_text_batch(texts)
+        return self.model_manager.text_model.predict_batch(texts)
+
+    def _run_audio_batch(self, spectrograms):
+        if self.pool:
+            return self.pool.predict_audio_batch(spectrograms)
+        audio_model = self.model_manager.audio_model
+        if audio_model is None:
+            raise RuntimeError("Audio model is not loaded")
+        return audio_model.predict_batch(spectrograms)
+
+    def _extract_features(self, data):
+        audio, _ = self.audio_processor.decode(data)
+        return self.audio_processor.create_spectrogram(audio)
+
+    def _audio_cache_key(self, data):
+        audio_model = self.model_manager.audio_model if self.model_manager.readiness()["audio"] == "ready" else None
+        if audio_model.demo_mode if audio_model is not None else config.model.AUDIO_DEMO_MODE:
+            return None
+        return audio_cache_key(data, self.audio_processor, audio_model)
+
+    def readiness(self):
+        if self.pool:
+            return self.pool.readiness()
+        return self.model_manager.readiness()
+
+    def _require(self, model: str):
+        state = self.readiness()[model]
+        if state != "ready":
+            raise HTTPError(503, f"{model.capitalize()} model is {state.replace('_', ' ')}")
+
+    async def analyze_text(self, text: str):
+        self._require("text")
+        try:
+            self.text_processor.validate_text(text)
+        except ValueError as e:
+            raise HTTPError(400, str(e))
+        results = await self.text_batcher.submit(self.text_processor.clean_text(text))
+        return format_text_result(results)
+
+    async def analyze_audio(self, data):
+        self._require("audio")
+        loop = asyncio.get_running_loop()
+        key = await loop.run_in_executor(self.decode_executor, self._audio_cache_key, data)
+        predictions = audio_cache.get(key) if key else None
+        if predictions is None:
+            try:
+                spectrogram = await loop.run_in_executor(self.decode_executor, self._extract_features, data)
+            except Exception as e:
+                raise HTTPError(400, f"Could not decode audio: {e}")
+            predictions = await self.audio_batcher.submit(spectrogram)
+            if not np.isfinite(predictions).all():
+                metrics.inc("non_finite_predictions_total", labels={"model": "audio"})
+                raise HTTPError(422, "Audio did not produce a usable prediction (silent or corrupt input)")
+            if key:
+                audio_cache.set(key, predictions)
+        return format_audio_result(predictions)
+
+    async def analyze_combined(self, text: str, data):
+        from app.processing.pipeline import MultimodalPipeline
+        branches = [asyncio.ensure_future(self.analyze_text(text)), asyncio.ensure_future(self.analyze_audio(data))]
+        try:
+            text_result, audio_result = await asyncio.gather(*branches)
+        except Exception:
+            for branch in branches:
+                branch.cancel()
+            raise
+        return MultimodalPipeline.fuse(text_result, audio_result)
+
+class InferenceServer:
+    STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                   413: "Payload Too Large", 422: "Unprocessable Entity", 500: "Internal Server Error",
+                   503: "Service Unavailable"}
+    ROUTES = ("/health", "/metrics", "/workers", "/v1/text", "/v1/audio", "/v1/combined")
+
+    def __init__(self, service: InferenceService, host: str = None, port: int = None):
+        self.service = service
+        self.host = host or config.server.HOST
+        self.port = port or config.server.PORT
+
+    async def _read_request(self, reader):
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+        parts = request_line.decode('latin-1').split()
+        if len(parts) != 3 or not parts[2].startswith('HTTP/'):
+            raise HTTPError(400, "Malformed request line")
+        method, path, _ = parts
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            raise HTTPError(400, "Invalid Content-Length")
+        if length < 0:
+            raise HTTPError(400, "Invalid Content-Length")
+        if length > config.server.MAX_BODY_BYTES:
+            raise HTTPError(413, "Request body too large")
+        body = await reader.readexactly(length) if length else b''
+        return method, path.split('?', 1)[0], headers, body
+
+    async def _write_response(self, writer, status: int, payload, keep_alive: bool):
+        if isinstance(payload, str):
+            body, content_type = payload.encode('utf-8'), "text/plain; version=0.0.4"
+        else:
+            try:
+                body = json.dumps(payload, ensure_ascii=False, allow_nan=False).encode('utf-8')
+            except ValueError as e:
+                logger.error(f"Response is not valid JSON: {e}")
+                status, body = 500, json.dumps({'error': "Result contained non-finite values"}).encode('utf-8')
+            content_type = "application/json"
+        head = (
+            f"HTTP/1.1 {status} {self.STATUS_TEXT.get(status, '')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+    @staticmethod
+    def _json(body):
+        try:
+            payload = json.loads(body or b'{}')
+        except ValueError:
+            raise HTTPError(400, "Request body must be JSON")
+        if not isinstance(payload, dict):
+            raise HTTPError(400, "Request body must be a JSON object")
+        return payload
+
+    @staticmethod
+    def _text(payload):
+        text = payload.get('text')
+        if text is None:
+            return ''
+        if not isinstance(text, str):
+            raise HTTPError(400, "'text' must be a string")
+        return text
+
+    @staticmethod
+    def _audio_bytes(headers, body, payload=None):
+        if payload is not None:
+            if not payload.get('audio'):
+                raise HTTPError(400, "Missing base64 'audio' field")
+            if not isinstance(payload['audio'], str):
+                raise HTTPError(400, "'audio' must be a base64 string")
+            try:
+                return base64.b64decode(payload['audio'])
+            except ValueError:
+                raise HTTPError(400, "Invalid base64 audio")
+        if headers.get('content-type', '').startswith('application/json'):
+            return InferenceServer._audio_bytes(headers, body, InferenceServer._json(body))
+        if not body:
+            raise HTTPError(400, "Empty audio body")
+        return body
+
+    async def dispatch(self, method: str, path: str, headers, body):
+        if path == '/health':
+            readiness = self.service.readiness()
+            return (200 if readiness['ready'] else 503), dict(readiness, status='ok' if readiness['ready'] else 'starting')
+        if path == '/metrics':
+            return 200, metrics.render_prometheus()
+        if path == '/workers':
+            if self.service.pool is None:
+                return 200, {'workers': 1, 'pool': None}
+            return 200, self.service.pool.stats()
+        if method != 'POST':
+            raise HTTPError(405 if path.startswith('/v1/') else 404, f"{method} {path} not supported")
+
+        if path == '/v1/text':
+            payload = self._json(body)
+            return 200, await self.service.analyze_text(self._text(payload))
+        if path == '/v1/audio':
+            return 200, await self.service.analyze_audio(self._audio_bytes(headers, body))
+        if path == '/v1/combined':
+            payload = self._json(body)
+            text = self._text(payload)
+            return 200, await self.service.analyze_combined(text, self._audio_bytes(headers, body, payload))
+        raise HTTPError(404, f"Unknown endpoint {path}")
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                keep_alive = False
+                try:
+                    request = await self._read_request(reader)
+                    if request is None:
+                        break
+                    method, path, headers, body = request
+                    keep_alive = headers.get('connection', '').lower() != 'close'
+                    route = path if path in self.ROUTES else "other"
+                    with metrics.span("http_request", {"path": route}):
+                        status, payload = await self.dispatch(method, path, headers, body)
+                except HTTPError as e:
+                    status, payload = e.status, {'error': e.message}
+                except QueueFullError as e:
+                    status, payload = 503, {'error': str(e)}
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except Exception as e:
+                    logger.error(f"Request failed: {e}")
+                    status, payload = 500, {'error': str(e)}
+
+                metrics.inc("http_responses_total", labels={"status": status})
+                await self._write_response(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+    async def serve(self):
+        self.service.start()
+        server = await asyncio.start_server(self.handle, self.host, self.port)
+        logger.info(f"Inference server listening on http://{self.host}:{self.port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.service.stop()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless HTTP inference server")
+    parser.add_argument("--host", default=config.server.HOST)
+    parser.add_argument("--port", type=int, default=config.server.PORT)
+    parser.add_argument("--max-batch-size", type=int, default=config.server.MAX_BATCH_SIZE)
+    parser.add_argument("--max-wait-ms", type=float, default=config.server.MAX_WAIT_MS)
+    parser.add_argument("--queue-size", type=int, default=config.server.QUEUE_SIZE)
+    parser.add_argument("--workers", type=int, default=config.server.WORKERS,
+                        help="Model worker processes sharing one copy of the weights")
+    args = parser.parse_args(argv)
+
+    service = InferenceService(args.max_batch_size, args.max_wait_ms, args.queue_size, args.workers)
+    server = InferenceServer(service, args.host, args.port)
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        logger.info("Inference server stopped")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+import atexit
+import math
+import os
+import queue
+import sqlite3
+import threading
+import time
+from .config import config
+from .logger import logger
+from .metrics import metrics
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS analyses (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at REAL NOT NULL,
+    kind TEXT NOT NULL,
+    label TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    source TEXT
+);
+CREATE TABLE IF NOT EXISTS label_totals (
+    kind TEXT NOT NULL,
+    label TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    confidence_sum REAL NOT NULL,
+    PRIMARY KEY (kind, label)
+);
+CREATE TABLE IF NOT EXISTS bucket_totals (
+    bucket INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    confidence_sum REAL NOT NULL,
+    PRIMARY KEY (bucket, kind)
+);
+"""
+
+class AnalysisLog:
+    def __init__(self, path: str, batch_size: int = 64, flush_interval: float = 0.5,
+                 bucket_seconds: int = 3600, queue_size: int = 10000, enabled: bool = True,
+                 store_source: bool = False):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.bucket_seconds = bucket_seconds
+        self.enabled = enabled
+        self.store_source = store_source
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.dropped = 0
+        self.rejected = 0
+        self._writer = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=10)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def _start(self):
+        with self._lock:
+            if self._writer is not None:
+                return
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with self._connect() as connection:
+                connection.executescript(SCHEMA)
+            self._writer = threading.Thread(target=self._run, name="analysis-log", daemon=True)
+            self._writer.start()
+            atexit.register(self.flush)
+
+    def record(self, kind: str, result, source: str = None):
+        if not self.enabled or not result:
+            return
+        try:
+            label, confidence = str(result['predicted_label']), float(result['confidence'])
+        except (KeyError, TypeError, ValueError):
+            confidence = math.nan
+        if not math.isfinite(confidence):
+            self.rejected += 1
+            metrics.inc("analysis_log_rejected_total")
+            logger.warning(f"Not logging {kind} analysis without a finite confidence")
+            return
+        self._start()
+        row = (time.time(), kind, label, confidence,
+               source[:200] if source and self.store_source else None)
+        try:
+            self.queue.put_nowait(row)
+        except queue.Full:
+            self.dropped += 1
+            metrics.inc("analysis_log_dropped_total")
+
+    def flush(self, timeout: float = 5.0):
+        if self._writer is None:
+            return
+        deadline = time.monotonic() + timeout
+        while self.queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def _run(self):
+        connection = self._connect()
+        while True:
+            rows = [self.queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(rows) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    rows.append(self.queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            try:
+                with metrics.span("analysis_log_write"):
+                    self._write(connection, rows)
+            except Exception as e:
+                logger.error(f"Failed to persist {len(rows)} analyses, retrying row by row: {e}")
+                for row in rows:
+                    try:
+                        self._write(connection, [row])
+                    except Exception as e:
+                        logger.error(f"Failed to persist analysis {row[:4]}: {e}")
+            finally:
+                for _ in rows:
+                    self.queue.task_done()
+
+    def _write(self, connection, rows):
+        labels, buckets = {}, {}
+        for created_at, kind, label, confidence, _ in rows:
+            total = labels.setdefault((kind, label), [0, 0.0])
+            total[0] += 1
+            total[1] += confidence
+            bucket = buckets.setdefault((int(created_at // self.bucket_seconds) * self.bucket_seconds, kind), [0, 0.0])
+            bucket[0] += 1
+            bucket[1] += confidence
+
+        with connection:
+            connection.executemany(
+                "INSERT INTO analyses (created_at, kind, label, confidence, source) VALUES (?, ?, ?, ?, ?)", rows
+            )
+            connection.executemany(
+                "INSERT INTO label_totals VALUES (?, ?, ?, ?) ON CONFLICT (kind, label) DO UPDATE SET "
+                "count = count + excluded.count, confidence_sum = confidence_sum + excluded.confidence_sum",
+                [(kind, label, count, total) for (kind, label), (count, total) in labels.items()]
+            )
+            connection.executemany(
+                "INSERT INTO bucket_totals VALUES (?, ?, ?, ?) ON CONFLICT (bucket, kind) DO UPDATE SET "
+                "count = count + excluded.count, confidence_sum = confidence_sum + excluded.confidence_sum",
+                [(bucket, kind, count, total) for (bucket, kind), (count, total) in buckets.items()]
+            )
+
+    def _query(self, sql: str, params=()):
+        if not os.path.exists(self.path):
+            return []
+        connection = self._connect()
+        try:
+            return connection.execute(sql, params).fetchall()
+        except sqlite3.OperationalError:
+            return []
+        finally:
+            connection.close()
+
+    def summary(self):
+        rows = self._query("SELECT kind, label, count, confidence_sum FROM label_totals")
+        kinds, labels, confidences = {}, {}, {}
+        count = confidence = 0.0
+        for kind, label, label_count, confidence_sum in rows:
+            kinds[kind] = kinds.get(kind, 0) + label_count
+            labels.setdefault(kind, {})[label] = label_count
+            confidences[kind] = confidences.get(kind, 0.0) + confidence_sum
+            count += label_count
+            confidence += confidence_sum
+        return {
+            "total": int(count),
+            "by_kind": kinds,
+            "labels": labels,
+            "mean_confidence": confidence / count if count else None,
+            "mean_confidence_by_kind": {kind: confidences[kind] / kinds[kind] for kind in kinds if kinds[kind]}
+        }
+
+    def timeline(self, buckets: int = 48):
+        since = (int(time.time() // self.bucket_seconds) - buckets + 1) * self.bucket_seconds
+        rows = self._query(
+            "SELECT bucket, kind, count, confidence_sum FROM bucket_totals WHERE bucket >= ? ORDER BY bucket",
+            (since,)
+        )
+        return [
+            {"bucket": bucket, "kind": kind, "count": count, "mean_confidence": confidence_sum / count}
+            for bucket, kind, count, confidence_sum in rows
+        ]
+
+    def recent(self, limit: int = 20):
+        rows = self._query(
+            "SELECT created_at, kind, label, confidence, source FROM analyses ORDER BY id DESC LIMIT ?",
+            (limit,)
+        )
+        return [
+            {"created_at": created_at, "kind": kind, "label": label, "confidence": confidence, "source": source}
+            for created_at, kind, label, confidence, source in rows
+        ]
+
+analysis_log = AnalysisLog(
+    config.history.DB_PATH,
+    batch_size=config.history.BATCH_SIZE,
+    flush_interval=config.history.FLUSH_INTERVAL_SECONDS,
+    bucket_seconds=config.history.BUCKET_SECONDS,
+    queue_size=config.history.QUEUE_SIZE,
+    enabled=config.history.ENABLED,
+    store_source=config.history.STORE_SOURCE
+)
@@ -0,0 +1,211 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+from .config import config
+from .logger import logger
+
+def content_hash(data, *parts):
+    digest = hashlib.sha256()
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    digest.update(data)
+    for part in parts:
+        digest.update(b"\x00")
+        digest.update(repr(part).encode("utf-8"))
+    return digest.hexdigest()
+
+def audio_cache_key(data, audio_processor, audio_model=None):
+    if audio_model is not None:
+        backend, quantization = audio_model.backend, audio_model.quantization
+    else:
+        backend = config.model.BACKEND
+        quantization = config.model.AUDIO_QUANTIZATION if backend == "torch" else "none"
+    return content_hash(
+        data,
+        audio_processor.feature_config(),
+        config.model.N_FRAMES,
+        config.model.AUDIO_MODEL_PATH,
+        backend,
+        quantization
+    )
+
+class ResultCache:
+    DISK_FORMATS = (".npy", ".json")
+
+    def __init__(self, name: str, max_entries: int = 1024, ttl_seconds: float = 3600,
+                 disk_dir: str = None, enabled: bool = True, disk_max_entries: int = 50000):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.disk_dir = os.path.join(disk_dir, name) if disk_dir else None
+        self.disk_max_entries = disk_max_entries
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+        self.disk_entries = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            self.disk_entries = len(self._disk_files())
+
+    def _expired(self, stored_at: float):
+        return self.ttl_seconds is not None and time.time() - stored_at > self.ttl_seconds
+
+    def _disk_path(self, key: str, suffix: str):
+        return os.path.join(self.disk_dir, key[:2], f"{key}{suffix}")
+
+    def _disk_files(self):
+        files = []
+        for shard in os.scandir(self.disk_dir):
+            if shard.is_dir():
+                files.extend(entry for entry in os.scandir(shard.path)
+                             if entry.is_file() and not entry.name.endswith(".tmp"))
+        return files
+
+    @staticmethod
+    def _mtime(entry):
+        try:
+            return entry.stat().st_mtime
+        except FileNotFoundError:
+            return 0.0
+
+    def _disk_get(self, key: str):
+        for suffix in self.DISK_FORMATS:
+            path = self._disk_path(key, suffix)
+            try:
+                if self._expired(os.path.getmtime(path)):
+                    os.unlink(path)
+                    return None
+                if suffix == ".npy":
+                    return np.load(path, allow_pickle=False)
+                with open(path, encoding="utf-8") as f:
+                    return json.load(f)
+            except FileNotFoundError:
+                continue
+            except Exception as e:
+                logger.warning(f"Cache {self.name}: unreadable disk entry {key}: {e}")
+                return None
+        return None
+
+    def _disk_set(self, key: str, value):
+        suffix = ".npy" if isinstance(value, np.ndarray) else ".json"
+        path = self._disk_path(key, suffix)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            if suffix == ".npy":
+                with open(tmp_path, "wb") as f:
+                    np.save(f, value, allow_pickle=False)
+            else:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(value, f)
+            existed = os.path.exists(path)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Cache {self.name}: failed to persist entry {key}: {e}")
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            return
+        if not existed:
+            with self._disk_lock:
+                self.disk_entries += 1
+                over = self.disk_entries > self.disk_max_entries
+            if over:
+                self._disk_prune()
+
+    def _disk_prune(self):
+        with self._disk_lock:
+            files = sorted(self._disk_files(), key=self._mtime)
+            target = int(self.disk_max_entries * 0.9)
+            excess = files[:max(0, len(files) - target)]
+            for entry in excess:
+                try:
+                    os.unlink(entry.path)
+                except FileNotFoundError:
+                    pass
+            self.disk_entries = len(files) - len(excess)
+            self.disk_evictions += len(excess)
+        if excess:
+            logger.info(f"Cache {self.name}: evicted {len(excess)} oldest disk entries")
+
+    def get(self, key: str):
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if not self._expired(stored_at):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+
+        if self.disk_dir:
+            value = self._disk_get(key)
+            if value is not None:
+                with self._lock:
+                    self.hits += 1
+                    self.disk_hits += 1
+                self._store(key, value)
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def _store(self, key: str, value):
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def set(self, key: str, value):
+        if not self.enabled:
+            return
+        self._store(key, value)
+        if self.disk_dir:
+            self._disk_set(key, value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "evictions": self.evictions,
+                "disk_entries": self.disk_entries,
+                "disk_evictions": self.disk_evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+def build_cache(name: str):
+    return ResultCache(
+        name,
+        max_entries=config.cache.MAX_ENTRIES,
+        ttl_seconds=config.cache.TTL_SECONDS,
+        disk_dir=config.cache.DISK_DIR,
+        enabled=config.cache.ENABLED,
+        disk_max_entries=config.cache.DISK_MAX_ENTRIES
+    )
+
+text_cache = build_cache("text")
+audio_cache = build_cache("audio")
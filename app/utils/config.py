@@ -4,12 +4,48 @@ from dataclasses import dataclass
 @dataclass
 class ModelConfig:
     TEXT_MODEL_NAME: str = "distilbert-base-uncased"
+    TEXT_MODEL_PATH: str = os.environ.get("MULTISENSE_TEXT_MODEL", "")
     AUDIO_MODEL_PATH: str = "models/audio_model.pth"
     NUM_AUDIO_CLASSES: int = 4
     SAMPLE_RATE: int = 22050
     DURATION: int = 4
     N_MELS: int = 128
+    N_FFT: int = 2048
+    HOP_LENGTH: int = 512
+    RESAMPLER: str = "hq"
+    VAD_ENABLED: bool = False
+    VAD_SCAN_SECONDS: float = 30.0
+    VAD_FRAME_MS: float = 20.0
+    VAD_ENERGY_MARGIN_DB: float = 12.0
+    VAD_MIN_ENERGY_DB: float = -50.0
+    VAD_MAX_ZCR: float = 0.35
+    VAD_HANGOVER_MS: float = 200.0
+    VAD_MIN_SPEECH_MS: float = 100.0
+    N_FRAMES: int = 88
     MAX_LENGTH: int = 512
+    TEXT_CASCADE: bool = False
+    TEXT_CASCADE_PATH: str = "models/text_cascade.npz"
+    TEXT_CASCADE_THRESHOLD: float = 0.0
+    TEXT_CHUNK_STRIDE: int = 64
+    TEXT_BATCH_SIZE: int = 32
+    AUDIO_BATCH_SIZE: int = 16
+    AUDIO_DEMO_MODE: bool = False
+    TEXT_QUANTIZATION: str = "none"
+    AUDIO_QUANTIZATION: str = "none"
+    AUDIO_QUANTIZATION_CALIBRATION_SIZE: int = 32
+    STREAM_WINDOW_SECONDS: float = 0.0
+    STREAM_HOP_SECONDS: float = 1.0
+    STREAM_SILENCE_DB: float = -60.0
+    STREAM_BLOCK_SECONDS: float = 10.0
+    PIPELINE_WORKERS: int = 4
+    BACKEND: str = "torch"
+    ONNX_DIR: str = "models/onnx"
+    ORT_INTRA_OP_THREADS: int = 0
+    ORT_INTER_OP_THREADS: int = 0
+    AUTOTUNE: str = os.environ.get("MULTISENSE_AUTOTUNE", "load")
+    AUTOTUNE_DIR: str = "models/profiles"
+    AUTOTUNE_BATCH_SIZES: tuple = (1, 4, 8, 16, 32)
+    AUTOTUNE_LATENCY_BUDGET_MS: float = 250.0
 
 @dataclass
 class AppConfig:
@@ -18,9 +54,60 @@ class AppConfig:
     DEBUG: bool = False
     LOG_LEVEL: str = "INFO"
 
+@dataclass
+class CacheConfig:
+    ENABLED: bool = True
+    MAX_ENTRIES: int = 1024
+    TTL_SECONDS: float = 3600
+    DISK_DIR: str = os.environ.get("MULTISENSE_CACHE_DIR", "")
+    DISK_MAX_ENTRIES: int = 50000
+    FEATURE_STORE_DIR: str = os.environ.get("MULTISENSE_FEATURE_STORE", "")
+    FEATURE_STORE_SHARD_ROWS: int = 2048
+
+@dataclass
+class ServerConfig:
+    HOST: str = "0.0.0.0"
+    PORT: int = 8080
+    MAX_BATCH_SIZE: int = 16
+    MAX_WAIT_MS: float = 10.0
+    QUEUE_SIZE: int = 256
+    DECODE_WORKERS: int = 4
+    MAX_BODY_BYTES: int = 50 * 1024 * 1024
+    WORKERS: int = 1
+    WORKER_TIMEOUT_SECONDS: float = 60.0
+    WORKER_CHECK_INTERVAL_SECONDS: float = 1.0
+
+@dataclass
+class MetricsConfig:
+    ENABLED: bool = os.environ.get("MULTISENSE_METRICS", "1") != "0"
+    RESERVOIR_SIZE: int = 1024
+
+@dataclass
+class HistoryConfig:
+    ENABLED: bool = os.environ.get("MULTISENSE_HISTORY", "1") != "0"
+    DB_PATH: str = os.environ.get("MULTISENSE_HISTORY_DB", "data/analyses.db")
+    STORE_SOURCE: bool = os.environ.get("MULTISENSE_HISTORY_SOURCE", "0") == "1"
+    BATCH_SIZE: int = 64
+    FLUSH_INTERVAL_SECONDS: float = 0.5
+    BUCKET_SECONDS: int = 3600
+    QUEUE_SIZE: int = 10000
+
+@dataclass
+class JobsConfig:
+    MAX_RUNNING: int = 2
+    PER_SESSION_LIMIT: int = 2
+    MAX_QUEUED: int = 64
+    RETENTION_SECONDS: float = 600
+    POLL_INTERVAL_SECONDS: float = 0.5
+
 class Config:
     def __init__(self):
         self.model = ModelConfig()
         self.app = AppConfig()
+        self.cache = CacheConfig()
+        self.server = ServerConfig()
+        self.metrics = MetricsConfig()
+        self.history = HistoryConfig()
+        self.jobs = JobsConfig()
 
 config = Config()
\ No newline at end of file
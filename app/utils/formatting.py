@@ -0,0 +1,34 @@
+import numpy as np
+
+TEXT_LABEL_MAP = {"LABEL_0": "NEGATIVE", "LABEL_1": "POSITIVE"}
+EMOTION_LABELS = ['angry', 'happy', 'sad', 'neutral']
+EMOTION_ICONS = ['😠', '😄', '😢', '😐']
+
+def format_text_result(results):
+    sentiment_scores = {}
+    for result in results:
+        label_name = TEXT_LABEL_MAP.get(result['label'], result['label'])
+        sentiment_scores[label_name] = result['score']
+    
+    predicted_label = max(sentiment_scores.items(), key=lambda x: x[1])
+    
+    return {
+        'predicted_label': predicted_label[0],
+        'confidence': predicted_label[1],
+        'all_scores': sentiment_scores
+    }
+
+def format_audio_result(predictions):
+    results = {}
+    for i, score in enumerate(predictions):
+        results[f"{EMOTION_ICONS[i]} {EMOTION_LABELS[i].upper()}"] = float(score)
+    
+    predicted_idx = int(np.argmax(predictions))
+    predicted_label = f"{EMOTION_ICONS[predicted_idx]} {EMOTION_LABELS[predicted_idx].upper()}"
+    confidence = float(predictions[predicted_idx])
+    
+    return {
+        'predicted_label': predicted_label,
+        'confidence': confidence,
+        'all_scores': results
+    }
@@ -0,0 +1,190 @@
+import threading
+from bisect import bisect_left
+import time
+from collections import deque
+from functools import wraps
+import numpy as np
+from .config import config
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+CONFIDENCE_BUCKETS = (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+
+def _key(name: str, labels: dict = None):
+    if not labels:
+        return name
+    return name + "{" + ",".join(f'{k}="{v}"' for k, v in sorted(labels.items())) + "}"
+
+class Histogram:
+    def __init__(self, buckets, reservoir_size: int, labels: dict = None):
+        self.buckets = buckets
+        self.labels = labels or {}
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.recent = deque(maxlen=reservoir_size)
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        self.recent.append(value)
+
+    def percentile(self, q: float):
+        if not self.recent:
+            return None
+        return float(np.percentile(np.fromiter(self.recent, dtype=np.float64), q))
+
+class _NoopSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NOOP_SPAN = _NoopSpan()
+
+class _Span:
+    __slots__ = ("registry", "name", "labels", "start")
+
+    def __init__(self, registry, name: str, labels: dict):
+        self.registry = registry
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        labels = dict(self.labels or {}, stage=self.name)
+        self.registry.observe("stage_latency_seconds", time.perf_counter() - self.start, labels)
+        if exc_type is not None:
+            self.registry.inc("stage_errors_total", labels=labels)
+        return False
+
+class MetricsRegistry:
+    def __init__(self, enabled: bool = True, reservoir_size: int = 1024):
+        self.enabled = enabled
+        self.reservoir_size = reservoir_size
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+        self.collectors = []
+        self._lock = threading.Lock()
+
+    def span(self, name: str, labels: dict = None):
+        if not self.enabled:
+            return _NOOP_SPAN
+        return _Span(self, name, labels)
+
+    def timed(self, name: str):
+        def decorator(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                with _Span(self, name, None):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def inc(self, name: str, value: float = 1.0, labels: dict = None):
+        if not self.enabled:
+            return
+        key = _key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0.0) + value
+
+    def set_gauge(self, name: str, value: float, labels: dict = None):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.gauges[_key(name, labels)] = value
+
+    def observe(self, name: str, value: float, labels: dict = None, buckets=LATENCY_BUCKETS):
+        if not self.enabled:
+            return
+        key = (name, _key("", labels))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(buckets, self.reservoir_size, labels)
+            histogram.observe(value)
+
+    def observe_size(self, name: str, value: float, labels: dict = None):
+        self.observe(name, value, labels, buckets=SIZE_BUCKETS)
+
+    def register_collector(self, collector):
+        self.collectors.append(collector)
+
+    def counter(self, name: str, labels: dict = None):
+        return self.counters.get(_key(name, labels), 0.0)
+
+    def counter_total(self, name: str):
+        with self._lock:
+            return sum(v for k, v in self.counters.items() if k == name or k.startswith(name + "{"))
+
+    def histogram_mean(self, name: str):
+        with self._lock:
+            selected = [h for (metric, _), h in self.histograms.items() if metric == name]
+            count = sum(h.count for h in selected)
+            return sum(h.sum for h in selected) / count if count else None
+
+    def gauge_values(self, name: str):
+        with self._lock:
+            return {k[len(name):]: v for k, v in self.gauges.items() if k == name or k.startswith(name + "{")}
+
+    def stage_summary(self, name: str = "stage_latency_seconds"):
+        summary = {}
+        with self._lock:
+            for (metric, _), histogram in self.histograms.items():
+                if metric != name:
+                    continue
+                extra = {k: v for k, v in histogram.labels.items() if k != "stage"}
+                label = histogram.labels.get("stage", metric) + _key("", extra)
+                summary[label] = {
+                    "count": histogram.count,
+                    "mean_ms": histogram.sum / histogram.count * 1000.0 if histogram.count else 0.0,
+                    "p50_ms": (histogram.percentile(50) or 0.0) * 1000.0,
+                    "p95_ms": (histogram.percentile(95) or 0.0) * 1000.0
+                }
+        return summary
+
+    def render_prometheus(self):
+        lines = []
+        with self._lock:
+            counters = dict(self.counters)
+            gauges = dict(self.gauges)
+            histograms = list(self.histograms.items())
+        for collector in self.collectors:
+            for name, value, labels in collector():
+                gauges[_key(name, labels)] = value
+
+        for key, value in sorted(counters.items()):
+            lines.append(f"multisense_{key} {value}")
+        for key, value in sorted(gauges.items()):
+            lines.append(f"multisense_{key} {value}")
+        for (name, labels), histogram in sorted(histograms, key=lambda item: item[0]):
+            inner = labels[1:-1] if labels else ""
+            sep = "," if inner else ""
+            cumulative = 0
+            for bound, count in zip(list(histogram.buckets) + ["+Inf"], histogram.counts):
+                cumulative += count
+                lines.append(f'multisense_{name}_bucket{{{inner}{sep}le="{bound}"}} {cumulative}')
+            lines.append(f"multisense_{name}_sum{labels} {histogram.sum}")
+            lines.append(f"multisense_{name}_count{labels} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+def _cache_collector():
+    from .cache import text_cache, audio_cache
+    for cache in (text_cache, audio_cache):
+        stats = cache.stats()
+        labels = {"cache": cache.name}
+        yield "cache_hits", stats["hits"], labels
+        yield "cache_misses", stats["misses"], labels
+        yield "cache_hit_rate", stats["hit_rate"], labels
+        yield "cache_entries", stats["entries"], labels
+
+metrics = MetricsRegistry(enabled=config.metrics.ENABLED, reservoir_size=config.metrics.RESERVOIR_SIZE)
+metrics.register_collector(_cache_collector)
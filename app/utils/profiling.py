@@ -0,0 +1,61 @@
+import resource
+import sys
+import time
+import numpy as np
+
+def current_rss_mb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    return peak_rss_mb()
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024.0 * 1024.0) if sys.platform == "darwin" else peak / 1024.0
+
+def latency_summary(samples_ms):
+    samples = np.asarray(samples_ms, dtype=np.float64)
+    if samples.size == 0:
+        return {"count": 0}
+    return {
+        "count": int(samples.size),
+        "mean_ms": float(samples.mean()),
+        "p50_ms": float(np.percentile(samples, 50)),
+        "p95_ms": float(np.percentile(samples, 95)),
+        "p99_ms": float(np.percentile(samples, 99)),
+        "max_ms": float(samples.max())
+    }
+
+def time_calls(fn, inputs, warmup: int = 2):
+    for item in inputs[:warmup]:
+        fn(item)
+    samples, outputs = [], []
+    for item in inputs:
+        start = time.perf_counter()
+        outputs.append(fn(item))
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return samples, outputs
+
+def rss_of_pid(pid: int):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        return None
+    return None
+
+def pss_of_pid(pid: int):
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        return None
+    return None
@@ -0,0 +1,87 @@
+import importlib
+import json
+import sys
+import threading
+import time
+
+PROCESS_START = time.perf_counter()
+
+class StartupTimer:
+    def __init__(self):
+        self.imports = {}
+        self.events = {}
+        self._lock = threading.Lock()
+
+    def record_import(self, name: str, seconds: float):
+        with self._lock:
+            self.imports[name] = seconds
+
+    def mark(self, event: str):
+        with self._lock:
+            self.events.setdefault(event, time.perf_counter() - PROCESS_START)
+
+    def report(self):
+        with self._lock:
+            return {
+                "imports_seconds": dict(self.imports),
+                "events_seconds_since_start": dict(sorted(self.events.items(), key=lambda item: item[1]))
+            }
+
+startup = StartupTimer()
+
+class LazyModule:
+    def __init__(self, name: str):
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+        self.__dict__["_lock"] = threading.Lock()
+
+    def _load(self):
+        module = self.__dict__["_module"]
+        if module is None:
+            with self.__dict__["_lock"]:
+                module = self.__dict__["_module"]
+                if module is None:
+                    name = self.__dict__["_name"]
+                    start = time.perf_counter()
+                    module = importlib.import_module(name)
+                    startup.record_import(name, time.perf_counter() - start)
+                    self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr: str, value):
+        setattr(self._load(), attr, value)
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__["_module"] is not None else "not loaded"
+        return f"<lazy module '{self.__dict__['_name']}' ({state})>"
+
+def lazy_import(name: str):
+    module = sys.modules.get(name)
+    return module if module is not None else LazyModule(name)
+
+def timed_import(name: str):
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    startup.record_import(name, time.perf_counter() - start)
+    return module
+
+def main():
+    for name in ("app.utils.config", "app.models.model_manager", "app.processing.audio_processor",
+                 "app.processing.text_processor", "app.processing.streaming"):
+        timed_import(name)
+    startup.mark("app_imported")
+
+    from app.models.model_manager import ModelManager
+    manager = ModelManager()
+    manager.start_loading()
+    manager.wait_until_ready()
+
+    report = startup.report()
+    report["readiness"] = manager.readiness()
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
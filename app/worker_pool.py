@@ -0,0 +1,277 @@
+import argparse
+import itertools
+import json
+import multiprocessing as mp
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from app.utils.logger import logger
+from app.utils.config import config
+from app.utils.metrics import metrics
+from app.utils.profiling import rss_of_pid, pss_of_pid, current_rss_mb
+
+def _share_weights(model):
+    module = getattr(model, "model", None)
+    if hasattr(module, "share_memory"):
+        try:
+            module.share_memory()
+        except Exception as e:
+            logger.warning(f"Could not move {type(module).__name__} weights to shared memory: {e}")
+
+def _worker_loop(worker_id: int, threads: int, requests, results, current):
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+    from app.models.model_manager import ModelManager
+
+    manager = ModelManager()
+    if config.model.BACKEND == "torch":
+        import torch
+        torch.set_num_threads(threads)
+        readiness = manager.readiness()
+    else:
+        readiness = manager.wait_until_ready()
+    results.put((None, worker_id, True, readiness))
+
+    handlers = {
+        "text": lambda payload: manager.text_model.predict(payload),
+        "text_batch": lambda payload: manager.text_model.predict_batch(payload),
+        "audio": lambda payload: manager.audio_model.predict(payload),
+        "audio_batch": lambda payload: manager.audio_model.predict_batch(payload)
+    }
+    while True:
+        message = requests.get()
+        if message is None:
+            break
+        job_id, kind, payload = message
+        current[worker_id] = job_id
+        try:
+            if kind.startswith("audio") and manager.audio_model is None:
+                raise RuntimeError("Audio model is not loaded")
+            results.put((job_id, worker_id, True, handlers[kind](payload)))
+        except Exception as e:
+            results.put((job_id, worker_id, False, f"{type(e).__name__}: {e}"))
+        current[worker_id] = -1
+
+class SharedModelPool:
+    def __init__(self, workers: int = None, threads_per_worker: int = None, timeout: float = None):
+        self.workers = workers or config.server.WORKERS
+        self.threads_per_worker = threads_per_worker or self._default_threads()
+        self.timeout = timeout or config.server.WORKER_TIMEOUT_SECONDS
+        self.processes = []
+        self.completed = {}
+        self.worker_readiness = {}
+        self.started_at = None
+        self.current = None
+        self._dead = set()
+        self._pending = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._collector = None
+
+    def _default_threads(self):
+        if config.model.AUTOTUNE != "off":
+            from app.models.autotune import tuned_threads
+            threads = tuned_threads(self.workers)
+            if threads:
+                return threads
+        return max(1, (os.cpu_count() or 1) // self.workers)
+
+    def start(self):
+        if config.model.BACKEND == "torch":
+            from app.models.model_manager import ModelManager
+            manager = ModelManager()
+            readiness = manager.wait_until_ready()
+            text_model, audio_model = manager.get_models()
+            for model in (getattr(text_model, "pipeline", None), audio_model):
+                if model is not None:
+                    _share_weights(model)
+            logger.info(f"Parent loaded models once ({readiness}); forking {self.workers} workers")
+            context = mp.get_context("fork")
+        else:
+            logger.warning("ONNX Runtime sessions are not fork-safe; each worker loads its own session")
+            context = mp.get_context("spawn")
+
+        self.requests = context.Queue(maxsize=config.server.QUEUE_SIZE)
+        self.results = context.Queue()
+        self.current = context.Array("q", [-1] * self.workers, lock=False)
+        for worker_id in range(self.workers):
+            process = context.Process(
+                target=_worker_loop,
+                args=(worker_id, self.threads_per_worker, self.requests, self.results, self.current),
+                name=f"model-worker-{worker_id}",
+                daemon=True
+            )
+            process.start()
+            self.processes.append(process)
+            self.completed[worker_id] = 0
+
+        self.started_at = time.perf_counter()
+        self._collector = threading.Thread(target=self._collect, name="pool-collector", daemon=True)
+        self._collector.start()
+        return self
+
+    def _collect(self):
+        interval = config.server.WORKER_CHECK_INTERVAL_SECONDS
+        next_check = time.monotonic() + interval
+        while True:
+            try:
+                message = self.results.get(timeout=interval)
+            except queue.Empty:
+                message = False
+            if time.monotonic() >= next_check:
+                self._check_workers()
+                next_check = time.monotonic() + interval
+            if message is False:
+                continue
+            if message is None:
+                return
+            job_id, worker_id, ok, payload = message
+            if job_id is None:
+                with self._lock:
+                    self.worker_readiness[worker_id] = payload
+                logger.info(f"Model worker {worker_id} ready: {payload}")
+                continue
+            with self._lock:
+                future = self._pending.pop(job_id, None)
+                self.completed[worker_id] += 1
+            if future is None:
+                continue
+            if ok:
+                future.set_result(payload)
+            else:
+                future.set_exception(RuntimeError(payload))
+
+    def _check_workers(self):
+        for worker_id, process in enumerate(self.processes):
+            if worker_id in self._dead or process.is_alive():
+                continue
+            self._dead.add(worker_id)
+            metrics.inc("worker_deaths_total")
+            logger.error(f"Model worker {worker_id} (pid {process.pid}) exited with code {process.exitcode}")
+            with self._lock:
+                future = self._pending.pop(self.current[worker_id], None)
+            if future is not None:
+                future.set_exception(RuntimeError(f"Model worker {worker_id} died while handling the request"))
+
+        if self.processes and len(self._dead) == len(self.processes):
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            for future in pending.values():
+                future.set_exception(RuntimeError("All model workers have exited"))
+
+    def alive_workers(self):
+        return [worker_id for worker_id, process in enumerate(self.processes) if process.is_alive()]
+
+    def readiness(self):
+        alive = self.alive_workers()
+        with self._lock:
+            reports = [self.worker_readiness[worker_id] for worker_id in alive if worker_id in self.worker_readiness]
+        state = {}
+        for name in ("text", "audio"):
+            states = [report[name] for report in reports]
+            if "ready" in states:
+                state[name] = "ready"
+            elif not alive:
+                state[name] = "failed"
+            elif len(states) < len(alive):
+                state[name] = "loading"
+            else:
+                state[name] = states[0]
+        state["ready"] = state["text"] == "ready" and state["audio"] in ("ready", "unavailable")
+        state["workers_alive"] = len(alive)
+        return state
+
+    def submit(self, kind: str, payload):
+        if self.processes and not self.alive_workers():
+            raise RuntimeError("All model workers have exited")
+        future = Future()
+        future.job_id = next(self._ids)
+        with self._lock:
+            self._pending[future.job_id] = future
+        try:
+            self.requests.put((future.job_id, kind, payload), timeout=self.timeout)
+        except queue.Full:
+            with self._lock:
+                self._pending.pop(future.job_id, None)
+            raise TimeoutError("Model worker queue is full")
+        return future
+
+    def result(self, future: Future):
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            with self._lock:
+                self._pending.pop(future.job_id, None)
+            metrics.inc("worker_timeouts_total")
+            raise TimeoutError(f"Model worker did not answer within {self.timeout:.0f}s")
+
+    def predict_text_batch(self, texts):
+        return self.result(self.submit("text_batch", texts))
+
+    def predict_audio_batch(self, spectrograms):
+        return self.result(self.submit("audio_batch", spectrograms))
+
+    def stats(self):
+        elapsed = time.perf_counter() - self.started_at if self.started_at else 0.0
+        with self._lock:
+            completed = dict(self.completed)
+        workers = []
+        for worker_id, process in enumerate(self.processes):
+            workers.append({
+                "worker": worker_id,
+                "pid": process.pid,
+                "alive": process.is_alive(),
+                "rss_mb": rss_of_pid(process.pid),
+                "pss_mb": pss_of_pid(process.pid),
+                "completed": completed.get(worker_id, 0),
+                "requests_per_sec": completed.get(worker_id, 0) / elapsed if elapsed else 0.0
+            })
+        return {
+            "parent_rss_mb": current_rss_mb(),
+            "parent_pss_mb": pss_of_pid(os.getpid()),
+            "total_requests_per_sec": sum(completed.values()) / elapsed if elapsed else 0.0,
+            "workers": workers
+        }
+
+    def stop(self):
+        for _ in self.processes:
+            self.requests.put(None)
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self.results.put(None)
+        self.processes = []
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a shared-weight worker pool against synthetic requests")
+    parser.add_argument("--workers", type=int, default=config.server.WORKERS)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    import numpy as np
+    pool = SharedModelPool(args.workers).start()
+    rng = np.random.default_rng(0)
+    futures = []
+    for i in range(args.requests):
+        if i % 2:
+            futures.append(pool.submit("text_batch", [f"sample request number {i} was great"] * args.batch_size))
+        else:
+            specs = list(rng.standard_normal((args.batch_size, config.model.N_MELS, config.model.N_FRAMES), dtype=np.float32))
+            futures.append(pool.submit("audio_batch", specs))
+    failures = 0
+    for future in futures:
+        try:
+            pool.result(future)
+        except Exception as e:
+            failures += 1
+            logger.debug(f"Pool request failed: {e}")
+    report = pool.stats()
+    report["failures"] = failures
+    pool.stop()
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
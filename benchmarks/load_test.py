@@ -0,0 +1,345 @@
+import argparse
+import base64
+import http.client
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.logger import logger
+from app.utils.config import config
+from app.utils.profiling import current_rss_mb, latency_summary, rss_of_pid
+from benchmarks.pipeline_bench import synthetic_texts, synthetic_audio
+
+KINDS = ("text", "audio", "combined")
+
+def parse_mix(spec: str):
+    mix = {}
+    for part in spec.split(","):
+        kind, _, weight = part.partition("=")
+        if kind not in KINDS:
+            raise ValueError(f"Unknown request kind {kind!r}, expected one of {KINDS}")
+        mix[kind] = float(weight or 1)
+    total = sum(mix.values())
+    return {kind: weight / total for kind, weight in mix.items() if weight > 0}
+
+def synthetic_wav(seconds: float, sample_rate: int, seed: int):
+    import soundfile as sf
+    buffer = io.BytesIO()
+    sf.write(buffer, synthetic_audio(seconds, seed=seed, sample_rate=sample_rate), sample_rate, format="WAV")
+    return buffer.getvalue()
+
+class Workload:
+    def __init__(self, mix, text_lengths, audio_durations, sample_rates, seed: int = 0):
+        self.mix = mix
+        self.rng = np.random.default_rng(seed)
+        self.texts = [text for words in text_lengths for text in synthetic_texts(8, words, seed=words)]
+        self.wavs = [
+            (seconds, synthetic_wav(seconds, rate, seed=i))
+            for i, (seconds, rate) in enumerate((s, r) for s in audio_durations for r in sample_rates)
+        ]
+        self._lock = threading.Lock()
+
+    def next(self):
+        with self._lock:
+            kind = self.rng.choice(list(self.mix), p=list(self.mix.values()))
+            text = self.texts[self.rng.integers(len(self.texts))]
+            _, wav = self.wavs[self.rng.integers(len(self.wavs))]
+        if kind == "text":
+            return kind, (text,)
+        if kind == "audio":
+            return kind, (wav,)
+        return kind, (text, wav)
+
+class InProcessTarget:
+    def __init__(self, synthetic_models: bool = False):
+        from app.models.model_manager import ModelManager
+        from app.processing.audio_processor import AudioProcessor
+        from app.processing.text_processor import TextProcessor
+        from app.processing.pipeline import MultimodalPipeline
+
+        self._workdir = None
+        if synthetic_models:
+            from benchmarks.pipeline_bench import build_tiny_text_model, build_random_audio_checkpoint
+            from app.models.text_model import TextModel
+            from app.models.audio_model import AudioModel
+            self._workdir = tempfile.TemporaryDirectory()
+            text_model = TextModel(model_name=build_tiny_text_model(self._workdir.name))
+            audio_model = AudioModel(build_random_audio_checkpoint(self._workdir.name), config.model.NUM_AUDIO_CLASSES)
+        else:
+            text_model, audio_model = ModelManager().get_models()
+            if audio_model is None:
+                raise RuntimeError("Audio model is not loaded")
+
+        self.text_model = text_model
+        self.audio_model = audio_model
+        self.text_processor = TextProcessor()
+        self.audio_processor = AudioProcessor()
+        self.pipeline = MultimodalPipeline(text_model, audio_model, self.text_processor, self.audio_processor)
+        self.pid = os.getpid()
+
+    def text(self, text: str):
+        self.text_processor.validate_text(text)
+        return self.text_model.predict(self.text_processor.clean_text(text))
+
+    def audio(self, wav: bytes):
+        audio, _ = self.audio_processor.decode(wav)
+        return self.audio_model.predict(self.audio_processor.create_spectrogram(audio))
+
+    def combined(self, text: str, wav: bytes):
+        return self.pipeline.analyze(text, wav)
+
+    def close(self):
+        if self._workdir:
+            self._workdir.cleanup()
+
+class HttpTarget:
+    def __init__(self, url: str, server_pid: int = None, timeout: float = 60.0):
+        parsed = urlparse(url)
+        self.host, self.port = parsed.hostname, parsed.port or 80
+        self.timeout = timeout
+        self.pid = server_pid
+        self._local = threading.local()
+
+    def _request(self, path: str, body: bytes, content_type: str):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        try:
+            connection.request("POST", path, body=body, headers={"Content-Type": content_type})
+            response = connection.getresponse()
+            payload = response.read()
+        except (http.client.HTTPException, OSError):
+            connection.close()
+            self._local.connection = None
+            raise
+        if response.status != 200:
+            raise RuntimeError(f"HTTP {response.status}: {payload[:200].decode('utf-8', 'replace')}")
+        return payload
+
+    def text(self, text: str):
+        return self._request("/v1/text", json.dumps({"text": text}).encode("utf-8"), "application/json")
+
+    def audio(self, wav: bytes):
+        return self._request("/v1/audio", wav, "audio/wav")
+
+    def combined(self, text: str, wav: bytes):
+        body = json.dumps({"text": text, "audio": base64.b64encode(wav).decode("ascii")}).encode("utf-8")
+        return self._request("/v1/combined", body, "application/json")
+
+    def close(self):
+        pass
+
+class RssSampler:
+    def __init__(self, pid: int = None, interval: float = 0.1):
+        self.pid = pid
+        self.interval = interval
+        self.peak_mb = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+
+    def _sample(self):
+        rss = rss_of_pid(self.pid) if self.pid and self.pid != os.getpid() else current_rss_mb()
+        if rss:
+            self.peak_mb = max(self.peak_mb, rss)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self):
+        self._sample()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+        return False
+
+class LoadGenerator:
+    def __init__(self, target, workload: Workload, duration: float, warmup: float = 0.0,
+                 concurrency: int = None, rate: float = None, max_inflight: int = 256):
+        if (concurrency is None) == (rate is None):
+            raise ValueError("Set exactly one of concurrency or rate")
+        self.target = target
+        self.workload = workload
+        self.duration = duration
+        self.warmup = warmup
+        self.concurrency = concurrency
+        self.rate = rate
+        self.max_inflight = max_inflight
+        self.samples = []
+        self._lock = threading.Lock()
+
+    def _execute(self, kind: str, args, scheduled_at: float, measure_from: float):
+        error = None
+        try:
+            getattr(self.target, kind)(*args)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        finished = time.perf_counter()
+        if scheduled_at >= measure_from:
+            with self._lock:
+                self.samples.append((kind, (finished - scheduled_at) * 1000.0, error, finished))
+
+    def _closed_loop(self, start: float, end: float, measure_from: float):
+        def user():
+            while time.perf_counter() < end:
+                kind, args = self.workload.next()
+                self._execute(kind, args, time.perf_counter(), measure_from)
+
+        threads = [threading.Thread(target=user, name=f"load-user-{i}") for i in range(self.concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def _open_loop(self, start: float, end: float, measure_from: float):
+        rng = np.random.default_rng(1)
+        with ThreadPoolExecutor(max_workers=self.max_inflight, thread_name_prefix="load-request") as executor:
+            scheduled = start
+            while True:
+                scheduled += rng.exponential(1.0 / self.rate)
+                if scheduled >= end:
+                    break
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                kind, args = self.workload.next()
+                executor.submit(self._execute, kind, args, scheduled, measure_from)
+
+    def run(self):
+        start = time.perf_counter()
+        measure_from = start + self.warmup
+        end = measure_from + self.duration
+        with RssSampler(self.target.pid) as rss:
+            if self.concurrency:
+                self._closed_loop(start, end, measure_from)
+            else:
+                self._open_loop(start, end, measure_from)
+        elapsed = max(time.perf_counter(), end) - measure_from
+        return self.summarize(elapsed, rss.peak_mb)
+
+    def summarize(self, elapsed: float, peak_rss_mb: float):
+        report = {"elapsed_seconds": elapsed, "peak_rss_mb": peak_rss_mb, "kinds": {}}
+        for kind in ("all",) + KINDS:
+            samples = [s for s in self.samples if kind == "all" or s[0] == kind]
+            if not samples:
+                continue
+            ok = [latency for _, latency, error, _ in samples if error is None]
+            errors = [error for _, _, error, _ in samples if error is not None]
+            summary = latency_summary(ok)
+            summary.update(
+                requests=len(samples),
+                errors=len(errors),
+                error_rate=len(errors) / len(samples),
+                throughput_rps=len(ok) / elapsed,
+                sample_errors=sorted(set(errors))[:5]
+            )
+            report["kinds"][kind] = summary
+        return report
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def print_report(report: dict, baseline: dict = None):
+    print(f"{'kind':<10} {'reqs':>7} {'err%':>6} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for kind, row in report["results"]["kinds"].items():
+        line = (f"{kind:<10} {row['requests']:>7} {row['error_rate'] * 100:>5.1f}% {row['throughput_rps']:>8.1f} "
+                f"{row.get('p50_ms', float('nan')):>9.1f} {row.get('p95_ms', float('nan')):>9.1f} "
+                f"{row.get('p99_ms', float('nan')):>9.1f}")
+        reference = (baseline or {}).get("results", {}).get("kinds", {}).get(kind)
+        if reference and reference.get("p95_ms") and row.get("p95_ms"):
+            line += (f"   vs {baseline.get('revision') or 'baseline'}: "
+                     f"rps {row['throughput_rps'] / reference['throughput_rps'] - 1:+.0%}, "
+                     f"p95 {row['p95_ms'] / reference['p95_ms'] - 1:+.0%}")
+        print(line)
+    print(f"peak RSS {report['results']['peak_rss_mb']:.0f} MB")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a synthetic text/audio/combined request mix and "
+                                                 "report throughput, latency percentiles, errors and peak RSS")
+    parser.add_argument("--url", default=None, help="Target a running server (python -m app.server) "
+                                                    "instead of calling the models in-process")
+    parser.add_argument("--server-pid", type=int, default=None, help="Sample peak RSS of this server process")
+    parser.add_argument("--synthetic-models", action="store_true",
+                        help="In-process only: use a tiny random text model and audio checkpoint")
+    parser.add_argument("--no-cache", action="store_true", help="In-process only: bypass the result caches")
+    parser.add_argument("--mix", default="text=0.6,audio=0.3,combined=0.1")
+    load = parser.add_mutually_exclusive_group()
+    load.add_argument("--concurrency", type=int, default=None, help="Closed loop: simulated users")
+    load.add_argument("--rate", type=float, default=None, help="Open loop: Poisson arrivals per second")
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--warmup", type=float, default=5.0, help="Seconds excluded from the results")
+    parser.add_argument("--text-lengths", type=int, nargs="+", default=[8, 32, 128, 400])
+    parser.add_argument("--audio-durations", type=float, nargs="+", default=[1.0, 4.0, 10.0])
+    parser.add_argument("--sample-rates", type=int, nargs="+", default=[22050, 44100])
+    parser.add_argument("--label", default=None, help="Name for the saved run")
+    parser.add_argument("--output-dir", default="benchmarks/runs")
+    parser.add_argument("--compare", default=None, help="Saved run to compare against")
+    args = parser.parse_args(argv)
+
+    if args.concurrency is None and args.rate is None:
+        args.concurrency = 4
+    if args.no_cache:
+        from app.utils.cache import text_cache, audio_cache
+        text_cache.enabled = audio_cache.enabled = False
+    mix = parse_mix(args.mix)
+    workload = Workload(mix, args.text_lengths, args.audio_durations, args.sample_rates)
+    target = HttpTarget(args.url, args.server_pid) if args.url else InProcessTarget(args.synthetic_models)
+
+    try:
+        generator = LoadGenerator(target, workload, args.duration, args.warmup,
+                                  concurrency=args.concurrency, rate=args.rate)
+        logger.info(f"Load test: {'concurrency ' + str(args.concurrency) if args.concurrency else str(args.rate) + ' req/s'}"
+                    f" for {args.duration:.0f}s against {args.url or 'in-process models'}")
+        results = generator.run()
+    finally:
+        target.close()
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "revision": git_revision(),
+        "host": platform.node(),
+        "target": args.url or ("in-process (synthetic models)" if args.synthetic_models else "in-process"),
+        "load": {"concurrency": args.concurrency, "rate": args.rate, "duration": args.duration,
+                 "warmup": args.warmup, "mix": mix},
+        "workload": {"text_lengths": args.text_lengths, "audio_durations": args.audio_durations,
+                     "sample_rates": args.sample_rates},
+        "backend": config.model.BACKEND,
+        "cache": not args.no_cache,
+        "results": results
+    }
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    label = args.label or report["revision"] or "run"
+    path = os.path.join(args.output_dir, f"{time.strftime('%Y%m%d-%H%M%S')}-{label}.json")
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+    logger.info(f"Run saved to {path}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
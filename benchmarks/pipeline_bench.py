@@ -0,0 +1,201 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.logger import logger
+from app.utils.config import config
+from app.utils.cache import text_cache, audio_cache
+from app.utils.profiling import latency_summary
+
+WORDS = ["service", "great", "terrible", "support", "waited", "refund", "happy", "angry",
+         "delivery", "product", "quality", "price", "never", "again", "love", "slow"]
+
+def synthetic_texts(count: int, words: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    return [" ".join(rng.choice(WORDS, size=words)) + "!" for _ in range(count)]
+
+def synthetic_audio(seconds: float, seed: int = 0, sample_rate: int = None):
+    sample_rate = sample_rate or config.model.SAMPLE_RATE
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    tone = 0.3 * np.sin(2 * np.pi * rng.uniform(100, 400) * t)
+    return (tone + 0.05 * rng.standard_normal(t.size)).astype(np.float32)
+
+def build_tiny_text_model(workdir: str):
+    from tokenizers import Tokenizer, models, pre_tokenizers
+    from transformers import PreTrainedTokenizerFast, RobertaConfig, RobertaForSequenceClassification
+
+    vocab = {token: i for i, token in enumerate(["<s>", "<pad>", "</s>", "<unk>"] + WORDS)}
+    backend = Tokenizer(models.WordLevel(vocab, unk_token="<unk>"))
+    backend.pre_tokenizer = pre_tokenizers.Whitespace()
+    tokenizer = PreTrainedTokenizerFast(
+        tokenizer_object=backend, bos_token="<s>", eos_token="</s>",
+        pad_token="<pad>", unk_token="<unk>", model_max_length=config.model.MAX_LENGTH
+    )
+    model_config = RobertaConfig(
+        vocab_size=len(vocab), hidden_size=64, num_hidden_layers=2, num_attention_heads=2,
+        intermediate_size=128, max_position_embeddings=config.model.MAX_LENGTH + 2,
+        pad_token_id=1, num_labels=3,
+        id2label={0: "negative", 1: "neutral", 2: "positive"},
+        label2id={"negative": 0, "neutral": 1, "positive": 2}
+    )
+    path = os.path.join(workdir, "tiny-text-model")
+    tokenizer.save_pretrained(path)
+    RobertaForSequenceClassification(model_config).save_pretrained(path)
+    return path
+
+def build_random_audio_checkpoint(workdir: str):
+    import torch
+    from app.models.audio_model import AudioCNN
+
+    torch.manual_seed(0)
+    path = os.path.join(workdir, "random_audio_cnn.pth")
+    torch.save(AudioCNN(config.model.NUM_AUDIO_CLASSES).state_dict(), path)
+    return path
+
+class StageTimer:
+    def __init__(self, repeats: int, warmup: int):
+        self.repeats = repeats
+        self.warmup = warmup
+        self.results = {}
+
+    def measure(self, name: str, fn, items: int = 1, **params):
+        for _ in range(self.warmup):
+            fn()
+        samples = []
+        for _ in range(self.repeats):
+            start = time.perf_counter()
+            fn()
+            samples.append((time.perf_counter() - start) * 1000.0)
+        key = name + "".join(f"[{k}={v}]" for k, v in params.items())
+        summary = latency_summary(samples)
+        summary["items_per_sec"] = items * 1000.0 / summary["p50_ms"] if summary["p50_ms"] else None
+        self.results[key] = summary
+        logger.info(f"{key}: p50 {summary['p50_ms']:.3f} ms")
+        return summary
+
+def run_suite(batch_sizes, text_lengths, audio_durations, repeats: int, warmup: int):
+    import soundfile as sf
+    from app.models.text_model import TextModel
+    from app.models.audio_model import AudioModel
+    from app.processing.text_processor import TextProcessor
+    from app.processing.audio_processor import AudioProcessor
+
+    text_cache.enabled = False
+    audio_cache.enabled = False
+    timer = StageTimer(repeats, warmup)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        text_model = TextModel(model_name=build_tiny_text_model(workdir))
+        audio_model = AudioModel(build_random_audio_checkpoint(workdir), config.model.NUM_AUDIO_CLASSES)
+        text_processor = TextProcessor()
+        audio_processor = AudioProcessor()
+
+        for words in text_lengths:
+            for batch_size in batch_sizes:
+                texts = synthetic_texts(batch_size, words)
+                cleaned = [text_processor.clean_text(t) for t in texts]
+                timer.measure("text_clean", lambda: [text_processor.clean_text(t) for t in texts],
+                              items=batch_size, batch=batch_size, words=words)
+                timer.measure("text_tokenize", lambda: text_model.tokenizer(
+                    cleaned, padding="longest", truncation=True,
+                    max_length=config.model.MAX_LENGTH, return_tensors="pt"
+                ), items=batch_size, batch=batch_size, words=words)
+                timer.measure("text_forward", lambda: text_model.predict_batch(cleaned, batch_size=batch_size),
+                              items=batch_size, batch=batch_size, words=words)
+
+        for seconds in audio_durations:
+            wav_path = os.path.join(workdir, f"clip_{seconds}s.wav")
+            sf.write(wav_path, synthetic_audio(seconds), config.model.SAMPLE_RATE)
+            audio, _ = audio_processor.load_audio(wav_path)
+            spectrogram = audio_processor.create_spectrogram(audio)
+
+            timer.measure("audio_load", lambda: audio_processor.load_audio(wav_path), seconds=seconds)
+            timer.measure("audio_spectrogram", lambda: audio_processor.create_spectrogram(audio), seconds=seconds)
+            for batch_size in batch_sizes:
+                clips = np.stack([audio] * batch_size)
+                spectrograms = [spectrogram] * batch_size
+                timer.measure("audio_spectrogram_batch", lambda: audio_processor.create_spectrogram_batch(clips),
+                              items=batch_size, batch=batch_size, seconds=seconds)
+                timer.measure("audio_cnn_forward", lambda: audio_model.predict_batch(spectrograms, batch_size=batch_size),
+                              items=batch_size, batch=batch_size, seconds=seconds)
+
+            text = synthetic_texts(1, max(text_lengths))[0]
+
+            def combined():
+                text_model.predict(text_processor.clean_text(text))
+                clip, _ = audio_processor.load_audio(wav_path)
+                audio_model.predict(audio_processor.create_spectrogram(clip))
+
+            timer.measure("combined_end_to_end", combined, seconds=seconds, words=max(text_lengths))
+
+    return timer.results
+
+def compare(results, baseline, tolerance: float):
+    regressions = []
+    for key, current in results.items():
+        reference = baseline.get("stages", {}).get(key)
+        if not reference:
+            continue
+        limit = reference["p50_ms"] * (1.0 + tolerance)
+        if current["p50_ms"] > limit:
+            regressions.append((key, reference["p50_ms"], current["p50_ms"]))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-stage micro-benchmarks for the text and audio pipelines")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--text-lengths", type=int, nargs="+", default=[16, 128, 400])
+    parser.add_argument("--audio-durations", type=float, nargs="+", default=[1.0, 4.0])
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--output", default="benchmarks/results.json")
+    parser.add_argument("--baseline", default="benchmarks/baseline.json")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed p50 slowdown vs baseline")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline")
+    args = parser.parse_args(argv)
+
+    import torch
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "host": platform.node(),
+        "python": platform.python_version(),
+        "torch": torch.__version__,
+        "torch_threads": torch.get_num_threads(),
+        "stages": run_suite(args.batch_sizes, args.text_lengths, args.audio_durations, args.repeats, args.warmup)
+    }
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    logger.info(f"Benchmark results written to {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        logger.info(f"Baseline updated at {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        logger.warning(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(report["stages"], baseline, args.tolerance)
+    for key, before, after in regressions:
+        logger.error(f"REGRESSION {key}: p50 {before:.3f} ms -> {after:.3f} ms")
+    if regressions:
+        logger.error(f"{len(regressions)} stage(s) slower than baseline by more than {args.tolerance:.0%}")
+        return 1
+    logger.info("No regressions against baseline")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
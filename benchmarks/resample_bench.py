@@ -0,0 +1,74 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.logger import logger
+from app.utils.config import config
+from app.processing.audio_processor import AudioProcessor, RESAMPLERS
+from benchmarks.pipeline_bench import StageTimer, synthetic_audio
+
+def legacy_load(path: str):
+    import librosa
+    return librosa.load(path, sr=config.model.SAMPLE_RATE, duration=config.model.DURATION)
+
+def spectrogram_drift(reference: np.ndarray, candidate: np.ndarray):
+    frames = min(reference.shape[1], candidate.shape[1])
+    reference, candidate = reference[:, :frames], candidate[:, :frames]
+    diff = np.abs(reference - candidate)
+    return {
+        "max_abs_diff": float(diff.max()),
+        "mean_abs_diff": float(diff.mean()),
+        "correlation": float(np.corrcoef(reference.ravel(), candidate.ravel())[0, 1])
+    }
+
+def run(rates, seconds: float, repeats: int, warmup: int):
+    import soundfile as sf
+
+    timer = StageTimer(repeats, warmup)
+    processors = {name: AudioProcessor(resampler=name) for name in RESAMPLERS}
+    drift = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for rate in rates:
+            path = os.path.join(workdir, f"tone_{rate}.wav")
+            audio = synthetic_audio(seconds, seed=rate, sample_rate=rate)
+            sf.write(path, audio, rate)
+            clip = audio[:int(config.model.DURATION * rate)]
+
+            timer.measure("load_librosa_default", lambda: legacy_load(path), rate=rate)
+            for name, processor in processors.items():
+                timer.measure("resample", lambda: processor.resample(clip, rate), resampler=name, rate=rate)
+                timer.measure("load_audio", lambda: processor.load_audio(path), resampler=name, rate=rate)
+
+            reference = processors["hq"].create_spectrogram(processors["hq"].load_audio(path)[0])
+            for name, processor in processors.items():
+                candidate = processor.create_spectrogram(processor.load_audio(path)[0])
+                drift[f"{name}[rate={rate}]"] = spectrogram_drift(reference, candidate)
+    return {"latency": timer.results, "spectrogram_drift_vs_hq": drift}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare decode and resampling cost of the audio front end")
+    parser.add_argument("--rates", type=int, nargs="+", default=[22050, 44100, 48000])
+    parser.add_argument("--seconds", type=float, default=30.0, help="Length of the synthetic recordings")
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--output", default=None, help="Write the full results as JSON")
+    args = parser.parse_args(argv)
+
+    results = run(args.rates, args.seconds, args.repeats, args.warmup)
+    for key, summary in results["latency"].items():
+        print(f"{key:<50} p50 {summary['p50_ms']:8.2f} ms  p95 {summary['p95_ms']:8.2f} ms")
+    for key, drift in results["spectrogram_drift_vs_hq"].items():
+        print(f"{key:<50} max |d| {drift['max_abs_diff']:.4f}  mean |d| {drift['mean_abs_diff']:.4f}  "
+              f"corr {drift['correlation']:.5f}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        logger.info(f"Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
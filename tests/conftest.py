@@ -0,0 +1,17 @@
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+@pytest.fixture(scope="session")
+def tiny_text_model(tmp_path_factory):
+    from app.utils.cache import text_cache
+    from app.models.text_model import TextModel
+    from benchmarks.pipeline_bench import build_tiny_text_model
+
+    text_cache.enabled = False
+    try:
+        yield TextModel(model_name=build_tiny_text_model(str(tmp_path_factory.mktemp("text"))), quantization="none")
+    finally:
+        text_cache.enabled = True
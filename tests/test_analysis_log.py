@@ -0,0 +1,40 @@
+import pytest
+from app.utils.analysis_log import AnalysisLog
+
+def make_log(tmp_path, **kwargs):
+    return AnalysisLog(str(tmp_path / "analyses.db"), batch_size=16, flush_interval=0.05, **kwargs)
+
+def test_non_finite_confidence_does_not_poison_batch(tmp_path):
+    log = make_log(tmp_path)
+    log.record("text", {"predicted_label": "POSITIVE", "confidence": 0.9})
+    log.record("audio", {"predicted_label": "ANGRY", "confidence": float("nan")})
+    log.record("text", {"predicted_label": "NEGATIVE", "confidence": 0.7})
+    log.flush()
+
+    summary = log.summary()
+    assert summary["total"] == 2
+    assert summary["labels"] == {"text": {"POSITIVE": 1, "NEGATIVE": 1}}
+    assert log.rejected == 1
+
+def test_source_is_not_stored_by_default(tmp_path):
+    log = make_log(tmp_path)
+    log.record("text", {"predicted_label": "POSITIVE", "confidence": 0.9}, "my private message")
+    log.flush()
+    assert log.recent()[0]["source"] is None
+
+def test_source_is_stored_when_enabled(tmp_path):
+    log = make_log(tmp_path, store_source=True)
+    log.record("text", {"predicted_label": "POSITIVE", "confidence": 0.9}, "x" * 500)
+    log.flush()
+    assert log.recent()[0]["source"] == "x" * 200
+
+def test_summary_reports_confidence_per_kind(tmp_path):
+    log = make_log(tmp_path)
+    for kind, label, confidence in [("text", "POSITIVE", 0.9), ("text", "NEGATIVE", 0.5), ("audio", "HAPPY", 0.6)]:
+        log.record(kind, {"predicted_label": label, "confidence": confidence})
+    log.flush()
+
+    summary = log.summary()
+    assert summary["by_kind"] == {"text": 2, "audio": 1}
+    assert summary["mean_confidence_by_kind"]["text"] == pytest.approx(0.7)
+    assert summary["mean_confidence_by_kind"]["audio"] == pytest.approx(0.6)
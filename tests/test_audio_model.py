@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+from app.utils.config import config
+
+@pytest.fixture(scope="module")
+def audio_model(tmp_path_factory):
+    from app.models.audio_model import AudioModel
+    from benchmarks.pipeline_bench import build_random_audio_checkpoint
+
+    path = build_random_audio_checkpoint(str(tmp_path_factory.mktemp("audio")))
+    return AudioModel(path, config.model.NUM_AUDIO_CLASSES, demo_mode=False, quantization="none")
+
+def test_batched_prediction_matches_single(audio_model):
+    rng = np.random.default_rng(0)
+    spectrograms = [rng.standard_normal((config.model.N_MELS, frames)).astype(np.float32)
+                    for frames in (40, config.model.N_FRAMES, 120, config.model.N_FRAMES, 60)]
+    batched = audio_model.predict_batch(spectrograms, batch_size=2)
+    for spectrogram, probs in zip(spectrograms, batched):
+        np.testing.assert_allclose(probs, audio_model.predict(spectrogram), atol=1e-5)
+
+def test_silent_spectrogram_gives_finite_probabilities(audio_model):
+    probs = audio_model.predict(np.zeros((config.model.N_MELS, config.model.N_FRAMES), np.float32))
+    assert np.isfinite(probs).all()
+    assert probs.sum() == pytest.approx(1.0, abs=1e-5)
@@ -0,0 +1,51 @@
+import pytest
+from app.utils.config import config
+from app.models import autotune
+
+@pytest.fixture(scope="module")
+def onnx_audio_model(tmp_path_factory):
+    from app.models.onnx_backend import OnnxAudioModel, export_audio_model
+    from benchmarks.pipeline_bench import build_random_audio_checkpoint
+
+    workdir = str(tmp_path_factory.mktemp("onnx"))
+    export_audio_model(build_random_audio_checkpoint(workdir), workdir)
+    return OnnxAudioModel(workdir)
+
+@pytest.fixture
+def onnx_backend(monkeypatch):
+    monkeypatch.setattr(config.model, "BACKEND", "onnx")
+    monkeypatch.setattr(config.model, "ORT_INTRA_OP_THREADS", config.model.ORT_INTRA_OP_THREADS)
+    monkeypatch.setattr(config.model, "ORT_INTER_OP_THREADS", config.model.ORT_INTER_OP_THREADS)
+    monkeypatch.setattr(config.model, "TEXT_BATCH_SIZE", config.model.TEXT_BATCH_SIZE)
+    monkeypatch.setattr(config.model, "AUDIO_BATCH_SIZE", config.model.AUDIO_BATCH_SIZE)
+    monkeypatch.setattr(autotune, "_applied", None)
+
+def test_onnx_sweep_varies_intra_op_threads(onnx_audio_model):
+    seen = []
+    set_threads = onnx_audio_model.set_threads
+
+    def record(threads):
+        seen.append(threads)
+        set_threads(threads)
+
+    onnx_audio_model.set_threads = record
+    try:
+        points = autotune.sweep(None, onnx_audio_model, threads=[1, 2], batch_sizes=[1, 2], repeats=1, warmup=0)
+    finally:
+        del onnx_audio_model.set_threads
+    assert {(p["threads"], p["batch_size"]) for p in points if p["model"] == "audio"} == {(1, 1), (1, 2), (2, 1), (2, 2)}
+    assert seen[:2] == [1, 2]
+    assert onnx_audio_model.intra_op_threads == config.model.ORT_INTRA_OP_THREADS
+
+def test_onnx_profile_sets_ort_threads(onnx_backend):
+    profile = {"host": "test", "backend": "onnx", "workers": config.server.WORKERS, "threads": 1,
+               "text_batch_size": 8, "audio_batch_size": 4}
+    applied = autotune.apply_profile(profile)
+    assert applied["threads"] == 1
+    assert config.model.ORT_INTRA_OP_THREADS == 1
+    assert config.model.AUDIO_BATCH_SIZE == 4
+
+def test_profile_for_other_backend_is_ignored(onnx_backend):
+    profile = {"host": "test", "backend": "torch", "workers": 1, "threads": 3,
+               "text_batch_size": 8, "audio_batch_size": 4}
+    assert autotune.apply_profile(profile) is None
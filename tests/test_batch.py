@@ -0,0 +1,74 @@
+import json
+import numpy as np
+import soundfile as sf
+from app.batch import BatchScorer, Checkpoint
+from app.utils.config import config
+
+class StubTextModel:
+    def __init__(self):
+        self.texts = []
+
+    def predict_batch(self, texts):
+        self.texts.extend(texts)
+        return [[{"label": "LABEL_0", "score": 0.3}, {"label": "LABEL_1", "score": 0.7}] for _ in texts]
+
+class StubAudioModel:
+    def predict_batch(self, spectrograms):
+        return [np.array([0.1, 0.2, 0.3, 0.4]) for _ in spectrograms]
+
+class StubManager:
+    def __init__(self):
+        self.text_model = StubTextModel()
+        self.audio_model = StubAudioModel()
+
+def make_scorer():
+    scorer = BatchScorer(chunk_size=2, workers=1)
+    scorer._model_manager = StubManager()
+    return scorer
+
+def write_manifest(tmp_path):
+    clip = tmp_path / "clip.wav"
+    rate = config.model.SAMPLE_RATE
+    sf.write(str(clip), 0.3 * np.sin(2 * np.pi * 220 * np.arange(rate) / rate), rate)
+    records = [
+        {"id": "a", "text": "The support team was great", "audio": str(clip)},
+        {"id": "b", "text": "hi"},
+        {"id": "c", "audio": str(tmp_path / "missing.wav")},
+        {"id": "d", "text": "Delivery took far too long"},
+        {"id": "e", "text": "Would order again"},
+    ]
+    manifest = tmp_path / "manifest.jsonl"
+    manifest.write_text("".join(json.dumps(record) + "\n" for record in records))
+    return str(manifest)
+
+def read_output(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+def test_errors_are_recorded_per_record(tmp_path):
+    output = str(tmp_path / "out.jsonl")
+    make_scorer().run(write_manifest(tmp_path), output)
+    results = {result["id"]: result for result in read_output(output)}
+
+    assert list(results) == ["a", "b", "c", "d", "e"]
+    assert results["a"]["text_result"]["predicted_label"] == "POSITIVE"
+    assert results["a"]["audio_result"]["predicted_label"].endswith("NEUTRAL")
+    assert "text_error" in results["b"] and "text_result" not in results["b"]
+    assert "audio_error" in results["c"] and "audio_result" not in results["c"]
+
+def test_resume_skips_done_records_and_drops_partial_output(tmp_path):
+    manifest, output = write_manifest(tmp_path), str(tmp_path / "out.jsonl")
+    make_scorer().run(manifest, output)
+    complete = read_output(output)
+
+    with open(output, "rb") as f:
+        first_two = b"".join(f.readlines()[:2])
+    with open(output, "wb") as f:
+        f.write(first_two + b'{"id": "c", "te')
+    Checkpoint(f"{output}.ckpt").save(2, len(first_two))
+
+    scorer = make_scorer()
+    summary = scorer.run(manifest, output)
+    assert summary["records"] == 3
+    assert scorer.model_manager.text_model.texts == ["delivery took far too long", "would order again"]
+    assert read_output(output) == complete
@@ -0,0 +1,36 @@
+import os
+import time
+import numpy as np
+from app.utils.cache import ResultCache
+
+def test_disk_tier_round_trips_without_pickle(tmp_path):
+    cache = ResultCache("audio", disk_dir=str(tmp_path))
+    cache.set("a" * 64, np.array([0.1, 0.2, 0.7], dtype=np.float32))
+    cache.set("b" * 64, [{"label": "positive", "score": 0.9}])
+
+    restored = ResultCache("audio", disk_dir=str(tmp_path))
+    np.testing.assert_array_equal(restored.get("a" * 64), np.array([0.1, 0.2, 0.7], dtype=np.float32))
+    assert restored.get("b" * 64) == [{"label": "positive", "score": 0.9}]
+    files = {name for _, _, names in os.walk(tmp_path) for name in names}
+    assert {os.path.splitext(name)[1] for name in files} == {".npy", ".json"}
+
+def test_pickled_entries_are_never_loaded(tmp_path):
+    cache = ResultCache("text", disk_dir=str(tmp_path))
+    key = "c" * 64
+    os.makedirs(tmp_path / "text" / key[:2])
+    (tmp_path / "text" / key[:2] / f"{key}.pkl").write_bytes(b"\x80\x04K\x01.")
+    assert cache.get(key) is None
+
+def test_disk_tier_evicts_oldest_entries(tmp_path):
+    cache = ResultCache("text", max_entries=2, ttl_seconds=None, disk_dir=str(tmp_path), disk_max_entries=10)
+    for i in range(25):
+        path = cache._disk_path(f"{i:064x}", ".json")
+        cache.set(f"{i:064x}", [float(i)])
+        if os.path.exists(path):
+            os.utime(path, (time.time() - 100 + i, time.time() - 100 + i))
+
+    assert len(cache._disk_files()) <= 10
+    assert cache.stats()["disk_evictions"] >= 15
+    cache.clear()
+    assert cache.get(f"{24:064x}") == [24.0]
+    assert cache.get(f"{0:064x}") is None
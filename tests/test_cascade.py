@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+from app.models.cascade import CascadeTextModel, HashedLinearModel, calibrate, pick_threshold
+from benchmarks.pipeline_bench import synthetic_texts
+
+def test_pick_threshold_meets_target_agreement():
+    confidence = np.array([0.6, 0.9, 0.7, 0.8])
+    agree = np.array([True, True, False, True])
+    assert pick_threshold(confidence, agree, 1.0) == (0.8, 0.5)
+    assert pick_threshold(confidence, agree, 0.75) == (0.6, 1.0)
+
+def test_pick_threshold_escalates_everything_when_top_prediction_disagrees():
+    threshold, coverage = pick_threshold(np.array([0.9, 0.5]), np.array([False, True]), 1.0)
+    assert threshold > 1.0 and coverage == 0.0
+
+def test_predict_batch_routes_by_first_stage_confidence(tiny_text_model, tmp_path):
+    texts = synthetic_texts(40, 12, seed=3)
+    first_stage, report = calibrate(tiny_text_model, texts, target_agreement=0.9)
+    path = str(tmp_path / "cascade.npz")
+    first_stage.save(path)
+    loaded = HashedLinearModel.load(path)
+    assert loaded.threshold == pytest.approx(report["threshold"])
+
+    confidence = loaded.predict_proba(texts).max(axis=1)
+    threshold = float(np.median(confidence))
+    cascade = CascadeTextModel(tiny_text_model, loaded, threshold)
+    results = cascade.predict_batch(texts)
+
+    lexicon = confidence >= threshold
+    assert 0 < lexicon.sum() < len(texts)
+    transformer = tiny_text_model.predict_batch([text for text, easy in zip(texts, lexicon) if not easy])
+    assert cascade.stats()["lexicon"] == int(lexicon.sum())
+    assert cascade.stats()["transformer"] == len(transformer)
+    assert [result for result, easy in zip(results, lexicon) if not easy] == transformer
+    for result, row in zip([r for r, easy in zip(results, lexicon) if easy], loaded.predict_proba(texts)[lexicon]):
+        assert [item["score"] for item in result] == pytest.approx(row.tolist())
+    assert cascade.predict(texts[0]) == results[0]
@@ -0,0 +1,34 @@
+import torch
+from app.utils.config import config
+from app.models.audio_model import AudioCNN
+from app.models.checkpoints import convert_audio_checkpoint, load_module, load_state_dict, resolve_checkpoint
+from benchmarks.pipeline_bench import build_random_audio_checkpoint
+
+def build_module():
+    return AudioCNN(config.model.NUM_AUDIO_CLASSES)
+
+def assert_same_weights(loaded, expected):
+    assert loaded.keys() == expected.keys()
+    for name, tensor in expected.items():
+        assert torch.equal(loaded[name], tensor), name
+
+def test_safetensors_round_trip_is_preferred(tmp_path):
+    path = build_random_audio_checkpoint(str(tmp_path))
+    expected = torch.load(path, weights_only=True)
+    converted = convert_audio_checkpoint(path)
+
+    assert resolve_checkpoint(path) == converted
+    assert_same_weights(load_state_dict(path), expected)
+    assert_same_weights(load_state_dict(path, prefer_safetensors=False), expected)
+
+def test_module_is_loaded_without_random_init(tmp_path):
+    path = build_random_audio_checkpoint(str(tmp_path))
+    expected = torch.load(path, weights_only=True)
+    for prefer_safetensors in (False, True):
+        if prefer_safetensors:
+            convert_audio_checkpoint(path)
+        module = load_module(build_module, path, prefer_safetensors=prefer_safetensors).eval()
+        assert not any(param.is_meta for param in module.parameters())
+        assert_same_weights(module.state_dict(), expected)
+        with torch.inference_mode():
+            assert module(torch.zeros(1, config.model.N_MELS, config.model.N_FRAMES)).shape[-1] == config.model.NUM_AUDIO_CLASSES
@@ -0,0 +1,35 @@
+import json
+import numpy as np
+import pytest
+from app.utils.config import config
+from app.processing.feature_store import FeatureStore
+
+def spectrogram(seed):
+    return np.random.default_rng(seed).standard_normal((config.model.N_MELS, config.model.N_FRAMES)).astype(np.float32)
+
+def test_features_survive_reopen(tmp_path):
+    store = FeatureStore(str(tmp_path), shard_rows=2)
+    for i in range(3):
+        store.put(f"clip-{i}", spectrogram(i))
+
+    reopened = FeatureStore(str(tmp_path))
+    assert len(reopened) == 3 and reopened.shard_rows == 2
+    np.testing.assert_array_equal(reopened.get("clip-2"), spectrogram(2))
+
+def test_config_change_only_removes_store_files(tmp_path):
+    store = FeatureStore(str(tmp_path))
+    store.put("clip", spectrogram(0))
+    meta_path = tmp_path / "meta.json"
+    meta = json.loads(meta_path.read_text())
+    meta_path.write_text(json.dumps(dict(meta, fingerprint="stale")))
+
+    reopened = FeatureStore(str(tmp_path))
+    assert len(reopened) == 0
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["meta.json"]
+    assert json.loads(meta_path.read_text())["fingerprint"] == reopened.fingerprint
+
+def test_directory_with_other_files_is_refused(tmp_path):
+    (tmp_path / "notes.txt").write_text("keep me")
+    with pytest.raises(ValueError):
+        FeatureStore(str(tmp_path))
+    assert (tmp_path / "notes.txt").read_text() == "keep me"
@@ -0,0 +1,46 @@
+import os
+import time
+import pytest
+from benchmarks.load_test import LoadGenerator, Workload, parse_mix
+
+class StubTarget:
+    pid = os.getpid()
+
+    def text(self, text):
+        time.sleep(0.001)
+
+    def audio(self, wav):
+        raise RuntimeError("decoder unavailable")
+
+    def combined(self, text, wav):
+        time.sleep(0.002)
+
+@pytest.fixture(scope="module")
+def workload():
+    return Workload(parse_mix("text=2,audio=1,combined=1"), [4], [0.1], [22050])
+
+def test_parse_mix_normalizes_weights():
+    assert parse_mix("text=3,audio=1,combined=0") == {"text": 0.75, "audio": 0.25}
+    assert parse_mix("text,audio") == {"text": 0.5, "audio": 0.5}
+    with pytest.raises(ValueError):
+        parse_mix("video=1")
+
+def test_load_generator_needs_exactly_one_load_mode(workload):
+    with pytest.raises(ValueError):
+        LoadGenerator(StubTarget(), workload, duration=1.0)
+    with pytest.raises(ValueError):
+        LoadGenerator(StubTarget(), workload, duration=1.0, concurrency=2, rate=10.0)
+
+def test_closed_loop_reports_latency_and_errors_per_kind(workload):
+    report = LoadGenerator(StubTarget(), workload, duration=0.3, warmup=0.1, concurrency=2).run()
+    kinds = report["kinds"]
+    assert kinds["all"]["requests"] == sum(kinds[kind]["requests"] for kind in ("text", "audio", "combined"))
+    assert kinds["audio"]["error_rate"] == 1.0
+    assert kinds["audio"]["sample_errors"] == ["RuntimeError: decoder unavailable"]
+    assert kinds["text"]["errors"] == 0 and kinds["text"]["p50_ms"] >= 1.0
+    assert report["elapsed_seconds"] >= 0.3 and report["peak_rss_mb"] > 0
+
+def test_open_loop_follows_the_arrival_rate(workload):
+    generator = LoadGenerator(StubTarget(), workload, duration=0.5, rate=200.0)
+    report = generator.run()
+    assert 50 <= report["kinds"]["all"]["requests"] <= 200
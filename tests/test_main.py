@@ -0,0 +1,26 @@
+import pytest
+
+pytest.importorskip("streamlit")
+pytest.importorskip("streamlit_option_menu")
+
+from app.main import MultimodalApp, analysis_log
+from app.processing.text_processor import TextProcessor
+
+@pytest.fixture
+def app(monkeypatch):
+    monkeypatch.setattr(analysis_log, "enabled", False)
+    app = object.__new__(MultimodalApp)
+    app.text_processor = TextProcessor()
+    return app
+
+def test_analyze_text_formats_single_text(app, tiny_text_model):
+    result = app.analyze_text(tiny_text_model, "The delivery was quick and the support team was helpful")
+    assert set(result) >= {"predicted_label", "confidence"}
+    assert 0.0 <= result["confidence"] <= 1.0
+
+def test_analyze_text_formats_each_text_in_a_list(app, tiny_text_model):
+    texts = ["The delivery was quick", "I waited two weeks and nobody answered my emails"]
+    results = app.analyze_text(tiny_text_model, texts)
+    assert [result["predicted_label"] for result in results] == [
+        app.analyze_text(tiny_text_model, text)["predicted_label"] for text in texts
+    ]
@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+from app.utils.config import config
+from app.models.onnx_backend import OnnxAudioModel, OnnxTextModel, export_audio_model, export_text_model
+from benchmarks.pipeline_bench import build_random_audio_checkpoint, synthetic_texts
+
+def test_onnx_audio_matches_torch(tmp_path):
+    from app.models.audio_model import AudioModel
+
+    checkpoint = build_random_audio_checkpoint(str(tmp_path))
+    export_audio_model(checkpoint, str(tmp_path))
+    torch_model = AudioModel(checkpoint, config.model.NUM_AUDIO_CLASSES, demo_mode=False, quantization="none")
+    onnx_model = OnnxAudioModel(str(tmp_path))
+
+    rng = np.random.default_rng(0)
+    spectrograms = [rng.standard_normal((config.model.N_MELS, frames)).astype(np.float32)
+                    for frames in (config.model.N_FRAMES, config.model.N_FRAMES // 2, config.model.N_FRAMES + 7)]
+    np.testing.assert_allclose(onnx_model.predict_batch(spectrograms, batch_size=2),
+                               torch_model.predict_batch(spectrograms), atol=1e-5)
+
+def test_onnx_text_matches_torch(tiny_text_model, tmp_path):
+    export_text_model(tiny_text_model.model_name, str(tmp_path))
+    onnx_model = OnnxTextModel(str(tmp_path))
+
+    texts = synthetic_texts(3, 8, seed=5) + synthetic_texts(2, config.model.MAX_LENGTH * 2, seed=6)
+    for onnx_result, torch_result in zip(onnx_model.predict_batch(texts, batch_size=2),
+                                         tiny_text_model.predict_batch(texts)):
+        assert {item["label"]: item["score"] for item in onnx_result} == pytest.approx(
+            {item["label"]: item["score"] for item in torch_result}, abs=1e-5)
@@ -0,0 +1,29 @@
+import json
+import pytest
+from app.utils.cache import audio_cache, text_cache
+from benchmarks import pipeline_bench
+
+def test_compare_flags_only_stages_past_tolerance():
+    baseline = {"stages": {"fast": {"p50_ms": 10.0}, "slow": {"p50_ms": 10.0}}}
+    results = {"fast": {"p50_ms": 12.0}, "slow": {"p50_ms": 13.0}, "new": {"p50_ms": 99.0}}
+    assert pipeline_bench.compare(results, baseline, tolerance=0.25) == [("slow", 10.0, 13.0)]
+
+@pytest.fixture
+def bench_args(tmp_path, monkeypatch):
+    monkeypatch.setattr(text_cache, "enabled", text_cache.enabled)
+    monkeypatch.setattr(audio_cache, "enabled", audio_cache.enabled)
+    return ["--batch-sizes", "2", "--text-lengths", "6", "--audio-durations", "0.5", "--repeats", "1",
+            "--warmup", "0", "--output", str(tmp_path / "results.json"), "--baseline", str(tmp_path / "baseline.json")]
+
+def test_main_fails_when_a_stage_regresses(bench_args, tmp_path):
+    assert pipeline_bench.main(bench_args + ["--save-baseline"]) == 0
+    baseline_path = tmp_path / "baseline.json"
+    baseline = json.loads(baseline_path.read_text())
+    assert {"text_forward[batch=2][words=6]", "audio_cnn_forward[batch=2][seconds=0.5]",
+            "combined_end_to_end[seconds=0.5][words=6]"} <= set(baseline["stages"])
+
+    assert pipeline_bench.main(bench_args + ["--tolerance", "1000"]) == 0
+    for stage in baseline["stages"].values():
+        stage["p50_ms"] = 1e-9
+    baseline_path.write_text(json.dumps(baseline))
+    assert pipeline_bench.main(bench_args) == 1
@@ -0,0 +1,7 @@
+from app.models.quantization import compare_text
+
+def test_dynamic_text_quantization_keeps_labels(tiny_text_model):
+    report = compare_text("dynamic", model_name=tiny_text_model.model_name, samples=16)
+    assert report["model"] == tiny_text_model.model_name
+    assert report["agreement"] >= 0.9
+    assert report["quantized_size_mb"] < report["fp32_size_mb"]
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+import soundfile as sf
+from app.utils.config import config
+from app.processing.audio_processor import AudioProcessor, RESAMPLERS
+from benchmarks import resample_bench
+from benchmarks.pipeline_bench import synthetic_audio
+
+def write_clip(tmp_path, rate, seconds):
+    path = str(tmp_path / f"clip_{rate}.wav")
+    audio = synthetic_audio(seconds, seed=rate, sample_rate=rate)
+    sf.write(path, audio, rate, subtype="FLOAT")
+    return path, audio
+
+def test_native_rate_reads_only_the_needed_frames(tmp_path):
+    rate = config.model.SAMPLE_RATE
+    path, audio = write_clip(tmp_path, rate, config.model.DURATION + 4)
+    processor = AudioProcessor(vad=False)
+
+    loaded, sr = processor.load_audio(path, offset=1.5)
+    start = int(1.5 * rate)
+    assert sr == rate
+    np.testing.assert_array_equal(loaded, audio[start:start + int(config.model.DURATION * rate)])
+    assert processor.resample(audio, rate) is audio
+
+@pytest.mark.parametrize("resampler, min_correlation", [("hq", 1.0), ("polyphase", 0.98), ("fast", 0.85)])
+def test_resamplers_stay_close_to_hq_spectrogram(tmp_path, resampler, min_correlation):
+    path, _ = write_clip(tmp_path, 44100, config.model.DURATION)
+    reference_processor = AudioProcessor(resampler="hq", vad=False)
+    processor = AudioProcessor(resampler=resampler, vad=False)
+
+    audio, sr = processor.load_audio(path)
+    assert sr == config.model.SAMPLE_RATE
+    assert len(audio) == pytest.approx(config.model.DURATION * sr, abs=2)
+    drift = resample_bench.spectrogram_drift(
+        reference_processor.create_spectrogram(reference_processor.load_audio(path)[0]),
+        processor.create_spectrogram(audio)
+    )
+    assert drift["correlation"] >= min_correlation - 1e-6
+
+def test_unknown_resampler_is_rejected():
+    with pytest.raises(ValueError):
+        AudioProcessor(resampler="linear")
+
+def test_benchmark_reports_every_resampler():
+    results = resample_bench.run([44100], seconds=1.0, repeats=1, warmup=0)
+    assert set(results["spectrogram_drift_vs_hq"]) == {f"{name}[rate=44100]" for name in RESAMPLERS}
+    assert results["spectrogram_drift_vs_hq"]["hq[rate=44100]"]["max_abs_diff"] == 0.0
+    assert "load_librosa_default[rate=44100]" in results["latency"]
@@ -0,0 +1,152 @@
+import asyncio
+import io
+import json
+import numpy as np
+import pytest
+import soundfile as sf
+from app.utils.cache import audio_cache
+from app.utils.config import config
+from app.server import HTTPError, InferenceServer, InferenceService
+
+class StubPool:
+    def __init__(self, output):
+        self.output = output
+        self.calls = 0
+        self.text_calls = 0
+
+    def readiness(self):
+        return {"text": "ready", "audio": "ready", "ready": True}
+
+    def predict_text_batch(self, texts):
+        self.text_calls += 1
+        return [[{"label": "LABEL_0", "score": 0.2}, {"label": "LABEL_1", "score": 0.8}] for _ in texts]
+
+    def predict_audio_batch(self, spectrograms):
+        self.calls += 1
+        return [np.asarray(self.output, dtype=np.float32) for _ in spectrograms]
+
+    def stop(self):
+        pass
+
+class BufferWriter:
+    def __init__(self):
+        self.data = b""
+
+    def write(self, data):
+        self.data += data
+
+    async def drain(self):
+        pass
+
+    def close(self):
+        pass
+
+def wav_bytes(audio):
+    buffer = io.BytesIO()
+    sf.write(buffer, audio.astype(np.float32), config.model.SAMPLE_RATE, format="WAV")
+    return buffer.getvalue()
+
+def status_of(raw):
+    async def scenario():
+        reader = asyncio.StreamReader()
+        reader.feed_data(raw)
+        reader.feed_eof()
+        writer = BufferWriter()
+        await InferenceServer(InferenceService()).handle(reader, writer)
+        return writer.data
+    response = asyncio.run(scenario())
+    return int(response.split(b" ", 2)[1])
+
+def post(path, body, content_length=None):
+    length = len(body) if content_length is None else content_length
+    return (f"POST {path} HTTP/1.1\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {length}\r\nConnection: close\r\n\r\n").encode("latin-1") + body
+
+def run_service(pool, scenario, **kwargs):
+    async def run():
+        service = InferenceService(workers=2, **kwargs)
+        service.pool = pool
+        service.text_batcher.start()
+        service.audio_batcher.start()
+        try:
+            return await scenario(service)
+        finally:
+            await service.stop()
+    return asyncio.run(run())
+
+def run_audio(pool, *payloads):
+    async def scenario(service):
+        results = []
+        for payload in payloads:
+            try:
+                results.append(await service.analyze_audio(payload))
+            except HTTPError as e:
+                results.append(e)
+        return results
+    return run_service(pool, scenario)
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    audio_cache.clear()
+    yield
+    audio_cache.clear()
+
+def test_non_finite_prediction_is_rejected():
+    silent = wav_bytes(np.zeros(config.model.SAMPLE_RATE * 2))
+    [result] = run_audio(StubPool([np.nan] * 4), silent)
+    assert isinstance(result, HTTPError) and result.status == 422
+
+def test_repeated_upload_is_served_from_cache():
+    rng = np.random.default_rng(0)
+    clip = wav_bytes(0.1 * rng.standard_normal(config.model.SAMPLE_RATE * 2))
+    pool = StubPool([0.1, 0.2, 0.3, 0.4])
+    first, second = run_audio(pool, clip, clip)
+    assert first == second
+    assert pool.calls == 1
+
+def test_responses_are_strict_json():
+    server = InferenceServer(InferenceService())
+    writer = BufferWriter()
+    asyncio.run(server._write_response(writer, 200, {"confidence": float("nan")}, keep_alive=False))
+    head, body = writer.data.split(b"\r\n\r\n", 1)
+    assert head.startswith(b"HTTP/1.1 500")
+    assert "error" in json.loads(body)
+
+def test_combined_result_is_fused():
+    rng = np.random.default_rng(1)
+    clip = wav_bytes(0.1 * rng.standard_normal(config.model.SAMPLE_RATE * 2))
+
+    async def scenario(service):
+        return await service.analyze_combined("The support team sorted it out quickly", clip)
+
+    result = run_service(StubPool([0.1, 0.6, 0.2, 0.1]), scenario)
+    assert result["text_result"]["predicted_label"] == "POSITIVE"
+    assert result["alignment"] == "positive_alignment"
+    assert result["confidence"] == pytest.approx((0.8 + 0.6) / 2)
+
+def test_failed_branch_cancels_the_other():
+    from app.processing.audio_processor import AudioProcessor
+    with pytest.raises(Exception):
+        AudioProcessor().decode(b"not audio")
+    pool = StubPool([0.25] * 4)
+
+    async def scenario(service):
+        with pytest.raises(HTTPError) as error:
+            await service.analyze_combined("The support team sorted it out quickly", b"not audio")
+        await asyncio.sleep(1.2)
+        return error.value
+
+    error = run_service(pool, scenario, max_wait_ms=1000)
+    assert error.status == 400
+    assert pool.text_calls == 0 and pool.calls == 0
+
+@pytest.mark.parametrize("raw", [
+    post("/v1/text", b'["not", "an", "object"]'),
+    post("/v1/text", b'{"text": 42}'),
+    post("/v1/combined", b'{"text": ["a"], "audio": "AAAA"}'),
+    post("/v1/combined", b'{"text": "hello", "audio": 42}'),
+    b"GARBAGE\r\n\r\n",
+    post("/v1/text", b'{"text": "hi"}', content_length="ten"),
+])
+def test_malformed_requests_are_rejected_with_400(raw):
+    assert status_of(raw) == 400
@@ -0,0 +1,42 @@
+import librosa
+import numpy as np
+import pytest
+from app.utils.config import config
+from app.processing.audio_processor import AudioProcessor
+
+SAMPLES = config.model.SAMPLE_RATE * config.model.DURATION
+
+@pytest.fixture(scope="module")
+def processor():
+    return AudioProcessor(vad=False)
+
+def librosa_spectrogram(audio):
+    mel_spec = librosa.feature.melspectrogram(y=audio, sr=config.model.SAMPLE_RATE, n_mels=config.model.N_MELS,
+                                              n_fft=config.model.N_FFT, hop_length=config.model.HOP_LENGTH)
+    log_mel_spec = librosa.power_to_db(mel_spec, ref=np.max)
+    return (log_mel_spec - log_mel_spec.mean()) / log_mel_spec.std()
+
+def tones(*lengths):
+    rng = np.random.default_rng(0)
+    clips = []
+    for length, freq in zip(lengths, (110, 220, 440, 880)):
+        t = np.arange(length) / config.model.SAMPLE_RATE
+        clips.append((0.3 * np.sin(2 * np.pi * freq * t) + 0.05 * rng.standard_normal(length)).astype(np.float32))
+    return clips
+
+@pytest.mark.parametrize("audio", [np.zeros(SAMPLES, np.float32), np.full(SAMPLES, 0.25, np.float32)],
+                         ids=["silent", "constant"])
+def test_degenerate_clips_give_finite_features(processor, audio):
+    assert np.isfinite(processor.create_spectrogram(audio)).all()
+    assert np.isfinite(processor.create_spectrogram_batch([audio, audio])).all()
+
+def test_spectrogram_matches_librosa(processor):
+    for clip in tones(SAMPLES, SAMPLES // 3):
+        np.testing.assert_allclose(processor.create_spectrogram(clip), librosa_spectrogram(clip), atol=1e-3)
+
+def test_batch_of_mixed_lengths_matches_per_clip(processor):
+    clips = tones(SAMPLES, SAMPLES // 2, SAMPLES, SAMPLES // 4)
+    batched = processor.create_spectrogram_batch(clips)
+    assert len(batched) == len(clips)
+    for clip, features in zip(clips, batched):
+        np.testing.assert_allclose(features, processor.create_spectrogram(clip), atol=1e-5)
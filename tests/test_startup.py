@@ -0,0 +1,58 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+from app.utils.config import config
+from app.models.model_manager import ModelManager
+from app.utils.startup import LazyModule, lazy_import, startup
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_app_modules_do_not_import_heavy_libraries():
+    code = ("import sys, json\n"
+            "import app.server, app.batch, app.models.model_manager, app.processing.pipeline\n"
+            "print(json.dumps([m for m in ('torch', 'transformers', 'librosa', 'soundfile') if m in sys.modules]))")
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    assert json.loads(output.strip().splitlines()[-1]) == []
+
+def test_lazy_module_imports_on_first_attribute(tmp_path, monkeypatch):
+    (tmp_path / "lazy_probe.py").write_text("VALUE = 42\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "lazy_probe", raising=False)
+
+    module = lazy_import("lazy_probe")
+    assert isinstance(module, LazyModule) and "lazy_probe" not in sys.modules
+    assert module.VALUE == 42
+    assert "lazy_probe" in sys.modules and "lazy_probe" in startup.report()["imports_seconds"]
+    assert lazy_import("lazy_probe") is sys.modules["lazy_probe"]
+
+def test_models_load_concurrently_behind_readiness(monkeypatch):
+    both_loading = threading.Barrier(2, timeout=5)
+    release = threading.Event()
+
+    def loader(result):
+        def load(self):
+            both_loading.wait()
+            release.wait(5)
+            return result
+        return load
+
+    monkeypatch.setattr(config.model, "AUTOTUNE", "off")
+    monkeypatch.setattr(ModelManager, "_instance", None)
+    monkeypatch.setattr(ModelManager, "_executor", None)
+    monkeypatch.setattr(ModelManager, "_load_text_model", loader("text model"))
+    monkeypatch.setattr(ModelManager, "_load_audio_model", loader(None))
+
+    manager = ModelManager()
+    try:
+        assert manager.readiness() == {"text": "not_loaded", "audio": "not_loaded", "ready": False}
+        manager.start_loading()
+        assert manager.readiness()["ready"] is False
+        release.set()
+        assert manager.wait_until_ready(timeout=5) == {"text": "ready", "audio": "unavailable", "ready": True}
+        assert manager.get_models() == ("text model", None)
+        assert not both_loading.broken
+    finally:
+        release.set()
+        ModelManager._executor.shutdown(wait=True)
@@ -0,0 +1,59 @@
+import io
+import numpy as np
+import pytest
+import soundfile as sf
+from app.utils.config import config
+from app.processing.audio_processor import AudioProcessor
+from app.processing.streaming import StreamingAnalyzer
+
+class StubAudioModel:
+    def __init__(self, nan_first: bool = False):
+        self.nan_first = nan_first
+        self.frames = []
+
+    def predict_batch(self, spectrograms, batch_size=None):
+        self.frames.extend(spec.shape[-1] for spec in spectrograms)
+        outputs = np.tile([0.1, 0.2, 0.3, 0.4], (len(spectrograms), 1))
+        if self.nan_first:
+            outputs[0] = np.nan
+            self.nan_first = False
+        return outputs
+
+def wav_bytes(*parts):
+    rate = config.model.SAMPLE_RATE
+    audio = []
+    for kind, seconds in parts:
+        t = np.arange(int(seconds * rate)) / rate
+        audio.append(0.3 * np.sin(2 * np.pi * 220 * t) if kind == "tone" else np.zeros_like(t))
+    buffer = io.BytesIO()
+    sf.write(buffer, np.concatenate(audio).astype(np.float32), rate, format="WAV")
+    return buffer.getvalue()
+
+@pytest.fixture
+def analyzer():
+    return StreamingAnalyzer(AudioProcessor(vad=False))
+
+def test_window_matches_model_input(analyzer):
+    model = StubAudioModel()
+    result = analyzer.analyze(wav_bytes(("tone", 8)), model)
+    assert set(model.frames) == {config.model.N_FRAMES}
+    for window in result['timeline'][:-1]:
+        assert window['end'] - window['start'] == pytest.approx(analyzer.model_window_seconds(), abs=1e-3)
+
+def test_silent_gap_is_skipped(analyzer):
+    result = analyzer.analyze(wav_bytes(("tone", 5), ("silence", 10), ("tone", 5)), StubAudioModel())
+    aggregate = result['aggregate']
+    assert aggregate['skipped_windows'] > 0
+    assert np.isfinite(aggregate['confidence'])
+    assert aggregate['predicted_label'] == result['timeline'][0]['predicted_label']
+    assert aggregate['duration'] == pytest.approx(20.0, abs=0.1)
+    assert all(not (6 < window['start'] < 13) for window in result['timeline'])
+
+def test_non_finite_predictions_do_not_poison_aggregate(analyzer):
+    result = analyzer.analyze(wav_bytes(("tone", 8)), StubAudioModel(nan_first=True))
+    assert result['aggregate']['skipped_windows'] == 1
+    assert np.isfinite(result['aggregate']['confidence'])
+
+def test_all_silent_recording_is_rejected(analyzer):
+    with pytest.raises(ValueError, match="silence"):
+        analyzer.analyze(wav_bytes(("silence", 6)), StubAudioModel())
@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+from app.utils.config import config
+from benchmarks.pipeline_bench import synthetic_texts
+
+def test_chunker_is_built_once(tiny_text_model):
+    assert tiny_text_model.chunker is tiny_text_model.chunker
+
+def test_long_text_is_windowed(tiny_text_model):
+    [text] = synthetic_texts(1, config.model.MAX_LENGTH * 3, seed=1)
+    windows, docs = tiny_text_model.chunker.chunk([text])
+    assert len(windows) > 1 and set(docs) == {0}
+    assert max(len(window) for window in windows) <= config.model.MAX_LENGTH
+
+    scores = [item["score"] for item in tiny_text_model.predict(text)]
+    assert np.isfinite(scores).all()
+    assert sum(scores) == pytest.approx(1.0, abs=1e-5)
+
+def test_batched_prediction_matches_single(tiny_text_model):
+    texts = [text for words in (3, 12, 40, 200) for text in synthetic_texts(3, words, seed=words)]
+    batched = tiny_text_model.predict_batch(texts, batch_size=4)
+    for text, result in zip(texts, batched):
+        single = {item["label"]: item["score"] for item in tiny_text_model.predict(text)}
+        assert {item["label"]: item["score"] for item in result} == pytest.approx(single, abs=1e-5)
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+from app.utils.config import config
+from app.processing.audio_processor import AudioProcessor
+from app.processing.streaming import StreamingAnalyzer
+from app.processing.vad import VoiceActivityDetector
+from tests.test_streaming import StubAudioModel, wav_bytes
+
+RATE = config.model.SAMPLE_RATE
+
+def signal(*parts):
+    audio = []
+    for kind, seconds in parts:
+        t = np.arange(int(seconds * RATE)) / RATE
+        audio.append(0.3 * np.sin(2 * np.pi * 220 * t) if kind == "tone" else np.zeros_like(t))
+    return np.concatenate(audio).astype(np.float32)
+
+def test_trim_keeps_speech_and_reports_ratio():
+    vad = VoiceActivityDetector(RATE, hangover_ms=0)
+    trimmed, stats = vad.trim(signal(("tone", 1), ("silence", 3), ("tone", 1)))
+    assert len(trimmed) == pytest.approx(2 * RATE, abs=vad.frame_length)
+    assert stats["segments"] == 2 and not stats["no_speech"]
+    assert stats["speech_seconds"] == pytest.approx(2.0, abs=0.05)
+    assert stats["discarded_ratio"] == pytest.approx(0.6, abs=0.01)
+
+def test_all_noise_is_kept_but_reports_no_speech():
+    noise = 0.3 * np.random.default_rng(0).standard_normal(3 * RATE).astype(np.float32)
+    trimmed, stats = VoiceActivityDetector(RATE).trim(noise)
+    assert stats["no_speech"]
+    assert stats["speech_seconds"] == 0.0 and stats["segments"] == 0
+    assert stats["discarded_ratio"] == 0.0
+    np.testing.assert_array_equal(trimmed, noise)
+
+def test_stream_spans_map_back_to_source_time():
+    analyzer = StreamingAnalyzer(AudioProcessor(vad=True))
+    result = analyzer.analyze(wav_bytes(("tone", 5), ("silence", 10), ("tone", 5)), StubAudioModel())
+    timeline, vad_stats = result["timeline"], result["aggregate"]["vad"]
+
+    assert result["aggregate"]["skipped_windows"] == 0
+    assert vad_stats["input_seconds"] == pytest.approx(20.0, abs=0.1)
+    assert vad_stats["speech_seconds"] < 11.0 and vad_stats["segments"] == 2
+    assert timeline[0]["start"] == 0.0
+    assert timeline[-1]["end"] == pytest.approx(20.0, abs=0.1)
+    assert any(window["start"] < 5 and window["end"] > 15 for window in timeline)
+    assert all(not (6 < window["start"] < 14) for window in timeline)
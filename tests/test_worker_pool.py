@@ -0,0 +1,78 @@
+import queue
+import pytest
+from app.server import InferenceService
+from app.worker_pool import SharedModelPool
+
+class FakeProcess:
+    def __init__(self, alive=True, pid=1000):
+        self.alive = alive
+        self.pid = pid
+        self.exitcode = None if alive else -9
+
+    def is_alive(self):
+        return self.alive
+
+def make_pool(*alive, timeout=None):
+    pool = SharedModelPool(workers=len(alive), threads_per_worker=1, timeout=timeout)
+    pool.processes = [FakeProcess(state, 1000 + i) for i, state in enumerate(alive)]
+    pool.completed = {i: 0 for i in range(len(alive))}
+    pool.current = [-1] * len(alive)
+    pool.requests = queue.Queue()
+    return pool
+
+def test_readiness_is_loading_until_workers_report():
+    pool = make_pool(True, True)
+    assert pool.readiness()["text"] == "loading"
+    assert not pool.readiness()["ready"]
+
+    pool.worker_readiness[0] = {"text": "ready", "audio": "unavailable"}
+    readiness = pool.readiness()
+    assert readiness["text"] == "ready"
+    assert readiness["audio"] == "loading"
+    assert not readiness["ready"]
+
+    pool.worker_readiness[1] = {"text": "ready", "audio": "unavailable"}
+    assert pool.readiness()["ready"]
+
+def test_readiness_ignores_dead_workers():
+    pool = make_pool(True, False)
+    pool.worker_readiness[1] = {"text": "ready", "audio": "ready"}
+    assert pool.readiness()["text"] == "loading"
+
+    pool.processes[0].alive = False
+    readiness = pool.readiness()
+    assert readiness["text"] == "failed"
+    assert readiness["workers_alive"] == 0
+
+def test_service_takes_readiness_from_pool():
+    service = InferenceService(workers=2)
+    service.pool = make_pool(True, True)
+    service.pool.worker_readiness = {0: {"text": "ready", "audio": "ready"}}
+    assert service.readiness()["ready"]
+    assert service.model_manager.readiness()["text"] == "not_loaded"
+
+def test_dead_worker_fails_its_inflight_request():
+    pool = make_pool(True, True)
+    inflight = pool.submit("text_batch", ["hello there"])
+    queued = pool.submit("text_batch", ["another one"])
+    pool.current[1] = inflight.job_id
+    pool.processes[1].alive = False
+
+    pool._check_workers()
+    with pytest.raises(RuntimeError, match="died"):
+        inflight.result(timeout=1)
+    assert not queued.done()
+
+    pool.processes[0].alive = False
+    pool._check_workers()
+    with pytest.raises(RuntimeError, match="All model workers"):
+        queued.result(timeout=1)
+    with pytest.raises(RuntimeError):
+        pool.submit("text_batch", ["rejected"])
+
+def test_result_times_out_and_forgets_the_request():
+    pool = make_pool(True, timeout=0.05)
+    future = pool.submit("audio_batch", [])
+    with pytest.raises(TimeoutError):
+        pool.result(future)
+    assert future.job_id not in pool._pending